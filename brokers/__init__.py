@@ -7,6 +7,7 @@ This package provides a clean, typed, and extensible broker-agnostic API:
 - Enum/string mappings in `brokers2.mappings`
 - Pluggable broker drivers in `brokers2.integrations`
 - A simple facade `BrokerGateway` and a `BrokerRegistry` to construct drivers
+- `AsyncBrokerGateway`, an awaitable variant of the facade
 
 Environment variables are loaded via python-dotenv when available.
 """
@@ -24,6 +25,7 @@ except Exception:  # pragma: no cover - be silent if dotenv is missing
     pass
 
 from .core.gateway import BrokerGateway
+from .core.async_gateway import AsyncBrokerGateway
 from .registry import BrokerRegistry
 from .core.enums import Exchange, OrderType, ProductType, TransactionType, Validity
 from .core.schemas import (
@@ -36,11 +38,14 @@ from .core.schemas import (
     BrokerCapabilities,
 )
 
+from .symbols import InstrumentIndex, SymbolInfo, parse_symbol
+
 # Ensure default symbol resolvers are registered
 from .symbols import resolvers as _symbol_resolvers  # noqa: F401
 
 __all__ = [
     "BrokerGateway",
+    "AsyncBrokerGateway",
     "BrokerRegistry",
     # Enums
     "Exchange",
@@ -56,6 +61,10 @@ __all__ = [
     "Quote",
     "Instrument",
     "BrokerCapabilities",
+    # Symbols
+    "InstrumentIndex",
+    "SymbolInfo",
+    "parse_symbol",
 ]
 
 
@@ -1,7 +1,8 @@
 """Authentication helpers (TOTP, manual, tokens)."""
 
+from .tokens import TokenCache, resolve_token
 from .totp import totp_now
 
-__all__ = ["totp_now"]
+__all__ = ["TokenCache", "resolve_token", "totp_now"]
 
 
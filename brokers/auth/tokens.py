@@ -1,7 +1,19 @@
 from __future__ import annotations
 
+import base64
+from contextlib import contextmanager
+from datetime import datetime, time as dtime, timedelta, timezone
+import json
 import os
-from typing import Optional
+import re
+import tempfile
+from typing import Any, Callable, Dict, Iterator, Optional
+
+
+IST = timezone(timedelta(hours=5, minutes=30))
+# Fyers and Kite both invalidate access tokens around 06:00 IST the next morning
+TOKEN_RESET = dtime(6, 0)
+DEFAULT_TOKEN_DIR = os.path.join(".cache", "tokens")
 
 
 def get_access_token(*keys: str) -> Optional[str]:
@@ -14,3 +26,148 @@ def get_access_token(*keys: str) -> Optional[str]:
     return None
 
 
+def next_token_reset(now: Optional[datetime] = None) -> datetime:
+    """The next daily token reset (06:00 IST) after ``now``."""
+    now = (now or datetime.now(IST)).astimezone(IST)
+    reset = datetime.combine(now.date(), TOKEN_RESET, tzinfo=IST)
+    return reset if now < reset else reset + timedelta(days=1)
+
+
+def jwt_expiry(token: str) -> Optional[datetime]:
+    """``exp`` claim of a JWT access token (Fyers), without verifying it."""
+    try:
+        payload = token.split(".")[1]
+        claims = json.loads(base64.urlsafe_b64decode(payload + "=" * (-len(payload) % 4)))
+        return datetime.fromtimestamp(int(claims["exp"]), tz=IST)
+    except Exception:
+        return None
+
+
+@contextmanager
+def _file_lock(path: str) -> Iterator[None]:
+    """Exclusive advisory lock on ``path`` shared across processes (no-op where unsupported)."""
+    fh = open(path, "a+")
+    try:
+        try:
+            import fcntl  # type: ignore
+
+            fcntl.flock(fh.fileno(), fcntl.LOCK_EX)
+        except ImportError:  # pragma: no cover - Windows
+            try:
+                import msvcrt  # type: ignore
+
+                msvcrt.locking(fh.fileno(), msvcrt.LK_LOCK, 1)
+            except Exception:
+                pass
+        yield
+    finally:
+        fh.close()  # releases the lock
+
+
+class TokenCache:
+    """File-backed access-token cache, one JSON file per broker account.
+
+    Entries carry ``expires_at`` so stale tokens are skipped without a network
+    call. Logins run under a cross-process file lock: when several strategy
+    processes start together, one logs in and the rest pick up its token.
+    """
+
+    def __init__(self, broker: str, directory: str = DEFAULT_TOKEN_DIR) -> None:
+        self.broker = broker.lower()
+        self.directory = directory
+
+    @classmethod
+    def from_env(cls, broker: str) -> Optional["TokenCache"]:
+        """Cache configured by BROKER_TOKEN_CACHE / BROKER_TOKEN_CACHE_DIR (None when disabled)."""
+        from ..config import getenv, getenv_bool
+
+        if not getenv_bool("BROKER_TOKEN_CACHE", True):
+            return None
+        return cls(broker, getenv("BROKER_TOKEN_CACHE_DIR", DEFAULT_TOKEN_DIR) or DEFAULT_TOKEN_DIR)
+
+    def path(self, account: str) -> str:
+        safe = re.sub(r"[^A-Za-z0-9_.-]", "_", account)
+        return os.path.join(self.directory, f"{self.broker}-{safe}.json")
+
+    def get(self, account: str) -> Optional[str]:
+        """Cached token for ``account`` unless missing or expired."""
+        try:
+            with open(self.path(account), "r", encoding="utf-8") as f:
+                entry: Dict[str, Any] = json.load(f)
+            if datetime.fromisoformat(entry["expires_at"]) <= datetime.now(IST):
+                return None
+            return entry.get("access_token") or None
+        except Exception:
+            return None
+
+    def put(self, account: str, token: str, expires_at: Optional[datetime] = None) -> None:
+        """Atomically write ``token`` (owner-only permissions); failures are ignored."""
+        now = datetime.now(IST)
+        expires = expires_at or jwt_expiry(token) or next_token_reset(now)
+        entry = {"access_token": token, "created_at": now.isoformat(), "expires_at": min(expires, next_token_reset(now)).isoformat()}
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=self.directory, prefix=".tok-")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(entry, f)
+            os.chmod(tmp, 0o600)
+            os.replace(tmp, self.path(account))
+        except Exception:
+            return None
+
+    def invalidate(self, account: str) -> None:
+        try:
+            os.remove(self.path(account))
+        except OSError:
+            return None
+
+    @contextmanager
+    def lock(self, account: str) -> Iterator[None]:
+        os.makedirs(self.directory, exist_ok=True)
+        with _file_lock(self.path(account) + ".lock"):
+            yield
+
+    def resolve(
+        self,
+        account: str,
+        *,
+        validate: Callable[[str], bool],
+        login: Optional[Callable[[], Optional[str]]] = None,
+        seed: Optional[str] = None,
+    ) -> Optional[str]:
+        """Cached (or ``seed``) token if ``validate`` accepts it, else ``login()`` under the lock."""
+        tried = set()
+        for token in (self.get(account), seed):
+            if token and token not in tried:
+                tried.add(token)
+                if validate(token):
+                    if token == seed:
+                        self.put(account, token)
+                    return token
+        if login is None:
+            return None
+        with self.lock(account):
+            # Another process may have logged in while we waited for the lock
+            token = self.get(account)
+            if token and token not in tried and validate(token):
+                return token
+            token = login()
+            if token:
+                self.put(account, token)
+            return token
+
+
+def resolve_token(
+    cache: Optional[TokenCache],
+    account: str,
+    *,
+    validate: Callable[[str], bool],
+    login: Optional[Callable[[], Optional[str]]] = None,
+    seed: Optional[str] = None,
+) -> Optional[str]:
+    """``cache.resolve`` with the uncached fallback: validate ``seed``, else log in."""
+    if cache is not None:
+        return cache.resolve(account, validate=validate, login=login, seed=seed)
+    if seed and validate(seed):
+        return seed
+    return login() if login is not None else None
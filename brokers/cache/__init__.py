@@ -0,0 +1,7 @@
+"""Local caches sitting behind the gateway (on-disk candles, instrument master, tick-fed quotes)."""
+
+from .candles import CandleCache, IncompleteFetch
+from .instruments import InstrumentStore
+from .quotes import QuoteCache
+
+__all__ = ["CandleCache", "IncompleteFetch", "InstrumentStore", "QuoteCache"]
@@ -0,0 +1,277 @@
+from __future__ import annotations
+
+from datetime import date, datetime, time as dtime, timedelta
+import io
+import os
+import re
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from ..core.candles import CANDLE_COLUMNS, CandleColumns, concat_columns, is_failed, slice_columns
+from ..logging import get_logger
+from ..net.http import write_atomic
+
+
+logger = get_logger(__name__)
+
+DEFAULT_CACHE_DIR = ".cache/candles"
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+Fetcher = Callable[[str, str], CandleColumns]
+
+_INTERVAL_RE = re.compile(r"^(\d*)\s*(s|sec|m|min|minute|h|hour)?$")
+_UNIT_SECONDS = {"s": 1, "sec": 1, "m": 60, "min": 60, "minute": 60, "h": 3600, "hour": 3600}
+
+
+class IncompleteFetch(Exception):
+    """Raised by a fetcher whose result may have gaps (a chunk's broker call failed).
+
+    ``columns`` holds what was fetched; the cache serves it but neither stores it
+    nor extends its coverage, so the range is requested again next time.
+    """
+
+    def __init__(self, columns: CandleColumns) -> None:
+        super().__init__("incomplete candle fetch")
+        self.columns = columns
+
+
+def _day_start_ts(d: date) -> int:
+    return int(datetime.combine(d, dtime.min).timestamp())
+
+
+def _now() -> float:
+    return time.time()
+
+
+def interval_seconds(interval: str) -> Optional[int]:
+    """Bar length of an intraday interval ("1m", "15", "5S", "3minute"), None for daily and unknown."""
+    m = _INTERVAL_RE.match(interval.strip().lower())
+    if m is None or not (m.group(1) or m.group(2)):
+        return None
+    return int(m.group(1) or 1) * _UNIT_SECONDS[m.group(2) or "m"]
+
+
+class CandleCache:
+    """Read-through on-disk candle store keyed by (broker, symbol, interval, oi flag).
+
+    Each key is one ``.npz`` file of contiguous columns plus the span it covers:
+    whole days before today, and for intraday intervals today's bars up to the
+    last closed one. Only the ranges outside that span hit the broker, and an
+    intraday tail is not re-requested until another bar could have closed.
+    """
+
+    def __init__(self, root: str = DEFAULT_CACHE_DIR, *, max_bytes: int = DEFAULT_MAX_BYTES) -> None:
+        self.root = root
+        self.max_bytes = int(max_bytes)
+        self._locks: Dict[str, threading.Lock] = {}
+        self._locks_guard = threading.Lock()
+        # Running total of the cache size; one directory walk on first write, then per-write deltas
+        self._bytes: Optional[int] = None
+        self._bytes_lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> Optional["CandleCache"]:
+        """Build a cache when BROKER_CANDLE_CACHE is enabled, else return None."""
+        from ..config import getenv, getenv_bool
+
+        if not getenv_bool("BROKER_CANDLE_CACHE", False):
+            return None
+        root = getenv("BROKER_CANDLE_CACHE_DIR", DEFAULT_CACHE_DIR) or DEFAULT_CACHE_DIR
+        max_mb = getenv("BROKER_CANDLE_CACHE_MAX_MB")
+        return cls(root, max_bytes=int(float(max_mb) * 1024 * 1024) if max_mb else DEFAULT_MAX_BYTES)
+
+    # --- Paths / locking ---
+    def _path(self, broker: str, symbol: str, interval: str, oi: bool) -> str:
+        safe = re.sub(r"[^A-Za-z0-9_.-]+", "_", symbol)
+        return os.path.join(self.root, broker.lower(), f"{safe}__{interval}__{int(bool(oi))}.npz")
+
+    def _lock(self, path: str) -> threading.Lock:
+        with self._locks_guard:
+            lock = self._locks.get(path)
+            if lock is None:
+                lock = self._locks[path] = threading.Lock()
+            return lock
+
+    # --- Storage ---
+    @staticmethod
+    def _load(path: str) -> Optional[Tuple[CandleColumns, date, int, int]]:
+        """(columns, first day, covered-until ts, last tail check ts) or None."""
+        if not os.path.exists(path):
+            return None
+        try:
+            with np.load(path) as data:
+                cols = {k: data[k] for k in CANDLE_COLUMNS}
+                first, covered_until, checked_at = (int(x) for x in data["meta"])
+            os.utime(path)  # mark as recently used for eviction
+            return cols, date.fromordinal(first), covered_until, checked_at
+        except Exception:
+            logger.debug("Discarding unreadable candle cache file %s", path, exc_info=True)
+            return None
+
+    def _store(self, path: str, cols: CandleColumns, first: date, covered_until: int, checked_at: int) -> None:
+        # A failed write only loses the cache entry, never the caller's history
+        meta = np.array([first.toordinal(), covered_until, checked_at], dtype=np.int64)
+        try:
+            buf = io.BytesIO()
+            np.savez(buf, meta=meta, **cols)
+            data = buf.getvalue()
+            previous = os.path.getsize(path) if os.path.exists(path) else 0
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            write_atomic(path, data)
+        except Exception:
+            logger.warning("Failed to write candle cache file %s", path, exc_info=True)
+            return
+        self._grow(len(data) - previous)
+
+    @staticmethod
+    def _fetch(fetch: Fetcher, start: str, end: str) -> Tuple[CandleColumns, bool]:
+        """(columns, complete); an empty result is coverage unless the call failed."""
+        try:
+            cols = fetch(start, end)
+        except IncompleteFetch as e:
+            return e.columns, False
+        return cols, not is_failed(cols)
+
+    @staticmethod
+    def _covered_until(cols: CandleColumns, end_d: date, step: Optional[int], now: float) -> int:
+        """End (exclusive ts) of the final part of a complete fetch ending on ``end_d``.
+
+        Past days are final. Today is final up to the close of its last closed
+        intraday bar; a daily bar for today is still open.
+        """
+        hi = _day_start_ts(end_d + timedelta(days=1))
+        today_start = _day_start_ts(date.fromtimestamp(now))
+        if hi <= today_start:
+            return hi
+        if step is None:
+            return today_start
+        ts = cols["ts"]
+        closed = ts[(ts >= today_start) & (ts + step <= now)]
+        return int(closed[-1]) + step if len(closed) else today_start
+
+    @staticmethod
+    def _tail_is_fresh(covered_until: int, checked_at: int, step: Optional[int], now: float) -> bool:
+        """True while no bar can have closed since the tail was last fetched."""
+        if step is None or covered_until <= _day_start_ts(date.fromtimestamp(now)):
+            # Daily bars and pre-open sessions have no bar grid to wait on
+            return False
+        next_close = covered_until + step * ((checked_at - covered_until) // step + 1)
+        return now < next_close
+
+    def _grow(self, delta: int) -> None:
+        """Account for a write of ``delta`` bytes; walk the tree only when the total goes over the limit."""
+        with self._bytes_lock:
+            if self._bytes is None:
+                self._bytes = sum(size for _, size, _ in self._entries())
+            else:
+                self._bytes += delta
+            if self._bytes > self.max_bytes:
+                # Recount from disk (other processes share the directory) and drop the oldest files
+                self._bytes = self._evict()
+
+    def _entries(self) -> List[Tuple[float, int, str]]:
+        entries: List[Tuple[float, int, str]] = []
+        for dirpath, _, files in os.walk(self.root):
+            for name in files:
+                if not name.endswith(".npz"):
+                    continue
+                p = os.path.join(dirpath, name)
+                try:
+                    st = os.stat(p)
+                except OSError:
+                    continue
+                entries.append((st.st_mtime, st.st_size, p))
+        return entries
+
+    def _evict(self) -> int:
+        """Remove least recently used files until the cache fits; returns the remaining size."""
+        entries = self._entries()
+        total = sum(size for _, size, _ in entries)
+        for _, size, p in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(p)
+                total -= size
+            except OSError:
+                continue
+        return total
+
+    # --- Public API ---
+    def get(self, broker: str, symbol: str, interval: str, start: str, end: str, oi: bool, fetch: Fetcher) -> CandleColumns:
+        """Return candles for [start, end] (YYYY-MM-DD), fetching only uncovered ranges."""
+        start_d = datetime.strptime(start, "%Y-%m-%d").date()
+        end_d = datetime.strptime(end, "%Y-%m-%d").date()
+        step = interval_seconds(interval)
+        path = self._path(broker, symbol, interval, oi)
+        with self._lock(path):
+            now = _now()
+            cached = self._load(path)
+            if cached is None:
+                cols, complete = self._fetch(fetch, start, end)
+                if complete:
+                    self._store(path, cols, start_d, self._covered_until(cols, end_d, step, now), int(now))
+            else:
+                cols, first, covered_until, checked_at = cached
+                stored = [cols]
+                uncached: List[CandleColumns] = []  # served now, fetched again next time
+                changed = False
+                if start_d < first:
+                    # Fetch up to the cached range (not just `end`) so coverage stays contiguous
+                    head_end = first - timedelta(days=1)
+                    head, complete = self._fetch(fetch, start, head_end.strftime("%Y-%m-%d"))
+                    if complete:
+                        stored.insert(0, head)
+                        first = start_d
+                        changed = True
+                    else:
+                        uncached.append(head)
+                end_ts = _day_start_ts(end_d + timedelta(days=1))
+                if end_ts > covered_until and not self._tail_is_fresh(covered_until, checked_at, step, now):
+                    # Dates are the broker's granularity; the day holding `covered_until` is re-read
+                    tail_start = date.fromtimestamp(covered_until)
+                    tail, complete = self._fetch(fetch, tail_start.strftime("%Y-%m-%d"), end)
+                    if complete:
+                        # Bars past the covered span (e.g. an open bar) are replaced by the fresh ones
+                        stored = [{k: v[p["ts"] < covered_until] for k, v in p.items()} for p in stored]
+                        stored.append(tail)
+                        covered_until = max(covered_until, self._covered_until(tail, end_d, step, now))
+                        checked_at = int(now)
+                        changed = True
+                    else:
+                        uncached.append(tail)
+                if changed:
+                    cols = concat_columns(stored)
+                    self._store(path, cols, first, covered_until, checked_at)
+                if uncached:
+                    cols = concat_columns([cols] + uncached)
+
+        return slice_columns(cols, _day_start_ts(start_d), _day_start_ts(end_d + timedelta(days=1)))
+
+    def invalidate_session(self, broker: Optional[str] = None) -> int:
+        """Drop stored bars past the covered span (the open bar) so they are fetched fresh.
+
+        Returns the number of cache files rewritten.
+        """
+        root = os.path.join(self.root, broker.lower()) if broker else self.root
+        rewritten = 0
+        for dirpath, _, files in os.walk(root):
+            for name in files:
+                if not name.endswith(".npz"):
+                    continue
+                path = os.path.join(dirpath, name)
+                with self._lock(path):
+                    cached = self._load(path)
+                    if cached is None:
+                        continue
+                    cols, first, covered_until, checked_at = cached
+                    open_bars = cols["ts"] >= covered_until
+                    if not open_bars.any():
+                        continue
+                    kept = {k: v[~open_bars] for k, v in cols.items()}
+                    self._store(path, kept, first, covered_until, 0)
+                    rewritten += 1
+        return rewritten
@@ -0,0 +1,325 @@
+"""On-disk columnar store for the normalized instrument master.
+
+Each broker gets a directory with a ``meta.json`` and one subdirectory of ``.npy``
+column files per generation written. Rows
+are sorted by segment, so a segment is one contiguous slice. Columns are
+memory-mapped on load, which means only the requested columns and segments
+are read from disk. Low-cardinality columns (segment, exchange, instrument_type)
+are stored as integer codes plus a category list and come back as pandas
+categoricals in pruned loads. Expiry is stored as ``datetime64[D]`` and comes back as
+``datetime.date`` objects, as the drivers produce it.
+"""
+
+from __future__ import annotations
+
+from datetime import date, datetime, time as dtime, timedelta, timezone
+import json
+import os
+import shutil
+import time
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from ..logging import get_logger
+from ..net.http import write_atomic
+
+
+logger = get_logger(__name__)
+
+DEFAULT_STORE_DIR = ".cache/instruments"
+CATEGORICAL_COLUMNS = ("segment", "exchange", "instrument_type")
+DATE_COLUMNS = ("expiry",)
+FORMAT_VERSION = 2
+
+IST = timezone(timedelta(hours=5, minutes=30))
+
+
+def trading_day(ts: Optional[float] = None, rollover: dtime = dtime(7, 30)) -> date:
+    """Trading day that epoch ``ts`` (default now) belongs to; the day starts at ``rollover`` IST."""
+    now = datetime.fromtimestamp(ts, IST) if ts is not None else datetime.now(IST)
+    return (now - timedelta(hours=rollover.hour, minutes=rollover.minute)).date()
+
+
+def _as_list(value: Any) -> List[Any]:
+    if isinstance(value, (list, tuple, set, frozenset, np.ndarray, pd.Index, pd.Series)):
+        return list(value)
+    return [value]
+
+
+def select_instruments(
+    df: Optional[pd.DataFrame],
+    segments: Optional[Iterable[str]] = None,
+    columns: Optional[Sequence[str]] = None,
+    where: Optional[Dict[str, Any]] = None,
+) -> Optional[pd.DataFrame]:
+    """In-memory equivalent of ``InstrumentStore.load`` for a frame that is already loaded."""
+    if df is None:
+        return None
+    mask = np.ones(len(df), dtype=bool)
+    if segments is not None:
+        mask &= df["segment"].isin(_as_list(segments)).to_numpy()
+    for name, value in (where or {}).items():
+        mask &= df[name].isin(_as_list(value)).to_numpy()
+    out = df[mask] if not mask.all() else df
+    if columns is not None:
+        out = out[[c for c in columns if c in out.columns]]
+    return out.reset_index(drop=True)
+
+
+class InstrumentStore:
+    """Columnar, segment-partitioned instrument master for one broker.
+
+    ``save(df, day=...)`` writes a new generation directory and then atomically
+    replaces ``meta.json``. ``load(day=...)`` returns None unless the stored copy
+    belongs to that trading day. Writers never touch a generation that is not
+    older than the published one, and the generation just before it is kept, so
+    readers that read ``meta.json`` right before a switch can still load it.
+    """
+
+    def __init__(
+        self,
+        broker: str,
+        root: str = DEFAULT_STORE_DIR,
+        *,
+        categorical: Sequence[str] = CATEGORICAL_COLUMNS,
+        dates: Sequence[str] = DATE_COLUMNS,
+        partition: str = "segment",
+    ) -> None:
+        self.broker = broker.lower()
+        self.directory = os.path.join(root, self.broker)
+        self.categorical = tuple(categorical)
+        self.dates = tuple(dates)
+        self.partition = partition
+
+    @classmethod
+    def from_env(cls, broker: str) -> Optional["InstrumentStore"]:
+        """Store configured by BROKER_INSTRUMENT_STORE / BROKER_INSTRUMENT_STORE_DIR (None when disabled)."""
+        from ..config import getenv, getenv_bool
+
+        if not getenv_bool("BROKER_INSTRUMENT_STORE", True):
+            return None
+        return cls(broker, getenv("BROKER_INSTRUMENT_STORE_DIR", DEFAULT_STORE_DIR) or DEFAULT_STORE_DIR)
+
+    # --- Metadata ---
+    @property
+    def meta_path(self) -> str:
+        return os.path.join(self.directory, "meta.json")
+
+    def meta(self) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self.meta_path, "rb") as fh:
+                meta = json.loads(fh.read())
+        except FileNotFoundError:
+            return None
+        except Exception:
+            logger.debug("Unreadable instrument store metadata %s", self.meta_path, exc_info=True)
+            return None
+        return meta if meta.get("version") == FORMAT_VERSION else None
+
+    def day(self) -> Optional[date]:
+        """Trading day of the stored copy, None when there is none."""
+        meta = self.meta()
+        return date.fromisoformat(meta["day"]) if meta else None
+
+    # --- Write ---
+    def _encode(self, name: str, series: pd.Series) -> Dict[str, Any]:
+        """Column -> {"data": array, **meta fields}."""
+        if name in self.categorical:
+            codes, categories = pd.factorize(series, sort=True)
+            dtype = np.int16 if len(categories) < 2 ** 15 else np.int32
+            return {"kind": "cat", "data": codes.astype(dtype), "categories": [c.item() if hasattr(c, "item") else c for c in categories]}
+        if name in self.dates:
+            days = pd.to_datetime(series, errors="coerce").to_numpy(dtype="datetime64[D]")
+            return {"kind": "date", "data": days}
+        values = series.to_numpy()
+        if values.dtype.kind in "biuf":
+            return {"kind": "num", "data": values}
+        missing = series.isna().to_numpy()
+        strings = series.astype(object).where(~missing, "").astype(str)
+        codes, uniques = pd.factorize(strings, sort=True)
+        if len(uniques) <= len(strings) // 4:
+            # Repetitive text (underlying, session, update date): codes on disk, one shared object per value in memory
+            codes = codes.astype(np.int32)
+            codes[missing] = -1
+            return {"kind": "dict", "data": codes, "categories": list(uniques)}
+        out: Dict[str, Any] = {"kind": "str", "data": strings.to_numpy(dtype="U")}
+        if missing.any():
+            out["na"] = missing
+        return out
+
+    def save(self, df: pd.DataFrame, *, day: Optional[date] = None, exclude: Sequence[str] = ("symbol_id",)) -> None:
+        """Persist ``df`` as the master for trading ``day`` (default today)."""
+        day = day or trading_day()
+        columns = [c for c in df.columns if c not in exclude]
+        if self.partition in df.columns:
+            # Stable sort keeps exchange-file order inside each segment
+            codes, segments = pd.factorize(df[self.partition], sort=True)
+            order = np.argsort(codes, kind="stable")
+            df = df.iloc[order]
+            codes = codes[order]
+            bounds = np.searchsorted(codes, np.arange(-1, len(segments) + 1))
+            partitions = {str(seg): [int(bounds[i + 1]), int(bounds[i + 2])] for i, seg in enumerate(segments)}
+        else:
+            partitions = {}
+
+        generation = f"{time.time_ns():016x}"
+        base = os.path.join(self.directory, generation)
+        os.makedirs(base, exist_ok=True)
+        meta_columns: Dict[str, Dict[str, Any]] = {}
+        for name in columns:
+            encoded = self._encode(name, df[name])
+            data = encoded.pop("data")
+            na = encoded.pop("na", None)
+            stem = str(len(meta_columns))
+            np.save(os.path.join(base, f"{stem}.npy"), data, allow_pickle=False)
+            if na is not None:
+                np.save(os.path.join(base, f"{stem}.na.npy"), na, allow_pickle=False)
+                encoded["na"] = True
+            encoded["file"] = stem
+            meta_columns[name] = encoded
+
+        published = self.meta()
+        if published is not None and published.get("generation", "") > generation:
+            # Another process published a newer master while this one was being written
+            shutil.rmtree(base, ignore_errors=True)
+            return
+        meta = {
+            "version": FORMAT_VERSION,
+            "broker": self.broker,
+            "day": day.isoformat(),
+            "rows": int(len(df)),
+            "partition": self.partition if partitions else None,
+            "partitions": partitions,
+            "columns": meta_columns,
+            "generation": generation,
+        }
+        write_atomic(self.meta_path, json.dumps(meta).encode("utf-8"))
+        self._remove_old()
+
+    def save_and_reload(self, df: pd.DataFrame, *, day: Optional[date] = None) -> pd.DataFrame:
+        """Save ``df`` for ``day`` and return it as read back, so cold and warm starts hand out identical frames.
+
+        The store is an optimisation: if the write or read-back fails, a warning is
+        logged and ``df`` is returned unchanged.
+        """
+        try:
+            self.save(df, day=day)
+        except Exception:
+            logger.warning("Failed to write instrument store %s", self.directory, exc_info=True)
+            return df
+        stored = self.load(day=day, categorical=False)
+        return stored if stored is not None else df
+
+    def _remove_old(self) -> None:
+        """Delete generations older than the published one, except its predecessor."""
+        meta = self.meta()
+        if meta is None:
+            return
+        current = meta["generation"]
+        older = []
+        for entry in os.listdir(self.directory):
+            path = os.path.join(self.directory, entry)
+            if entry.endswith(".npy"):
+                try:  # flat files from the version 1 layout
+                    os.remove(path)
+                except OSError:
+                    pass
+            elif os.path.isdir(path) and entry < current:
+                older.append(entry)
+        # Fixed-width hex generations sort by creation time
+        for entry in sorted(older)[:-1]:
+            shutil.rmtree(os.path.join(self.directory, entry), ignore_errors=True)  # still mapped on Windows: next save retries
+
+    def clear(self) -> None:
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    # --- Read ---
+    @staticmethod
+    def _codes(spec: Dict[str, Any], index: Any) -> np.ndarray:
+        return np.asarray(np.load(f"{spec['path']}.npy", mmap_mode="r", allow_pickle=False)[index])
+
+    def _read(self, spec: Dict[str, Any], index: Any, categorical: bool = True) -> Any:
+        data = self._codes(spec, index)
+        kind = spec["kind"]
+        if kind == "cat":
+            if not categorical:
+                return np.array(spec["categories"] + [np.nan], dtype=object)[data]
+            return pd.Categorical.from_codes(np.array(data), categories=spec["categories"])
+        if kind == "dict":
+            values = np.array(spec["categories"] + [np.nan], dtype=object)
+            return values[data]  # -1 picks the trailing NaN
+        if kind == "date":
+            # Few distinct expiries: build date objects once per value
+            values, inverse = np.unique(data, return_inverse=True)
+            objects = np.array([np.nan if np.isnat(v) else v.astype(object) for v in values], dtype=object)
+            return objects[inverse.reshape(-1)] if len(values) else np.empty(0, dtype=object)
+        if kind == "str":
+            out = data.astype(object)
+            if spec.get("na"):
+                missing = np.load(f"{spec['path']}.na.npy", mmap_mode="r")[index]
+                out[np.asarray(missing)] = np.nan
+            return out
+        return data.copy() if isinstance(index, slice) else data
+
+    def _matches(self, spec: Dict[str, Any], index: Any, value: Any) -> np.ndarray:
+        wanted = _as_list(value)
+        if spec["kind"] in ("cat", "dict"):
+            # Compare codes; the text is never materialised
+            lookup = {v: i for i, v in enumerate(spec["categories"])}
+            codes = [lookup[v] for v in wanted if v in lookup]
+            return np.isin(self._codes(spec, index), codes)
+        return pd.Series(self._read(spec, index)).isin(wanted).to_numpy()
+
+    def load(
+        self,
+        *,
+        segments: Optional[Iterable[str]] = None,
+        columns: Optional[Sequence[str]] = None,
+        where: Optional[Dict[str, Any]] = None,
+        day: Optional[date] = None,
+        categorical: bool = True,
+    ) -> Optional[pd.DataFrame]:
+        """Read the stored master, pruned to ``segments``, ``columns`` and ``where`` (column -> value(s)).
+
+        ``categorical=False`` returns segment/exchange/instrument_type as plain
+        object columns, as the drivers build them. Returns None when nothing is
+        stored, the copy is from another trading day than ``day`` (when given),
+        or the files cannot be read.
+        """
+        meta = self.meta()
+        if meta is None or (day is not None and meta["day"] != day.isoformat()):
+            return None
+        base = os.path.join(self.directory, meta["generation"])
+        specs: Dict[str, Dict[str, Any]] = {
+            name: {**spec, "path": os.path.join(base, spec["file"])} for name, spec in meta["columns"].items()
+        }
+        try:
+            if segments is not None and meta.get("partitions"):
+                parts = meta["partitions"]
+                ranges = [parts[s] for s in _as_list(segments) if s in parts]
+                index: Any = np.concatenate([np.arange(a, b) for a, b in ranges]) if ranges else np.empty(0, dtype=np.int64)
+                if len(ranges) == 1:
+                    index = slice(*ranges[0])
+            else:
+                index = slice(None)
+                if segments is not None:
+                    where = {**(where or {}), self.partition: segments}
+
+            if where:
+                # Filter on the predicate columns first, then read the rest only for matching rows
+                rows = np.arange(meta["rows"])[index]
+                mask = np.ones(len(rows), dtype=bool)
+                for name, value in where.items():
+                    mask &= self._matches(specs[name], index, value)
+                index = rows[mask]
+
+            names = [c for c in (columns if columns is not None else specs) if c in specs]
+            return pd.DataFrame({name: self._read(specs[name], index, categorical) for name in names})
+        except Exception:
+            logger.warning("Failed to read instrument store %s", self.directory, exc_info=True)
+            return None
+
+
+__all__ = ["InstrumentStore", "select_instruments", "trading_day"]
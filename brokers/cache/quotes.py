@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional
+
+import numpy as np
+
+from ..core.schemas import Quote
+from ..symbols.ids import IdTable, SymbolIds, symbol_ids
+
+
+DEFAULT_MAX_AGE = 1.0
+
+
+class QuoteCache:
+    """Last-tick quote store fed from the market-data websocket.
+
+    Entries are keyed by broker-native symbol (the translated form of the
+    normalized symbol, which is also what ticks carry) and stamped with the local
+    receive time. A lookup is a *hit* when the entry is younger than ``max_age``
+    seconds, *stale* when it exists but is older, and a *miss* otherwise; callers
+    fall back to REST on anything but a hit.
+
+    Storage is indexed by ``symbol_ids``: receive stamps and last prices sit in
+    NumPy columns, so a tick is a couple of array writes. ``last_prices`` reads
+    many symbols in one vectorized gather.
+    """
+
+    def __init__(self, max_age: float = DEFAULT_MAX_AGE, ids: Optional[SymbolIds] = None) -> None:
+        self.max_age = float(max_age)
+        self.ids = ids or symbol_ids
+        self._table = IdTable(capacity=max(1024, len(self.ids)), stamp=np.float64, ltp=np.float64)
+        self._quotes: List[Optional[Quote]] = []
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.stale = 0
+        self.updates = 0
+
+    @classmethod
+    def from_env(cls) -> Optional["QuoteCache"]:
+        """Build a cache when BROKER_QUOTE_CACHE is enabled, else return None."""
+        from ..config import getenv, getenv_bool
+
+        if not getenv_bool("BROKER_QUOTE_CACHE", False):
+            return None
+        max_age_ms = getenv("BROKER_QUOTE_CACHE_MAX_AGE_MS")
+        return cls(float(max_age_ms) / 1000.0 if max_age_ms else DEFAULT_MAX_AGE)
+
+    def put(self, symbol: str, quote: Quote, received: Optional[float] = None) -> None:
+        self.put_id(self.ids.intern(symbol), quote, received)
+
+    def put_id(self, sid: int, quote: Quote, received: Optional[float] = None) -> None:
+        stamp = time.monotonic() if received is None else received
+        with self._lock:
+            quotes = self._quotes
+            if sid >= len(quotes):
+                quotes.extend([None] * (sid + 1 - len(quotes)))
+            quotes[sid] = quote
+            self._table.set(sid, stamp=stamp, ltp=quote.last_price)
+            self.updates += 1
+
+    def get(self, symbol: str) -> Optional[Quote]:
+        """Return the cached quote if it is within the staleness budget."""
+        now = time.monotonic()
+        sid = self.ids.id_of(symbol)
+        with self._lock:
+            quote = self._quotes[sid] if 0 <= sid < len(self._quotes) else None
+            if quote is None:
+                self.misses += 1
+                return None
+            if now - self._table.stamp[sid] > self.max_age:
+                self.stale += 1
+                return None
+            self.hits += 1
+            return quote
+
+    def last_prices(self, symbols: Iterable[str], max_age: Optional[float] = None) -> np.ndarray:
+        """Last traded prices for many symbols at once; NaN where unknown or older than ``max_age``."""
+        ids = self.ids.ids_of(symbols)
+        with self._lock:
+            ltp = self._table.take("ltp", ids)
+            if max_age is not None:
+                stamps = self._table.take("stamp", ids)
+                ltp[~(time.monotonic() - stamps <= max_age)] = np.nan
+        return ltp
+
+    def age(self, symbol: str) -> Optional[float]:
+        """Seconds since the last tick for ``symbol`` (None if never seen)."""
+        stamp = self._table.get(self.ids.id_of(symbol), "stamp")
+        return None if np.isnan(stamp) else time.monotonic() - float(stamp)
+
+    def discard(self, symbol: str) -> None:
+        sid = self.ids.id_of(symbol)
+        with self._lock:
+            if 0 <= sid < len(self._quotes):
+                self._quotes[sid] = None
+                self._table.set(sid, stamp=np.nan, ltp=np.nan)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._quotes = []
+            self._table.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses + self.stale
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "stale": self.stale,
+                "updates": self.updates,
+                "symbols": sum(q is not None for q in self._quotes),
+                "hit_ratio": (self.hits / lookups) if lookups else 0.0,
+                "max_age": self.max_age,
+            }
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self.hits = self.misses = self.stale = self.updates = 0
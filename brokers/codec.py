@@ -0,0 +1,77 @@
+"""JSON codec: orjson when installed, stdlib ``json`` otherwise.
+
+``dumps`` returns bytes and ``loads`` accepts bytes/str, so payloads can go
+straight between sockets, files and SQLite blobs without an extra str copy.
+Set ``BROKER_JSON_BACKEND=json`` to force the stdlib backend.
+
+Keep this module free of package-relative imports: ``sensibull/_codec.py``
+loads it by path without importing the ``brokers`` package.
+"""
+
+from __future__ import annotations
+
+import json
+from typing import Any, Union
+
+
+JSONDecodeError = json.JSONDecodeError  # orjson.JSONDecodeError subclasses it
+
+
+def _orjson():
+    import os
+
+    if (os.getenv("BROKER_JSON_BACKEND") or "").lower() in ("json", "stdlib"):
+        return None
+    try:  # pragma: no cover - optional dependency
+        import orjson  # type: ignore
+
+        return orjson
+    except Exception:
+        return None
+
+
+_fast = _orjson()
+BACKEND = "orjson" if _fast is not None else "json"
+
+
+def _std_dumps(obj: Any, indent: bool, sort_keys: bool) -> bytes:
+    if indent:
+        return json.dumps(obj, indent=2, sort_keys=sort_keys, ensure_ascii=False).encode("utf-8")
+    return json.dumps(obj, separators=(",", ":"), sort_keys=sort_keys, ensure_ascii=False).encode("utf-8")
+
+
+if _fast is not None:
+    _OPTS = _fast.OPT_NON_STR_KEYS | _fast.OPT_SERIALIZE_NUMPY
+
+    def dumps(obj: Any, *, indent: bool = False, sort_keys: bool = False) -> bytes:
+        """Serialize ``obj`` to UTF-8 JSON bytes (2-space indent when ``indent``)."""
+        opts = _OPTS | (_fast.OPT_INDENT_2 if indent else 0) | (_fast.OPT_SORT_KEYS if sort_keys else 0)
+        try:
+            return _fast.dumps(obj, option=opts)
+        except TypeError:
+            # e.g. ints beyond 64 bits; let the stdlib decide
+            return _std_dumps(obj, indent, sort_keys)
+
+    def loads(data: Union[bytes, bytearray, memoryview, str]) -> Any:
+        """Parse JSON from bytes or str."""
+        return _fast.loads(data)
+
+else:
+
+    def dumps(obj: Any, *, indent: bool = False, sort_keys: bool = False) -> bytes:
+        """Serialize ``obj`` to UTF-8 JSON bytes (2-space indent when ``indent``)."""
+        return _std_dumps(obj, indent, sort_keys)
+
+    def loads(data: Union[bytes, bytearray, memoryview, str]) -> Any:
+        """Parse JSON from bytes or str."""
+        if isinstance(data, memoryview):
+            data = data.tobytes()
+        return json.loads(data)
+
+
+def dumps_str(obj: Any, *, indent: bool = False, sort_keys: bool = False) -> str:
+    """``dumps`` as text, for APIs that only take str."""
+    return dumps(obj, indent=indent, sort_keys=sort_keys).decode("utf-8")
+
+
+__all__ = ["BACKEND", "JSONDecodeError", "dumps", "dumps_str", "loads"]
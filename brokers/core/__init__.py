@@ -9,6 +9,8 @@ from .schemas import (
     Quote,
     Instrument,
     BrokerCapabilities,
+    RawRetention,
+    set_raw_retention,
 )
 from .errors import (
     BrokerError,
@@ -20,8 +22,10 @@ from .errors import (
     ValidationError,
     HTTPError,
 )
+from .candles import CANDLE_COLUMNS, CandleColumns
 from .interface import BrokerDriver
 from .gateway import BrokerGateway
+from .async_gateway import AsyncBrokerGateway
 
 __all__ = [
     # Enums
@@ -38,6 +42,8 @@ __all__ = [
     "Quote",
     "Instrument",
     "BrokerCapabilities",
+    "RawRetention",
+    "set_raw_retention",
     # Errors
     "BrokerError",
     "AuthError",
@@ -47,9 +53,13 @@ __all__ = [
     "MarginUnavailableError",
     "ValidationError",
     "HTTPError",
+    # Columnar candles
+    "CANDLE_COLUMNS",
+    "CandleColumns",
     # Interface / Facade
     "BrokerDriver",
     "BrokerGateway",
+    "AsyncBrokerGateway",
 ]
 
 
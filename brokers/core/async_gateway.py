@@ -0,0 +1,184 @@
+from __future__ import annotations
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, Dict, List, Optional, Union
+
+from .candles import CandleColumns, columns_to_candles, concat_columns
+from .gateway import BrokerGateway
+from .interceptors import chained_async
+from .schemas import OrderRequest, OrderResponse, Position, Quote, materialize_raw
+from ..net.batching import chunked
+from ..net.ratelimiter import Priority, history_bucket, quote_bucket
+
+
+DEFAULT_MAX_WORKERS = 8
+
+
+class AsyncBrokerGateway:
+    """Awaitable facade over BrokerGateway.
+
+    Calls go to the driver's native coroutine (``<method>_async``) when the driver
+    advertises ``supports_native_async``; otherwise the blocking gateway method runs
+    on a bounded thread pool so one event loop can keep many requests in flight.
+    """
+
+    def __init__(self, gateway: BrokerGateway, *, max_workers: int = DEFAULT_MAX_WORKERS) -> None:
+        self.gateway = gateway
+        self.broker_name = gateway.broker_name
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=f"{gateway.broker_name}-gw")
+
+    # --- Construction helpers ---
+    @classmethod
+    def from_name(cls, name: str, *, max_workers: int = DEFAULT_MAX_WORKERS) -> "AsyncBrokerGateway":
+        return cls(BrokerGateway.from_name(name), max_workers=max_workers)
+
+    @property
+    def driver(self) -> Any:
+        return self.gateway.driver
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=False)
+
+    async def __aenter__(self) -> "AsyncBrokerGateway":
+        return self
+
+    async def __aexit__(self, *exc: Any) -> None:
+        self.close()
+
+    # --- Dispatch helpers ---
+    def _native(self, method: str) -> Optional[Callable[..., Any]]:
+        if not getattr(self.driver.get_capabilities(), "supports_native_async", False):
+            return None
+        fn = getattr(self.driver, f"{method}_async", None)
+        if not callable(fn):
+            return None
+        chain = tuple(self.gateway.interceptors)
+        # Same driver-layer metrics/hooks as the sync path, recorded under the sync method name
+        return chained_async(fn, self.broker_name, "driver", method, chain) if chain else fn
+
+    async def _acquire(self, priority: Priority) -> None:
+        limiter = self.gateway.rate_limiter
+        if limiter is not None:
+            await limiter.acquire_async(priority)
+
+    async def _acquire_quote(self) -> None:
+        bucket = quote_bucket(self.broker_name)
+        if bucket is not None:
+            await bucket.acquire_async()
+        await self._acquire(Priority.NORMAL)
+
+    async def _run(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, partial(fn, *args, **kwargs))
+
+    # --- Account ---
+    async def get_positions(self) -> List[Position]:
+        native = self._native("get_positions")
+        if native is None:
+            return await self._run(self.gateway.get_positions)
+
+        async def fetch() -> List[Position]:
+            await self._acquire(Priority.NORMAL)
+            return await native()
+
+        # Same key as the sync gateway, so threads and coroutines share one request
+        return await self.gateway.account_flight.do_async("positions", fetch)
+
+    # --- Orders ---
+    async def place_order(self, request: Union[OrderRequest, Dict[str, Any]]) -> Union[OrderResponse, Dict[str, Any]]:
+        native = self._native("place_order")
+        if native is None:
+            return await self._run(self.gateway.place_order, request)
+        await self._acquire(Priority.ORDER)
+        try:
+            if isinstance(request, dict):
+                resp = await native(self.gateway._prepare_order(self.gateway._dict_to_order_request(request)))
+                return self.gateway._legacy_order_response(resp)
+            return await native(self.gateway._prepare_order(request))
+        finally:
+            self.gateway.account_flight.invalidate()
+
+    async def cancel_order(self, order_id: Union[str, Dict[str, Any]]) -> Union[OrderResponse, Dict[str, Any]]:
+        native = self._native("cancel_order")
+        if native is None:
+            return await self._run(self.gateway.cancel_order, order_id)
+        await self._acquire(Priority.ORDER)
+        try:
+            if isinstance(order_id, dict):
+                oid = str(order_id.get("id") or order_id.get("order_id") or "")
+                resp = await native(oid)
+                return {"s": "ok" if resp.status == "ok" else "error", "id": oid, "raw": materialize_raw(resp.raw)}
+            return await native(str(order_id))
+        finally:
+            self.gateway.account_flight.invalidate()
+
+    async def modify_order(self, order_id: str, updates: Dict[str, Any]) -> OrderResponse:
+        native = self._native("modify_order")
+        if native is None:
+            return await self._run(self.gateway.modify_order, order_id, updates)
+        await self._acquire(Priority.ORDER)
+        try:
+            return await native(order_id, updates)
+        finally:
+            self.gateway.account_flight.invalidate()
+
+    # --- Market data ---
+    async def get_quote(self, symbol: str) -> Quote:
+        native = self._native("get_quote")
+        if native is None or self.gateway.quote_batcher is not None:
+            return await self._run(self.gateway.get_quote, symbol)
+        broker_symbol = self.gateway._broker_symbol(symbol)
+        cached = self.gateway._cached_quote(broker_symbol)
+        if cached is not None:
+            return cached
+        await self._acquire_quote()
+        return await native(broker_symbol)
+
+    async def get_quotes(self, symbols: List[str]) -> Dict[str, Quote]:
+        native = self._native("get_quotes")
+        if native is None or self.gateway.quote_cache is not None:
+            # Cache lookups are cheap; only the REST remainder needs a worker thread
+            return await self._run(self.gateway.get_quotes, symbols)
+        broker_symbols = {s: self.gateway._broker_symbol(s) for s in symbols}
+        size = self.driver.get_capabilities().max_quotes_per_request
+
+        async def fetch(chunk: List[str]) -> Dict[str, Quote]:
+            await self._acquire_quote()  # one token per broker request
+            return await native(chunk)
+
+        found: Dict[str, Quote] = {}
+        for part in await asyncio.gather(*(fetch(c) for c in chunked(list(dict.fromkeys(broker_symbols.values())), size))):
+            found.update(part)
+        return {s: found[bs] for s, bs in broker_symbols.items() if bs in found}
+
+    async def get_history(self, symbol: str, interval: str, start: str, end: str, oi: bool = False) -> List[Dict[str, Any]]:
+        return columns_to_candles(await self.get_history_array(symbol, interval, start, end, oi))
+
+    async def get_history_array(self, symbol: str, interval: str, start: str, end: str, oi: bool = False) -> CandleColumns:
+        native = self._native("get_history_array")
+        if native is None or self.gateway.candle_cache is not None:
+            return await self._run(self.gateway.get_history_array, symbol, interval, start, end, oi)
+        broker_symbol = self.gateway._broker_symbol(symbol)
+        bucket = history_bucket(self.broker_name)
+
+        async def fetch(chunk_start: str, chunk_end: str) -> CandleColumns:
+            if bucket is not None:
+                await bucket.acquire_async()
+            await self._acquire(Priority.BULK)
+            return await native(broker_symbol, interval, chunk_start, chunk_end, oi)
+
+        chunks = self.gateway._history_chunks(interval, start, end)
+        results = await asyncio.gather(*(fetch(s, e) for s, e in chunks))
+        return concat_columns(list(results))
+
+    # --- Margins ---
+    async def get_margins_required(self, orders: List[Dict[str, Any]]) -> Any:
+        return await self._run(self.gateway.get_margins_required, orders)
+
+    async def get_span_margin(self, orders: List[Dict[str, Any]]) -> Any:
+        return await self._run(self.gateway.get_span_margin, orders)
+
+    async def get_multiorder_margin(self, orders: List[Dict[str, Any]]) -> Any:
+        return await self._run(self.gateway.get_multiorder_margin, orders)
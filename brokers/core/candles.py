@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+from typing import Any, Dict, Iterable, List, Sequence
+
+import numpy as np
+
+
+# Columnar candle layout shared by drivers, the gateway and the candle cache.
+# ts is epoch seconds; volume/oi are float64 so a missing value can be NaN.
+CANDLE_COLUMNS = ("ts", "open", "high", "low", "close", "volume", "oi")
+CANDLE_DTYPES = {
+    "ts": np.int64,
+    "open": np.float64,
+    "high": np.float64,
+    "low": np.float64,
+    "close": np.float64,
+    "volume": np.float64,
+    "oi": np.float64,
+}
+
+CandleColumns = Dict[str, np.ndarray]
+
+
+def empty_columns() -> CandleColumns:
+    return {name: np.empty(0, dtype=CANDLE_DTYPES[name]) for name in CANDLE_COLUMNS}
+
+
+class FailedColumns(dict):
+    """Empty columns standing for a failed broker call rather than a range with no bars."""
+
+
+def failed_columns() -> CandleColumns:
+    """Empty result drivers return when the history request itself failed."""
+    return FailedColumns(empty_columns())
+
+
+def is_failed(cols: CandleColumns) -> bool:
+    return isinstance(cols, FailedColumns)
+
+
+def columns_from_rows(rows: Sequence[Any]) -> CandleColumns:
+    """Parse broker candle rows ``[ts, o, h, l, c, v?, oi?]`` into contiguous columns.
+
+    Rows that are not lists/tuples, are shorter than five fields or carry an
+    invalid timestamp are skipped, matching the previous per-dict parser.
+    """
+    if not rows:
+        return empty_columns()
+    try:
+        # Fast path: rectangular numeric payload converts in one shot
+        arr = np.asarray(rows, dtype=np.float64)
+        if arr.ndim != 2 or arr.shape[1] < 5:
+            raise ValueError("ragged candles")
+    except (TypeError, ValueError):
+        arr = _rows_slow(rows)
+    n = arr.shape[0]
+    cols: CandleColumns = {"ts": arr[:, 0].astype(np.int64)}
+    for i, name in enumerate(CANDLE_COLUMNS[1:], start=1):
+        cols[name] = np.ascontiguousarray(arr[:, i]) if arr.shape[1] > i else np.full(n, np.nan)
+    return cols
+
+
+def _rows_slow(rows: Sequence[Any]) -> np.ndarray:
+    out = np.full((len(rows), len(CANDLE_COLUMNS)), np.nan)
+    keep = np.zeros(len(rows), dtype=bool)
+    for r, c in enumerate(rows):
+        if not isinstance(c, (list, tuple)) or len(c) < 5:
+            continue
+        try:
+            out[r, 0] = int(c[0])
+        except Exception:
+            continue
+        for i in range(1, min(len(c), len(CANDLE_COLUMNS))):
+            if c[i] is not None:
+                out[r, i] = float(c[i])
+        keep[r] = True
+    return out[keep]
+
+
+def columns_from_candles(candles: Iterable[Dict[str, Any]]) -> CandleColumns:
+    """Build columns from ``{ts, open, ...}`` dicts; candles without a ts are dropped."""
+    rows = [c for c in candles if c.get("ts") is not None]
+    n = len(rows)
+    cols: CandleColumns = {"ts": np.fromiter((int(c["ts"]) for c in rows), dtype=np.int64, count=n)}
+    for name in CANDLE_COLUMNS[1:]:
+        cols[name] = np.fromiter(
+            (np.nan if c.get(name) is None else float(c[name]) for c in rows), dtype=np.float64, count=n
+        )
+    return cols
+
+
+def columns_to_candles(cols: CandleColumns) -> List[Dict[str, Any]]:
+    """List-of-dicts view used by the legacy ``get_history`` API."""
+
+    def floats(name: str) -> List[Any]:
+        return [None if v != v else v for v in cols[name].tolist()]
+
+    def ints(name: str) -> List[Any]:
+        return [None if v != v else int(v) for v in cols[name].tolist()]
+
+    return [
+        {"ts": t, "open": o, "high": h, "low": l, "close": c, "volume": v, "oi": i}
+        for t, o, h, l, c, v, i in zip(
+            cols["ts"].tolist(),
+            floats("open"),
+            floats("high"),
+            floats("low"),
+            floats("close"),
+            ints("volume"),
+            ints("oi"),
+        )
+    ]
+
+
+def concat_columns(parts: Sequence[CandleColumns]) -> CandleColumns:
+    """Concatenate column sets in time order; on duplicate ts the later part wins."""
+    parts = [p for p in parts if p is not None and len(p["ts"])]
+    if not parts:
+        return empty_columns()
+    cols = {k: np.concatenate([p[k] for p in parts]) for k in CANDLE_COLUMNS}
+    order = np.argsort(cols["ts"], kind="stable")
+    cols = {k: v[order] for k, v in cols.items()}
+    ts = cols["ts"]
+    keep = np.ones(len(ts), dtype=bool)
+    keep[:-1] = ts[1:] != ts[:-1]
+    return {k: v[keep] for k, v in cols.items()}
+
+
+def slice_columns(cols: CandleColumns, lo: int, hi: int) -> CandleColumns:
+    """Rows with ``lo <= ts < hi`` (ts is sorted, so this is a bisect)."""
+    i, j = np.searchsorted(cols["ts"], [lo, hi])
+    return {k: v[i:j] for k, v in cols.items()}
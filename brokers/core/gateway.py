@@ -1,13 +1,20 @@
 from __future__ import annotations
 
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import replace
-from datetime import datetime, timedelta
-import time
-from typing import Any, Dict, List, Optional, Union
+import inspect
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple, Union
 
+from .candles import CandleColumns, columns_to_candles, concat_columns, is_failed
 from .enums import Exchange, OrderType, ProductType, TransactionType, Validity
 from .errors import MarginUnavailableError, UnsupportedOperationError
+from .interceptors import Interceptor, install_interceptors
 from .interface import BrokerDriver
+from .option_chain import DEFAULT_STRIKE_COUNT, build_option_chain, spot_symbol
+from ..cache.candles import CandleCache, IncompleteFetch
+from ..cache.quotes import QuoteCache
+from ..logging import get_logger
 from .schemas import (
     BrokerCapabilities,
     Funds,
@@ -16,24 +23,117 @@ from .schemas import (
     OrderResponse,
     Position,
     Quote,
+    materialize_raw,
 )
+from ..net.batching import MicroBatcher, SingleFlight, chunked, map_concurrent
+from ..net.keepalive import DEFAULT_INTERVAL as DEFAULT_KEEPALIVE_INTERVAL, KeepAlive, parse_hours
+from ..net.ratelimiter import AccountRateLimiter, Priority, account_limiter, history_bucket, quote_bucket
+from ..net.session import get_session_manager
+from ..symbols.index import InstrumentIndex
+from ..symbols.parser import CE, PE
 from ..symbols.registry import symbol_registry
 
 
+logger = get_logger(__name__)
+
+# Upper bound on concurrent history chunk requests; the rate budget does the real pacing
+HISTORY_MAX_WORKERS = 8
+
+
 class BrokerGateway:
     """Facade orchestrating symbol normalization and delegation to a driver."""
 
-    def __init__(self, driver: BrokerDriver, broker_name: str) -> None:
+    def __init__(
+        self,
+        driver: BrokerDriver,
+        broker_name: str,
+        *,
+        candle_cache: Optional[CandleCache] = None,
+        quote_cache: Optional[QuoteCache] = None,
+        quote_batch_window: Optional[float] = None,
+        account_cache_ttl: float = 0.0,
+        interceptors: Optional[List[Interceptor]] = None,
+        rate_limiter: Optional[AccountRateLimiter] = None,
+    ) -> None:
         self.driver = driver
         self.broker_name = broker_name
+        # Account-wide multi-window budget shared by every REST call from this process
+        self.rate_limiter = rate_limiter
+        self.interceptors: List[Interceptor] = list(interceptors or [])
+        if self.interceptors:
+            # Wrap both layers so gateway time minus driver time isolates normalization overhead
+            install_interceptors(driver, _DRIVER_METHODS, self.interceptors, broker=broker_name, layer="driver")
+            install_interceptors(self, _GATEWAY_METHODS, self.interceptors, broker=broker_name, layer="gateway")
+        self.candle_cache = candle_cache
+        self.quote_cache = quote_cache
+        # Opt-in: coalesce concurrent get_quote calls into one driver.get_quotes
+        self.quote_batcher: Optional[MicroBatcher] = (
+            MicroBatcher(self._fetch_quotes, window=quote_batch_window)
+            if quote_batch_window
+            else None
+        )
+        # Read-only account endpoints: concurrent identical calls share one request
+        self.account_flight = SingleFlight(ttl=account_cache_ttl)
+        self.pinger: Optional[KeepAlive] = None
+        # (master frame, day, index) for local option chains; the frame is held, not its id()
+        self._instrument_index: Optional[Tuple[Any, date, InstrumentIndex]] = None
 
     # --- Construction helpers ---
     @classmethod
-    def from_name(cls, name: str) -> "BrokerGateway":
+    def from_name(
+        cls,
+        name: str,
+        *,
+        candle_cache: Optional[CandleCache] = None,
+        quote_cache: Optional[QuoteCache] = None,
+        quote_batch_window: Optional[float] = None,
+        account_cache_ttl: Optional[float] = None,
+        interceptors: Optional[List[Interceptor]] = None,
+        rate_limiter: Optional[AccountRateLimiter] = None,
+    ) -> "BrokerGateway":
+        from ..config import getenv, getenv_bool
+        from ..metrics import interceptors_from_env
+        from ..net.replay import install_from_env
         from ..registry import BrokerRegistry
 
+        mock_url = getenv("BROKER_MOCK_URL")
+        if mock_url:
+            from ..mock import use_mock_server
+
+            use_mock_server(mock_url)
         driver = BrokerRegistry.create(name)
-        return cls(driver=driver, broker_name=name.lower())
+        # Offline record/replay of SDK, HTTP and websocket traffic (BROKER_TRANSPORT)
+        install_from_env(driver)
+        if candle_cache is None:
+            candle_cache = CandleCache.from_env()
+        if quote_cache is None:
+            quote_cache = QuoteCache.from_env()
+        if quote_batch_window is None:
+            window_ms = getenv("BROKER_QUOTE_BATCH_WINDOW_MS")
+            quote_batch_window = float(window_ms) / 1000.0 if window_ms else None
+        if account_cache_ttl is None:
+            ttl_ms = getenv("BROKER_ACCOUNT_CACHE_TTL_MS")
+            account_cache_ttl = float(ttl_ms) / 1000.0 if ttl_ms else 0.0
+        if interceptors is None:
+            interceptors = interceptors_from_env()
+        if rate_limiter is None:
+            rate_limiter = account_limiter(name)
+        gateway = cls(
+            driver=driver,
+            broker_name=name.lower(),
+            candle_cache=candle_cache,
+            quote_cache=quote_cache,
+            quote_batch_window=quote_batch_window,
+            account_cache_ttl=account_cache_ttl,
+            interceptors=interceptors,
+            rate_limiter=rate_limiter,
+        )
+        if getenv_bool("BROKER_PREWARM", False):
+            gateway.warm_up()
+        interval = getenv("BROKER_KEEPALIVE_INTERVAL_S")
+        if interval and float(interval) > 0:
+            gateway.start_keepalive(float(interval), hours=parse_hours(getenv("BROKER_KEEPALIVE_HOURS")))
+        return gateway
 
     # --- Capability ---
     def get_capabilities(self) -> BrokerCapabilities:
@@ -41,70 +141,105 @@ class BrokerGateway:
 
     # --- Account ---
     def get_funds(self) -> Funds:
-        return self.driver.get_funds()
+        return self.account_flight.do("funds", lambda: self._call(Priority.NORMAL, self.driver.get_funds))
 
     def get_positions(self) -> List[Position]:
-        return self.driver.get_positions()
+        return self.account_flight.do("positions", lambda: self._call(Priority.NORMAL, self.driver.get_positions))
 
     def get_position(self, symbol: str, exchange: Optional[str] = None) -> Optional[Position]:
-        return self.driver.get_position(symbol, exchange)
+        return self._call(Priority.NORMAL, self.driver.get_position, symbol, exchange)
 
     # --- Orders ---
     def place_order(self, request: Union[OrderRequest, Dict[str, Any]]) -> Union[OrderResponse, Dict[str, Any]]:
         # Back-compat: accept Fyers-like dicts and return legacy-shaped dict
         if isinstance(request, dict):
-            req_obj = self._dict_to_order_request(request)
-            resp = self.place_order(req_obj)  # type: ignore[arg-type]
-            # Convert to legacy Fyers-like response shape
-            result: Dict[str, Any] = {
-                "s": "ok" if resp.status == "ok" else "error",
-                "id": resp.order_id,
-            }
-            if resp.message:
-                result["message"] = resp.message
-            if resp.raw is not None:
-                result["raw"] = resp.raw
-            return result
+            resp = self.place_order(self._dict_to_order_request(request))  # type: ignore[arg-type]
+            return self._legacy_order_response(resp)  # type: ignore[arg-type]
 
         # Typed path
-        internal = f"{request.exchange.value}:{request.symbol}"
-        broker_symbol = symbol_registry.to_broker_symbol(self.broker_name, internal)
-        req2 = replace(
-            request,
-            symbol=broker_symbol.split(":", 1)[1] if ":" in broker_symbol else broker_symbol,
-        )
-        return self.driver.place_order(req2)
+        resp = self._call(Priority.ORDER, self.driver.place_order, self._prepare_order(request))
+        self.account_flight.invalidate()
+        return resp
 
     def cancel_order(self, order_id: Union[str, Dict[str, Any]]) -> Union[OrderResponse, Dict[str, Any]]:
         # Back-compat: allow dict {"id": ...}
         if isinstance(order_id, dict):
             oid = str(order_id.get("id") or order_id.get("order_id") or "")
-            resp = self.driver.cancel_order(oid)
-            return {"s": "ok" if resp.status == "ok" else "error", "id": oid, "raw": resp.raw}
-        return self.driver.cancel_order(str(order_id))
+            resp = self._call(Priority.ORDER, self.driver.cancel_order, oid)
+            self.account_flight.invalidate()
+            return {"s": "ok" if resp.status == "ok" else "error", "id": oid, "raw": materialize_raw(resp.raw)}
+        resp = self._call(Priority.ORDER, self.driver.cancel_order, str(order_id))
+        self.account_flight.invalidate()
+        return resp
 
     def modify_order(self, order_id: str, updates: Dict[str, Any]) -> OrderResponse:
-        return self.driver.modify_order(order_id, updates)
+        resp = self._call(Priority.ORDER, self.driver.modify_order, order_id, updates)
+        self.account_flight.invalidate()
+        return resp
 
     def get_orderbook(self) -> List[Dict[str, Any]]:
-        return self.driver.get_orderbook()
+        return self.account_flight.do("orderbook", lambda: self._call(Priority.NORMAL, self.driver.get_orderbook))
 
     def get_tradebook(self) -> List[Dict[str, Any]]:
-        return self.driver.get_tradebook()
+        return self.account_flight.do("tradebook", lambda: self._call(Priority.NORMAL, self.driver.get_tradebook))
 
     def get_order(self, order_id: str) -> Optional[Dict[str, Any]]:
-        return self.driver.get_order(order_id)
+        if type(self.driver).get_order is not BrokerDriver.get_order:
+            return self._call(Priority.NORMAL, self.driver.get_order, order_id)
+        # Default lookup scans the orderbook; go through the shared one
+        for order in self.get_orderbook():
+            if str(order.get("order_id") or order.get("id")) == str(order_id):
+                return order
+        return None
+
+    def get_order_status(self, order_id: str) -> Any:
+        """Status of one order from the (shared) orderbook, or "UNKNOWN"."""
+        order = self.get_order(order_id)
+        if not order:
+            return "UNKNOWN"
+        return order.get("status", "UNKNOWN")
 
     # --- Market data ---
     def get_quote(self, symbol: str) -> Quote:
-        internal = symbol_registry.normalize(symbol)
-        broker_symbol = symbol_registry.to_broker_symbol(self.broker_name, internal)
-        return self.driver.get_quote(broker_symbol)
+        broker_symbol = self._broker_symbol(symbol)
+        cached = self._cached_quote(broker_symbol)
+        if cached is not None:
+            return cached
+        if self.quote_batcher is not None:
+            quote = self.quote_batcher.submit(broker_symbol)
+            if quote is not None:
+                return quote
+            # Not in the batched response: let the single-symbol path produce its usual result/error
+        return self._quote_call(self.driver.get_quote, broker_symbol)
 
     def get_quotes(self, symbols: List[str]) -> Dict[str, Quote]:
-        internal_symbols = [symbol_registry.normalize(s) for s in symbols]
-        broker_symbols = [symbol_registry.to_broker_symbol(self.broker_name, s) for s in internal_symbols]
-        return self.driver.get_quotes(broker_symbols)
+        """Quotes for many symbols in as few broker round trips as possible.
+
+        Results are keyed by the caller's symbol strings; symbols the broker could
+        not quote are absent.
+        """
+        broker_symbols = {s: self._broker_symbol(s) for s in symbols}
+        found: Dict[str, Quote] = {}
+        missing: List[str] = []
+        for bs in dict.fromkeys(broker_symbols.values()):
+            cached = self._cached_quote(bs)
+            if cached is not None:
+                found[bs] = cached
+            else:
+                missing.append(bs)
+        if missing:
+            found.update(self._fetch_quotes(missing))
+        return {s: found[bs] for s, bs in broker_symbols.items() if bs in found}
+
+    def _fetch_quotes(self, broker_symbols: List[str]) -> Dict[str, Quote]:
+        """REST quotes as one rate-limited driver call per broker request."""
+        size = self.driver.get_capabilities().max_quotes_per_request
+        found: Dict[str, Quote] = {}
+        for part in map_concurrent(
+            lambda chunk: self._quote_call(self.driver.get_quotes, chunk), chunked(broker_symbols, size)
+        ):
+            found.update(part)
+        return found
 
     def get_history(self, symbol: str, interval: str, start: str, end: str, oi: bool = False) -> List[Dict[str, Any]]:
         """
@@ -118,64 +253,124 @@ class BrokerGateway:
             oi (bool): Whether to include open interest data
             
         Returns:
-            List[Dict[str, Any]]: Combined historical data from all chunks
+            List[Dict[str, Any]]: Combined historical data from all chunks, ordered by
+            timestamp with duplicates at chunk boundaries removed
+
+        Chunks are fetched concurrently, paced by the broker's shared history budget.
+        With a ``candle_cache`` configured, only ranges missing from the local store
+        are requested from the broker.
         """
-        internal = symbol_registry.normalize(symbol)
-        broker_symbol = symbol_registry.to_broker_symbol(self.broker_name, internal)
-        
-        # Convert string dates to datetime objects
-        start_dt = datetime.strptime(start, "%Y-%m-%d")
-        end_dt = datetime.strptime(end, "%Y-%m-%d")
-        
-        # Determine chunk size based on interval
-        if interval in ["day", "1d", "D", "1D"]:
-            # For daily resolution: up to 366 days per request
-            max_days = 366
-        elif interval in ["5S", "10S", "15S", "30S", "45S"]:
-            # For seconds resolution: up to 30 trading days
-            max_days = 30
+        return columns_to_candles(self.get_history_array(symbol, interval, start, end, oi))
+
+    def get_history_array(self, symbol: str, interval: str, start: str, end: str, oi: bool = False) -> CandleColumns:
+        """Columnar variant of ``get_history``: one contiguous NumPy array per field.
+
+        Keys are ``CANDLE_COLUMNS`` (ts as int64 epoch seconds, prices/volume/oi as
+        float64 with NaN for missing values), suitable for ``pd.DataFrame(cols)``.
+        """
+        broker_symbol = self._broker_symbol(symbol)
+        if self.candle_cache is not None:
+            return self.candle_cache.get(
+                self.broker_name,
+                broker_symbol,
+                interval,
+                start,
+                end,
+                oi,
+                lambda s, e: self._fetch_history(broker_symbol, interval, s, e, oi, strict=True),
+            )
+        return self._fetch_history(broker_symbol, interval, start, end, oi)
+
+    def _fetch_history(self, broker_symbol: str, interval: str, start: str, end: str, oi: bool, strict: bool = False) -> CandleColumns:
+        """Chunked, concurrent history fetch.
+
+        Drivers report a failed request as ``failed_columns()``; with ``strict`` such a
+        chunk raises ``IncompleteFetch`` so the candle cache does not record it as
+        covered. A chunk that is merely empty (holidays, before listing) is coverage.
+        """
+        chunks = self._history_chunks(interval, start, end)
+        bucket = history_bucket(self.broker_name)
+
+        def fetch(chunk: Tuple[str, str]) -> CandleColumns:
+            # Pace against the broker's shared history budget rather than a fixed sleep
+            if bucket is not None:
+                bucket.acquire()
+            return self._call(Priority.BULK, self.driver.get_history_array, broker_symbol, interval, chunk[0], chunk[1], oi)
+
+        if len(chunks) <= 1:
+            results = [fetch(c) for c in chunks]
         else:
-            # For minute resolutions: up to 100 days per request
-            max_days = 100
-        
-        # Initialize result container
-        all_candles = []
-        
-        # Break the date range into chunks
-        current_start = start_dt
-        while current_start <= end_dt:
-            # Calculate end date for this chunk
-            current_end = min(current_start + timedelta(days=max_days - 1), end_dt)
-            
-            # Format dates for API request
-            chunk_start = current_start.strftime("%Y-%m-%d")
-            chunk_end = current_end.strftime("%Y-%m-%d")
-            
-            # Get data for this chunk
-            chunk_data = self.driver.get_history(broker_symbol, interval, chunk_start, chunk_end, oi)
-            
-            # Extend results with chunk data
-            if chunk_data:
-                all_candles.extend(chunk_data)
-            
-            # Add a small delay to avoid rate limiting
-            time.sleep(0.5)
-            
-            # Move to next chunk
-            current_start = current_end + timedelta(days=1)
-        
-        return all_candles
+            with ThreadPoolExecutor(max_workers=min(len(chunks), HISTORY_MAX_WORKERS)) as pool:
+                results = list(pool.map(fetch, chunks))
+        # Chunks share boundary days; concat sorts by ts and drops the repeats
+        cols = concat_columns(results)
+        if strict and any(is_failed(r) for r in results):
+            raise IncompleteFetch(cols)
+        return cols
 
     # --- Option chain ---
     def get_option_chain(self, underlying: str, exchange: str, **kwargs: Any) -> List[Dict[str, Any]]:
-        return self.driver.get_option_chain(underlying, exchange, **kwargs)
+        return self._call(Priority.NORMAL, self.driver.get_option_chain, underlying, exchange, **kwargs)
+
+    def build_option_chain(
+        self,
+        underlying: str,
+        *,
+        expiry: Optional[date] = None,
+        strike_count: int = DEFAULT_STRIKE_COUNT,
+        spot: Optional[float] = None,
+        quotes: bool = True,
+    ) -> List[Dict[str, Any]]:
+        """Option chain from the cached instrument master, priced by one batched ``get_quotes`` call.
+
+        Covers ``strike_count`` strikes either side of ATM for ``expiry`` (default: the
+        next one). ``spot`` defaults to a quote of the underlying; pass it to save
+        that call. Raises ``ValidationError`` when no positive spot price is available.
+        Unlike ``get_option_chain`` the result has the same shape on every broker.
+        """
+        index = self.instrument_index()
+        if spot is None:
+            spot = self.get_quote(spot_symbol(underlying)).last_price
+        return build_option_chain(
+            index,
+            underlying,
+            spot=spot,
+            expiry=expiry,
+            strike_count=strike_count,
+            get_quotes=self.get_quotes if quotes else None,
+        )
+
+    def instrument_index(self, refresh: bool = False) -> InstrumentIndex:
+        """``InstrumentIndex`` over the driver's master, rebuilt when the master or the day changes.
+
+        When the full master is not loaded, only the option rows are read (from the
+        driver's instrument store when it has one).
+        """
+        master = self.driver.get_instruments()
+        today = date.today()
+        cached = self._instrument_index
+        if cached is not None and cached[0] is master and cached[1] == today and not refresh:
+            return cached[2]
+        df = master if master is not None else self.driver.get_instruments(where={"instrument_type": [CE, PE]})
+        if df is None or not hasattr(df, "columns"):
+            raise UnsupportedOperationError("Broker does not provide an instrument master")
+        index = InstrumentIndex(df)
+        self._instrument_index = (master, today, index)
+        return index
 
     # --- Instruments ---
     def download_instruments(self) -> None:
         self.driver.download_instruments()
 
-    def get_instruments(self) -> List[Instrument]:
-        return self.driver.get_instruments()
+    def get_instruments(
+        self,
+        segments: Optional[List[str]] = None,
+        columns: Optional[List[str]] = None,
+        where: Optional[Dict[str, Any]] = None,
+    ) -> List[Instrument]:
+        if segments is None and columns is None and where is None:
+            return self.driver.get_instruments()
+        return self.driver.get_instruments(segments, columns, where)
 
     def get_nse_futures_symbols(self) -> List[str]:
         return self.driver.get_nse_futures_symbols()
@@ -192,6 +387,8 @@ class BrokerGateway:
         on_noreconnect: Any | None = None,
         **kwargs: Any,
     ) -> None:
+        if self.quote_cache is not None:
+            on_ticks = self._feed_quote_cache(on_ticks)
         # Forward known callbacks and any extra kwargs (e.g., simulate_date for fyrodha)
         self.driver.connect_websocket(
             on_ticks=on_ticks,
@@ -204,9 +401,7 @@ class BrokerGateway:
         )
 
     def symbols_to_subscribe(self, symbols: List[str]) -> None:
-        internal_symbols = [symbol_registry.normalize(s) for s in symbols]
-        broker_symbols = [symbol_registry.to_broker_symbol(self.broker_name, s) for s in internal_symbols]
-        self.driver.symbols_to_subscribe(broker_symbols)
+        self.driver.symbols_to_subscribe([self._broker_symbol(s) for s in symbols])
 
     def connect_order_websocket(
         self,
@@ -230,49 +425,160 @@ class BrokerGateway:
         )
 
     def unsubscribe(self, symbols: List[str]) -> None:
-        internal_symbols = [symbol_registry.normalize(s) for s in symbols]
-        broker_symbols = [symbol_registry.to_broker_symbol(self.broker_name, s) for s in internal_symbols]
+        broker_symbols = [self._broker_symbol(s) for s in symbols]
         self.driver.unsubscribe(broker_symbols)
+        if self.quote_cache is not None:
+            # No more ticks will refresh these; don't let them linger until they go stale
+            for bs in broker_symbols:
+                self.quote_cache.discard(bs)
 
     # --- Advanced orders ---
     def place_gtt_order(self, *args: Any, **kwargs: Any) -> OrderResponse:
-        return self.driver.place_gtt_order(*args, **kwargs)
+        return self._call(Priority.ORDER, self.driver.place_gtt_order, *args, **kwargs)
 
     def place_bracket_order(self, *args: Any, **kwargs: Any) -> OrderResponse:
-        return self.driver.place_bracket_order(*args, **kwargs)
+        return self._call(Priority.ORDER, self.driver.place_bracket_order, *args, **kwargs)
 
     def place_cover_order(self, *args: Any, **kwargs: Any) -> OrderResponse:
-        return self.driver.place_cover_order(*args, **kwargs)
+        return self._call(Priority.ORDER, self.driver.place_cover_order, *args, **kwargs)
 
     def place_basket_orders(self, requests: List[OrderRequest]) -> List[OrderResponse]:
-        return self.driver.place_basket_orders(requests)
+        return self._call(Priority.ORDER, self.driver.place_basket_orders, requests)
 
     def place_multileg_order(self, *args: Any, **kwargs: Any) -> OrderResponse:
-        return self.driver.place_multileg_order(*args, **kwargs)
+        return self._call(Priority.ORDER, self.driver.place_multileg_order, *args, **kwargs)
 
     # --- Margins ---
     def get_margins_required(self, orders: List[Dict[str, Any]]) -> Any:
         # Enforce policy: never estimate margins locally; delegate and let driver raise errors if unavailable
         if not self.driver.get_capabilities().supports_place_order:
             raise UnsupportedOperationError("Broker does not support order placement/margins")
-        result = self.driver.get_margins_required(orders)
+        result = self._call(Priority.NORMAL, self.driver.get_margins_required, orders)
         if result is None:
             raise MarginUnavailableError("Broker did not return margins; unavailable")
         return result
 
     def get_span_margin(self, orders: List[Dict[str, Any]]) -> Any:
-        result = self.driver.get_span_margin(orders)
+        result = self._call(Priority.NORMAL, self.driver.get_span_margin, orders)
         if result is None:
             raise MarginUnavailableError("Broker did not return span margins; unavailable")
         return result
 
     def get_multiorder_margin(self, orders: List[Dict[str, Any]]) -> Any:
-        result = self.driver.get_multiorder_margin(orders)
+        result = self._call(Priority.NORMAL, self.driver.get_multiorder_margin, orders)
         if result is None:
             raise MarginUnavailableError("Broker did not return multiorder margins; unavailable")
         return result
 
     # --- Internal helpers ---
+    def _broker_symbol(self, symbol: str) -> str:
+        """Normalize a user symbol and translate it to the broker-native form."""
+        return symbol_registry.translate(self.broker_name, symbol)
+
+    def rate_headroom(self) -> Dict[str, Any]:
+        """Remaining calls per rate window (empty when unlimited), for pacing bulk jobs."""
+        return self.rate_limiter.headroom() if self.rate_limiter is not None else {}
+
+    # --- Connection warm-up ---
+    def warm_up(self) -> None:
+        """Pre-open pooled connections to the driver's hosts, then one authenticated call."""
+        manager = get_session_manager()
+        for url in self.driver.warm_urls():
+            manager.warm(url)
+        self._call(Priority.BULK, self.driver.keepalive)
+
+    def start_keepalive(self, interval: float = DEFAULT_KEEPALIVE_INTERVAL, **kwargs: Any) -> KeepAlive:
+        """Ping the broker every ``interval`` seconds (market hours by default) so orders find warm sockets."""
+        if self.pinger is None:
+            self.pinger = KeepAlive(self.warm_up, interval, **kwargs).start()
+        return self.pinger
+
+    def stop_keepalive(self) -> None:
+        if self.pinger is not None:
+            self.pinger.stop()
+            self.pinger = None
+
+    def _call(self, priority: Priority, fn: Any, *args: Any, **kwargs: Any) -> Any:
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire(priority)
+        return fn(*args, **kwargs)
+
+    def _quote_call(self, fn: Any, *args: Any) -> Any:
+        # Quote endpoints with their own budget (Kite: 1 request/s) wait on it before the account window
+        bucket = quote_bucket(self.broker_name)
+        if bucket is not None:
+            bucket.acquire()
+        return self._call(Priority.NORMAL, fn, *args)
+
+    def _cached_quote(self, broker_symbol: str) -> Optional[Quote]:
+        return self.quote_cache.get(broker_symbol) if self.quote_cache is not None else None
+
+    def _feed_quote_cache(self, on_ticks: Any) -> Any:
+        """Wrap the user's tick callback so every tick also refreshes the quote cache."""
+        cache = self.quote_cache
+        driver = self.driver
+
+        def _on_ticks(ws: Any, ticks: Any) -> None:
+            try:
+                for broker_symbol, quote in driver.quotes_from_ticks(ticks):
+                    cache.put(broker_symbol, quote)
+            except Exception as e:
+                # The cache is best-effort; the user's callback still gets the ticks
+                logger.debug(f"Quote cache update from ticks failed: {e}")
+            if callable(on_ticks):
+                on_ticks(ws, ticks)
+
+        return _on_ticks
+
+    def _prepare_order(self, request: OrderRequest) -> OrderRequest:
+        """Return a copy of the request with its symbol translated for the broker."""
+        internal = f"{request.exchange.value}:{request.symbol}"
+        broker_symbol = symbol_registry.to_broker_symbol(self.broker_name, internal)
+        return replace(
+            request,
+            symbol=broker_symbol.split(":", 1)[1] if ":" in broker_symbol else broker_symbol,
+        )
+
+    @staticmethod
+    def _legacy_order_response(resp: OrderResponse) -> Dict[str, Any]:
+        """Convert an OrderResponse to the legacy Fyers-like response shape."""
+        result: Dict[str, Any] = {
+            "s": "ok" if resp.status == "ok" else "error",
+            "id": resp.order_id,
+        }
+        if resp.message:
+            result["message"] = resp.message
+        if resp.raw is not None:
+            result["raw"] = materialize_raw(resp.raw)
+        return result
+
+    @staticmethod
+    def _history_chunks(interval: str, start: str, end: str) -> List[Tuple[str, str]]:
+        """Split a YYYY-MM-DD date range into broker-sized (start, end) chunks."""
+        # Convert string dates to datetime objects
+        start_dt = datetime.strptime(start, "%Y-%m-%d")
+        end_dt = datetime.strptime(end, "%Y-%m-%d")
+
+        # Determine chunk size based on interval
+        if interval in ["day", "1d", "D", "1D"]:
+            # For daily resolution: up to 366 days per request
+            max_days = 366
+        elif interval in ["5S", "10S", "15S", "30S", "45S"]:
+            # For seconds resolution: up to 30 trading days
+            max_days = 30
+        else:
+            # For minute resolutions: up to 100 days per request
+            max_days = 100
+
+        # Break the date range into chunks
+        chunks: List[Tuple[str, str]] = []
+        current_start = start_dt
+        while current_start <= end_dt:
+            current_end = min(current_start + timedelta(days=max_days - 1), end_dt)
+            chunks.append((current_start.strftime("%Y-%m-%d"), current_end.strftime("%Y-%m-%d")))
+            current_start = current_end + timedelta(days=1)
+        return chunks
+
     def _normalize_margin_orders(self, orders: List[Any]) -> List[Dict[str, Any]]:
         """Normalize incoming margin order inputs to the selected broker's expected payload.
 
@@ -428,3 +734,10 @@ class BrokerGateway:
         )
 
 
+def _public_methods(cls: type, exclude: Tuple[str, ...] = ()) -> Tuple[str, ...]:
+    return tuple(n for n, v in vars(cls).items() if inspect.isfunction(v) and not n.startswith("_") and n not in exclude)
+
+
+# Methods wrapped when interceptors are installed (per-tick/bookkeeping hooks excluded)
+_GATEWAY_METHODS = _public_methods(BrokerGateway, ("get_capabilities", "start_keepalive", "stop_keepalive"))
+_DRIVER_METHODS = _public_methods(BrokerDriver, ("get_capabilities", "quotes_from_ticks", "warm_urls"))
@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+from functools import wraps
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Tuple
+
+
+class CallContext:
+    """What an interceptor sees about one call."""
+
+    __slots__ = ("broker", "layer", "method", "args", "kwargs")
+
+    def __init__(self, broker: str, layer: str, method: str, args: Tuple[Any, ...], kwargs: Dict[str, Any]) -> None:
+        self.broker = broker
+        self.layer = layer  # "gateway" or "driver"
+        self.method = method
+        self.args = args
+        self.kwargs = kwargs
+
+
+class Interceptor:
+    """Middleware around gateway/driver calls.
+
+    ``intercept`` must call ``call_next()`` exactly once (or raise) and return its
+    result; anything it does before/after wraps the underlying call.
+    """
+
+    def intercept(self, ctx: CallContext, call_next: Callable[[], Any]) -> Any:  # pragma: no cover - interface
+        return call_next()
+
+    async def intercept_async(self, ctx: CallContext, call_next: Callable[[], Awaitable[Any]]) -> Any:
+        """Coroutine counterpart for native async driver calls; ``call_next()`` must be awaited."""
+        return await call_next()
+
+
+def _chained(fn: Callable[..., Any], broker: str, layer: str, method: str, chain: Tuple[Interceptor, ...]) -> Callable[..., Any]:
+    @wraps(fn)
+    def call(*args: Any, **kwargs: Any) -> Any:
+        ctx = CallContext(broker, layer, method, args, kwargs)
+
+        def step(i: int) -> Any:
+            if i == len(chain):
+                return fn(*args, **kwargs)
+            return chain[i].intercept(ctx, lambda: step(i + 1))
+
+        return step(0)
+
+    return call
+
+
+def chained_async(fn: Callable[..., Awaitable[Any]], broker: str, layer: str, method: str, chain: Tuple[Interceptor, ...]) -> Callable[..., Awaitable[Any]]:
+    """Wrap coroutine function ``fn`` so each call runs through ``intercept_async`` of every interceptor."""
+
+    @wraps(fn)
+    async def call(*args: Any, **kwargs: Any) -> Any:
+        ctx = CallContext(broker, layer, method, args, kwargs)
+
+        async def step(i: int) -> Any:
+            if i == len(chain):
+                return await fn(*args, **kwargs)
+            return await chain[i].intercept_async(ctx, lambda: step(i + 1))
+
+        return await step(0)
+
+    return call
+
+
+def install_interceptors(
+    target: Any,
+    methods: Iterable[str],
+    interceptors: List[Interceptor],
+    *,
+    broker: str,
+    layer: str,
+) -> None:
+    """Shadow ``target``'s bound methods with chained wrappers on the instance.
+
+    Only instances with interceptors pay for the wrapping; everything else keeps
+    calling the plain class methods.
+    """
+    chain = tuple(interceptors)
+    if not chain:
+        return
+    for name in methods:
+        fn = getattr(target, name, None)
+        if callable(fn):
+            setattr(target, name, _chained(fn, broker, layer, name, chain))
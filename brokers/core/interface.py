@@ -1,8 +1,11 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
-from typing import Any, Dict, Iterable, List, Optional
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
+from .candles import CandleColumns, columns_from_candles
+from .enums import Exchange
 from .schemas import (
     BrokerCapabilities,
     OrderRequest,
@@ -11,6 +14,7 @@ from .schemas import (
     Funds,
     Quote,
     Instrument,
+    retain_raw,
 )
 
 
@@ -82,14 +86,24 @@ class BrokerDriver(ABC):
         return result
 
     @abstractmethod
-    def get_history(self, symbol: str, interval: str, start: str, end: str) -> List[Dict[str, Any]]:  # pragma: no cover - abstract
+    def get_history(self, symbol: str, interval: str, start: str, end: str, oi: bool = False) -> List[Dict[str, Any]]:  # pragma: no cover - abstract
         raise NotImplementedError
 
+    def get_history_array(self, symbol: str, interval: str, start: str, end: str, oi: bool = False) -> CandleColumns:
+        """Columnar history (see ``core.candles``); drivers parse into this directly when they can."""
+        return columns_from_candles(self.get_history(symbol, interval, start, end, oi))
+
     # --- Instruments ---
     def download_instruments(self) -> None:  # Optional
         return None
 
-    def get_instruments(self) -> List[Instrument]:  # Optional
+    def get_instruments(
+        self,
+        segments: Optional[List[str]] = None,
+        columns: Optional[List[str]] = None,
+        where: Optional[Dict[str, Any]] = None,
+    ) -> List[Instrument]:  # Optional
+        """Instrument master; drivers with a columnar store can prune by segment, column and ``where`` (column -> value(s))."""
         return []
 
     # --- Option chain ---
@@ -112,6 +126,43 @@ class BrokerDriver(ABC):
     def symbols_to_subscribe(self, symbols: Iterable[str]) -> None:  # Optional
         return None
 
+    def quotes_from_ticks(self, ticks: Any) -> List[Tuple[str, Quote]]:
+        """Map a websocket message to ``(broker_symbol, Quote)`` pairs for the quote cache.
+
+        Handles dict ticks carrying ``symbol`` plus ``ltp``/``last_price`` (Fyers and
+        Fyrodha); drivers with other tick shapes override this.
+        """
+        out: List[Tuple[str, Quote]] = []
+        for tick in ticks if isinstance(ticks, list) else [ticks]:
+            if not isinstance(tick, dict):
+                continue
+            sym = tick.get("symbol")
+            ltp = tick.get("ltp", tick.get("last_price"))
+            if not isinstance(sym, str) or ":" not in sym or ltp is None:
+                continue
+            exch, tsym = sym.split(":", 1)
+            try:
+                exchange = Exchange[exch]
+            except KeyError:
+                continue
+            ts = tick.get("exch_feed_time") or tick.get("last_traded_time") or tick.get("timestamp")
+            volume = tick.get("vol_traded_today", tick.get("volume"))
+            try:
+                quote = Quote(
+                    symbol=tsym.replace("-EQ", ""),
+                    exchange=exchange,
+                    last_price=float(ltp),
+                    bid=float(tick["bid_price"]) if tick.get("bid_price") is not None else None,
+                    ask=float(tick["ask_price"]) if tick.get("ask_price") is not None else None,
+                    volume=int(volume) if volume is not None else None,
+                    timestamp=datetime.fromtimestamp(int(ts)) if ts else None,
+                    raw=retain_raw(tick),
+                )
+            except (TypeError, ValueError):
+                continue
+            out.append((sym, quote))
+        return out
+
     def connect_order_websocket(
         self,
         *,
@@ -158,6 +209,18 @@ class BrokerDriver(ABC):
     def get_profile(self) -> Dict[str, Any]:
         raise NotImplementedError
 
+    # --- Connection warm-up ---
+    def warm_urls(self) -> List[str]:  # Optional
+        """Base URLs of the order/quote/margin hosts worth pre-connecting to."""
+        return []
+
+    def keepalive(self) -> None:
+        """Cheapest authenticated call, used to keep the client's connections warm."""
+        try:
+            self.get_profile()
+        except Exception:
+            return None
+
     # --- Positions utils ---
     def exit_positions(self, *args: Any, **kwargs: Any) -> Any:
         raise NotImplementedError
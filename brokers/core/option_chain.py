@@ -0,0 +1,119 @@
+"""Option chains assembled locally from the instrument master.
+
+The strike/expiry structure comes from an ``InstrumentIndex`` (no network), and
+prices come from one batched ``get_quotes`` call for the whole window. The same
+code serves every broker, so chains look the same whichever driver is behind
+the gateway.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Mapping
+from datetime import date
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+
+from ..symbols.index import InstrumentIndex
+from ..symbols.parser import CE, INDEX_EXCHANGES, INDEX_NAMES, PE, parse_symbol
+from .errors import ValidationError
+from .schemas import Quote
+
+
+DEFAULT_STRIKE_COUNT = 5
+
+# Underlying -> canonical spot symbol for indices (equities quote as NSE:<UNDERLYING>)
+SPOT_SYMBOLS = {und: f"{INDEX_EXCHANGES.get(und, 'NSE')}:{kite}" for und, (kite, _) in INDEX_NAMES.items()}
+
+
+def chain_underlying(underlying: str) -> str:
+    """``NIFTY``, ``NSE:NIFTY 50``, ``NSE:NIFTY50-INDEX`` -> ``NIFTY``; ``NSE:SBIN-EQ`` -> ``SBIN``."""
+    return parse_symbol(underlying).underlying
+
+
+def spot_symbol(underlying: str) -> str:
+    """Symbol to quote for the underlying's spot price."""
+    info = parse_symbol(underlying)
+    if ":" in underlying and not info.is_derivative:
+        return underlying
+    return SPOT_SYMBOLS.get(info.underlying, f"NSE:{info.underlying}")
+
+
+def _quote_symbol(record: Dict[str, Any]) -> str:
+    symbol = record["symbol"]
+    if ":" in symbol:
+        return symbol
+    return f"{record.get('exchange')}:{symbol}"  # Kite masters carry bare tradingsymbols
+
+
+def _open_interest(quote: Quote) -> Optional[float]:
+    raw = quote.raw
+    if not isinstance(raw, Mapping):
+        return None
+    oi = raw.get("oi")
+    if oi is None and isinstance(raw.get("v"), Mapping):
+        oi = raw["v"].get("oi")  # Fyers nests values under "v"
+    return oi
+
+
+def build_option_chain(
+    index: InstrumentIndex,
+    underlying: str,
+    *,
+    spot: Optional[float],
+    expiry: Optional[date] = None,
+    strike_count: int = DEFAULT_STRIKE_COUNT,
+    get_quotes: Optional[Callable[[List[str]], Dict[str, Quote]]] = None,
+) -> List[Dict[str, Any]]:
+    """CE and PE legs for ``strike_count`` strikes either side of the strike nearest ``spot``.
+
+    ``expiry`` defaults to the underlying's next option expiry. Legs are sorted by
+    strike, CE before PE. With ``get_quotes`` they carry last_price/bid/ask/volume/oi
+    from a single call; legs it could not quote keep those fields as None. Raises
+    ``ValidationError`` when ``spot`` is not a positive price (e.g. a failed quote).
+    """
+    if spot is None or not np.isfinite(spot) or spot <= 0:
+        raise ValidationError(f"No usable spot price for {underlying}", context={"spot": spot})
+    name = chain_underlying(underlying)
+    expiry = expiry or index.next_expiry(name, options_only=True)
+    if expiry is None:
+        return []
+    strikes = np.union1d(index.strikes(name, expiry, CE), index.strikes(name, expiry, PE))
+    if not len(strikes):
+        return []
+    atm = int(np.abs(strikes - spot).argmin())
+    window = strikes[max(0, atm - strike_count): atm + strike_count + 1]
+
+    legs: List[Dict[str, Any]] = []
+    for strike in window.tolist():
+        for option_type in (CE, PE):
+            record = index.nearest(name, expiry, option_type, strike, tolerance=0)
+            if record is None:
+                continue
+            legs.append({
+                "symbol": _quote_symbol(record),
+                "underlying": name,
+                "expiry": expiry,
+                "strike": strike,
+                "option_type": option_type,
+                "atm": bool(strike == strikes[atm]),
+                "spot": spot,
+                "lot_size": record.get("lot_size"),
+                "token": record.get("token"),
+                "last_price": None,
+                "bid": None,
+                "ask": None,
+                "volume": None,
+                "oi": None,
+            })
+
+    if get_quotes is not None and legs:
+        quotes = get_quotes([leg["symbol"] for leg in legs])
+        for leg in legs:
+            q = quotes.get(leg["symbol"])
+            if q is not None:
+                leg.update(last_price=q.last_price, bid=q.bid, ask=q.ask, volume=q.volume, oi=_open_interest(q))
+    return legs
+
+
+__all__ = ["DEFAULT_STRIKE_COUNT", "SPOT_SYMBOLS", "build_option_chain", "chain_underlying", "spot_symbol"]
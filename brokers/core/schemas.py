@@ -1,12 +1,94 @@
 from __future__ import annotations
 
+from collections.abc import Mapping
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from enum import Enum
+import os
+from typing import Any, Callable, Dict, Iterator, List, Optional, Union
 
 from .enums import Exchange, OrderType, ProductType, TransactionType, Validity
 
 
+class RawRetention(str, Enum):
+    """How much of the broker payload schema objects keep in ``raw``."""
+
+    NONE = "none"  # drop it; raw is always None
+    LAZY = "lazy"  # keep references to payloads that already exist, build derived ones on first access
+    FULL = "full"  # keep/build everything eagerly (default, original behavior)
+
+
+class LazyRaw(Mapping):
+    """Read-only mapping that builds its payload on first access."""
+
+    __slots__ = ("_loader", "_value")
+
+    def __init__(self, loader: Callable[[], Optional[Dict[str, Any]]]) -> None:
+        self._loader: Optional[Callable[[], Optional[Dict[str, Any]]]] = loader
+        self._value: Dict[str, Any] = {}
+
+    def _resolve(self) -> Dict[str, Any]:
+        if self._loader is not None:
+            self._value = self._loader() or {}
+            self._loader = None
+        return self._value
+
+    def __getitem__(self, key: str) -> Any:
+        return self._resolve()[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._resolve())
+
+    def __len__(self) -> int:
+        return len(self._resolve())
+
+    def __repr__(self) -> str:
+        return f"LazyRaw({self._resolve()!r})"
+
+
+RawPayload = Union[Dict[str, Any], Callable[[], Optional[Dict[str, Any]]], None]
+
+
+def _policy_from_env() -> RawRetention:
+    try:
+        return RawRetention((os.getenv("BROKER_RAW_RETENTION") or "full").strip().lower())
+    except ValueError:
+        return RawRetention.FULL
+
+
+_raw_retention = _policy_from_env()
+
+
+def set_raw_retention(policy: Union[RawRetention, str]) -> None:
+    global _raw_retention
+    _raw_retention = RawRetention(policy)
+
+
+def get_raw_retention() -> RawRetention:
+    return _raw_retention
+
+
+def retain_raw(payload: RawPayload) -> Any:
+    """Apply the process-wide raw-retention policy to a driver payload.
+
+    ``payload`` is either the broker dict itself or a zero-argument callable that
+    builds it (for payloads that cost something to derive).
+    """
+    policy = _raw_retention
+    if payload is None or policy is RawRetention.NONE:
+        return None
+    if callable(payload):
+        return LazyRaw(payload) if policy is RawRetention.LAZY else payload()
+    return payload
+
+
+def materialize_raw(raw: Any) -> Optional[Dict[str, Any]]:
+    """Plain-dict form of a ``raw`` value (resolving LazyRaw)."""
+    if isinstance(raw, LazyRaw):
+        return dict(raw)
+    return raw
+
+
 @dataclass
 class BrokerCapabilities:
     supports_historical: bool = True
@@ -27,6 +109,9 @@ class BrokerCapabilities:
     supports_cover_order: bool = False
     supports_multileg_order: bool = False
     supports_basket_orders: bool = False
+    supports_native_async: bool = False
+    # Symbols one quote request can carry; the gateway sends one rate-limited call per chunk
+    max_quotes_per_request: int = 1
 
 
 @dataclass
@@ -44,7 +129,8 @@ class OrderRequest:
     extras: Dict[str, Any] = field(default_factory=dict)
 
 
-@dataclass
+# High-volume result types are slotted: no per-instance __dict__, faster construction
+@dataclass(slots=True)
 class OrderResponse:
     status: str
     order_id: Optional[str]
@@ -56,11 +142,11 @@ class OrderResponse:
             "status": self.status,
             "order_id": self.order_id,
             "message": self.message,
-            "raw": self.raw,
+            "raw": materialize_raw(self.raw),
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class Position:
     symbol: str
     exchange: Exchange
@@ -81,7 +167,7 @@ class Funds:
     raw: Optional[Dict[str, Any]] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class Quote:
     symbol: str
     exchange: Exchange
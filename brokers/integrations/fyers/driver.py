@@ -1,13 +1,15 @@
 from __future__ import annotations
 
-from datetime import datetime
+import asyncio
+from functools import lru_cache
 import os
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
-import numpy as np
 import pandas as pd
-import requests
 
+from ...auth.tokens import TokenCache, resolve_token
+from ...cache.instruments import InstrumentStore, select_instruments
+from ...core.candles import CandleColumns, columns_from_rows, columns_to_candles, empty_columns, failed_columns
 from ...core.enums import Exchange, OrderType, ProductType, TransactionType, Validity
 from ...core.errors import AuthError, MarginUnavailableError, UnsupportedOperationError
 from ...core.interface import BrokerDriver
@@ -19,10 +21,31 @@ from ...core.schemas import (
     OrderResponse,
     Position,
     Quote,
+    retain_raw,
 )
 from ...mappings import MappingRegistry as M
-from ...net.ratelimiter import rate_limited_fyers
+from ...net.batching import chunked, map_concurrent
+from ...net.replay import replay_mode
+from ...net.session import get_session_manager
+from ...symbols.ids import symbol_ids
+from ...symbols.parser import EQ, parse_symbol
 from ...symbols.registry import SymbolRegistry
+from .master import MASTER_CONTRACT_URLS, load_master_contract, master_day
+
+
+# Fyers /quotes accepts at most this many comma-separated symbols per request
+QUOTES_MAX_SYMBOLS = 50
+
+
+@lru_cache(maxsize=1)
+def _fyers_model_class() -> Any:
+    """The SDK's FyersModel class, or None when fyers_apiv3 is not installed."""
+    try:  # pragma: no cover - relies on external package
+        from fyers_apiv3 import fyersModel  # type: ignore
+
+        return fyersModel.FyersModel
+    except Exception:
+        return None
 
 
 class FyersDriver(BrokerDriver):
@@ -53,39 +76,63 @@ class FyersDriver(BrokerDriver):
             supports_cover_order=False,
             supports_multileg_order=True,
             supports_basket_orders=True,
+            supports_native_async=False,  # set by get_capabilities once the async client builds
+            max_quotes_per_request=QUOTES_MAX_SYMBOLS,
         )
         # Attempt to wire SDK if access token is provided
         self._client_id: Optional[str] = None
         self._access_token: Optional[str] = None
         self._fyers_model = None
+        self._fyers_model_async = None
+        self._fyers_model_async_key: Optional[Tuple[str, str]] = None
         self.master_contract_df = None
+        self._instrument_store = InstrumentStore.from_env("fyers")
 
         # Lazy import to avoid hard dependency if not used
         import os
 
         self._client_id = os.getenv("BROKER_API_KEY") or os.getenv("FYERS_API_KEY")
-        self._access_token = os.getenv("FYERS_ACCESS_TOKEN") or os.getenv("BROKER_ACCESS_TOKEN")
+        env_token = os.getenv("FYERS_ACCESS_TOKEN") or os.getenv("BROKER_ACCESS_TOKEN")
 
-        # If no token, try login flows based on BROKER_LOGIN_MODE
+        # Reuse a cached/env token when one profile call accepts it; TOTP login only as fallback
         login_mode_env = (os.getenv("BROKER_LOGIN_MODE") or "auto").lower()
-        if self._client_id and login_mode_env in ("totp", "auto"):
-        #if not self._access_token and self._client_id and login_mode_env in ("totp", "auto"):
-            token = self._authenticate_via_totp()
-            if token:
-                self._access_token = token
-
-        if self._client_id and self._access_token:
-            try:  # pragma: no cover - relies on external package
-                from fyers_apiv3 import fyersModel  # type: ignore
-
-                self._fyers_model = fyersModel.FyersModel(
-                    client_id=self._client_id,
-                    token=self._access_token,
-                    is_async=False,
-                    log_path="logs",
-                )
-            except Exception:
-                self._fyers_model = None
+        if self._client_id and not replay_mode():  # replay answers from the cassette, no login
+            self._access_token = resolve_token(
+                TokenCache.from_env("fyers"),
+                self._client_id,
+                validate=self._use_token,
+                login=self._authenticate_via_totp if login_mode_env in ("totp", "auto") else None,
+                seed=env_token,
+            ) or env_token
+
+        if self._client_id and self._access_token and self._fyers_model is None:
+            self._fyers_model = self._new_model(self._access_token)
+
+    def _new_model(self, token: str) -> Any:
+        try:  # pragma: no cover - relies on external package
+            from fyers_apiv3 import fyersModel  # type: ignore
+
+            return fyersModel.FyersModel(
+                client_id=self._client_id,
+                token=token,
+                is_async=False,
+                log_path="logs",
+            )
+        except Exception:
+            return None
+
+    def _use_token(self, token: str) -> bool:
+        """Validate ``token`` with one profile call; keep the client on success."""
+        model = self._new_model(token)
+        if model is None:
+            return False
+        try:
+            ok = (model.get_profile() or {}).get("s") == "ok"
+        except Exception:
+            ok = False
+        if ok:
+            self._fyers_model = model
+        return ok
 
     def _authenticate_via_totp(self) -> Optional[str]:
         """Programmatic TOTP login to obtain Fyers access token.
@@ -214,30 +261,19 @@ class FyersDriver(BrokerDriver):
 
     # --- Helpers ---
     @staticmethod
+    @lru_cache(maxsize=8192)
     def _format_symbol(exchange: Exchange, tradingsymbol: str) -> str:
-        sym_u = tradingsymbol.upper()
         exch = exchange
         if exchange == Exchange.NFO:
             exch = Exchange.NSE
         elif exchange == Exchange.BFO:
             exch = Exchange.BSE
-        is_future = "FUT" in sym_u
-        is_option = sym_u.endswith("CE") or sym_u.endswith("PE")
-        is_index = sym_u.endswith("-INDEX")
-        if is_future or is_option or is_index:
-            if ":" not in tradingsymbol:
-                return f"{exch.value}:{tradingsymbol}"
-            else:
-                return tradingsymbol
-        if not sym_u.endswith("-EQ"):
-            if ":" not in tradingsymbol:
-                return f"{exch.value}:{tradingsymbol}-EQ"
-            else:
-                return tradingsymbol
-        if ":" not in tradingsymbol:
-            return f"{exch.value}:{tradingsymbol}"
-        else:
+        if ":" in tradingsymbol:
             return tradingsymbol
+        info = parse_symbol(tradingsymbol)
+        if info.kind == EQ and info.series is None:
+            return f"{exch.value}:{tradingsymbol}-EQ"
+        return f"{exch.value}:{tradingsymbol}"
 
     # --- Account ---
     def get_funds(self) -> Funds:
@@ -260,111 +296,123 @@ class FyersDriver(BrokerDriver):
         if not self._fyers_model:
             return []
         try:
-            data = self._fyers_model.positions()
-            if not isinstance(data, dict) or data.get("s") == "error":
-                return []
-            container = data.get("data", data)
-            raw_positions = (
-                container.get("netPositions")
-                or container.get("overall")
-                or container.get("positionDetails")
-                or []
-            )
-            if isinstance(raw_positions, dict):
-                raw_positions = list(raw_positions.values())
-            if not isinstance(raw_positions, list):
-                return []
-            out: List[Position] = []
-            for p in raw_positions:
-                if not isinstance(p, dict):
-                    continue
-                symbol_full = p.get("symbol", "NSE:UNKNOWN-EQ")
-                try:
-                    exch_str, s = symbol_full.split(":", 1)
-                    exchange = Exchange[exch_str]
-                except Exception:  # noqa: BLE001
-                    exchange = Exchange.NSE
-                    s = symbol_full
-                tradingsymbol = s.replace("-EQ", "")
-                quantity_total = int(p.get("qtyTraded", p.get("qty", p.get("quantity", 0))))
-                quantity_available = int(p.get("netQty", p.get("quantity", quantity_total)))
-                avg_price = float(p.get("avgPrice", p.get("avg", p.get("average_price", 0))))
-                pnl = float(p.get("pl", 0))
-                prod = (
-                    ProductType.INTRADAY
-                    if p.get("productType") == "INTRADAY"
-                    else (ProductType.MARGIN if p.get("productType") == "MARGIN" else ProductType.CNC)
-                )
-                out.append(
-                    Position(
-                        symbol=tradingsymbol,
-                        exchange=exchange,
-                        quantity_total=quantity_total,
-                        quantity_available=quantity_available,
-                        average_price=avg_price,
-                        pnl=pnl,
-                        product_type=prod,
-                        raw=p,
-                    )
-                )
-            return out
+            return self._parse_positions(self._fyers_model.positions())
         except Exception:
             return []
 
+    @staticmethod
+    def _parse_positions(data: Any) -> List[Position]:
+        if not isinstance(data, dict) or data.get("s") == "error":
+            return []
+        container = data.get("data", data)
+        raw_positions = (
+            container.get("netPositions")
+            or container.get("overall")
+            or container.get("positionDetails")
+            or []
+        )
+        if isinstance(raw_positions, dict):
+            raw_positions = list(raw_positions.values())
+        if not isinstance(raw_positions, list):
+            return []
+        out: List[Position] = []
+        for p in raw_positions:
+            if not isinstance(p, dict):
+                continue
+            symbol_full = p.get("symbol", "NSE:UNKNOWN-EQ")
+            try:
+                exch_str, s = symbol_full.split(":", 1)
+                exchange = Exchange[exch_str]
+            except Exception:  # noqa: BLE001
+                exchange = Exchange.NSE
+                s = symbol_full
+            tradingsymbol = s.replace("-EQ", "")
+            quantity_total = int(p.get("qtyTraded", p.get("qty", p.get("quantity", 0))))
+            quantity_available = int(p.get("netQty", p.get("quantity", quantity_total)))
+            avg_price = float(p.get("avgPrice", p.get("avg", p.get("average_price", 0))))
+            pnl = float(p.get("pl", 0))
+            prod = (
+                ProductType.INTRADAY
+                if p.get("productType") == "INTRADAY"
+                else (ProductType.MARGIN if p.get("productType") == "MARGIN" else ProductType.CNC)
+            )
+            out.append(
+                Position(
+                    symbol=tradingsymbol,
+                    exchange=exchange,
+                    quantity_total=quantity_total,
+                    quantity_available=quantity_available,
+                    average_price=avg_price,
+                    pnl=pnl,
+                    product_type=prod,
+                    raw=retain_raw(p),
+                )
+            )
+        return out
+
     # --- Orders ---
     def place_order(self, request: OrderRequest) -> OrderResponse:
         if not self._fyers_model:
             return OrderResponse(status="error", order_id=None, message="unauthenticated")
         try:
-            order_type = M.order_type["fyers"][request.order_type]
-            product = M.product_type["fyers"][request.product_type]
-            side = M.transaction_type["fyers"][request.transaction_type]
-            validity = M.validity["fyers"][request.validity]
-
-            symbol_full = self._format_symbol(request.exchange, request.symbol)
-            payload = {
-                "symbol": symbol_full,
-                "qty": request.quantity,
-                "type": order_type,
-                "side": side,
-                "productType": product,
-                "limitPrice": request.price or 0.0,
-                "stopPrice": request.stop_price or 0.0,
-                "validity": validity,
-                "disclosedQty": 0,
-                "offlineOrder": False,
-                "orderTag": request.tag,
-            }
-            payload.update(request.extras or {})
-            resp = self._fyers_model.place_order(payload)
-            if isinstance(resp, dict) and resp.get("s") == "ok":
-                result = OrderResponse(status="ok", order_id=str(resp.get("id") or resp.get("order_id")), raw=resp)
-                # Emit synthetic order update to user callback if present
-                if getattr(self, "_on_orders_cb", None):
-                    try:
-                        self._on_orders_cb({"event": "order_update", "status": "ok", "order_id": result.order_id, "raw": resp})
-                    except Exception:
-                        pass
-                return result
-            if isinstance(resp, dict) and resp.get("s") == "error":
-                return OrderResponse(status="error", order_id=str(resp.get("id") or resp.get("order_id")), raw=resp if isinstance(resp, dict) else None)
-            
-            return OrderResponse(status="error", order_id=-1, message=str(resp), raw=resp if isinstance(resp, dict) else None)
+            resp = self._fyers_model.place_order(self._order_payload(request))
+            return self._parse_order_response(resp)
         except Exception as e:  # noqa: BLE001
-            # Emit synthetic error update
+            return self._order_error(e)
+
+    def _order_payload(self, request: OrderRequest) -> Dict[str, Any]:
+        order_type = M.order_type["fyers"][request.order_type]
+        product = M.product_type["fyers"][request.product_type]
+        side = M.transaction_type["fyers"][request.transaction_type]
+        validity = M.validity["fyers"][request.validity]
+
+        symbol_full = self._format_symbol(request.exchange, request.symbol)
+        payload = {
+            "symbol": symbol_full,
+            "qty": request.quantity,
+            "type": order_type,
+            "side": side,
+            "productType": product,
+            "limitPrice": request.price or 0.0,
+            "stopPrice": request.stop_price or 0.0,
+            "validity": validity,
+            "disclosedQty": 0,
+            "offlineOrder": False,
+            "orderTag": request.tag,
+        }
+        payload.update(request.extras or {})
+        return payload
+
+    def _parse_order_response(self, resp: Any) -> OrderResponse:
+        if isinstance(resp, dict) and resp.get("s") == "ok":
+            result = OrderResponse(status="ok", order_id=str(resp.get("id") or resp.get("order_id")), raw=retain_raw(resp))
+            # Emit synthetic order update to user callback if present
             if getattr(self, "_on_orders_cb", None):
                 try:
-                    self._on_orders_cb({"event": "order_update", "status": "error", "order_id": None, "message": str(e)})
+                    self._on_orders_cb({"event": "order_update", "status": "ok", "order_id": result.order_id, "raw": resp})
                 except Exception:
                     pass
-            return OrderResponse(status="error", order_id=None, message=str(e))
+            return result
+        if isinstance(resp, dict) and resp.get("s") == "error":
+            return OrderResponse(status="error", order_id=str(resp.get("id") or resp.get("order_id")), raw=retain_raw(resp if isinstance(resp, dict) else None))
+
+        return OrderResponse(status="error", order_id=-1, message=str(resp), raw=retain_raw(resp if isinstance(resp, dict) else None))
+
+    def _order_error(self, e: Exception) -> OrderResponse:
+        # Emit synthetic error update
+        if getattr(self, "_on_orders_cb", None):
+            try:
+                self._on_orders_cb({"event": "order_update", "status": "error", "order_id": None, "message": str(e)})
+            except Exception:
+                pass
+        return OrderResponse(status="error", order_id=None, message=str(e))
 
     def cancel_order(self, order_id: str) -> OrderResponse:
         if not self._fyers_model:
             return OrderResponse(status="error", order_id=order_id, message="unauthenticated")
         try:
             resp = self._fyers_model.cancel_order({"id": order_id})
-            return OrderResponse(status="ok", order_id=order_id, raw=resp if isinstance(resp, dict) else None)
+            return OrderResponse(status="ok", order_id=order_id, raw=retain_raw(resp if isinstance(resp, dict) else None))
         except Exception as e:  # noqa: BLE001
             return OrderResponse(status="error", order_id=order_id, message=str(e))
 
@@ -375,7 +423,7 @@ class FyersDriver(BrokerDriver):
             payload = {"id": order_id}
             payload.update(updates)
             resp = self._fyers_model.modify_order(payload)
-            return OrderResponse(status="ok", order_id=order_id, raw=resp if isinstance(resp, dict) else None)
+            return OrderResponse(status="ok", order_id=order_id, raw=retain_raw(resp if isinstance(resp, dict) else None))
         except Exception as e:  # noqa: BLE001
             return OrderResponse(status="error", order_id=order_id, message=str(e))
         
@@ -417,39 +465,66 @@ class FyersDriver(BrokerDriver):
     def get_quote(self, symbol: str) -> Quote:
         if not self._fyers_model:
             return Quote(symbol=symbol.split(":", 1)[-1].replace("-EQ", ""), exchange=Exchange.NSE, last_price=0.0, raw={"s": "error", "message": "unauthenticated"})
-        # Accept either full EXCH:SYM or plain symbol; ensure Fyers format
+        full, exchange = self._fyers_symbol(symbol)
+        try:
+            resp = self._fyers_model.quotes({"symbols": full})
+        except Exception:
+            resp = {"s": "error"}
+        return self._parse_quote(full, exchange, resp)
+
+    @staticmethod
+    @lru_cache(maxsize=8192)
+    def _fyers_symbol(symbol: str) -> Tuple[str, Exchange]:
+        """Accept either full EXCH:SYM or plain symbol; ensure Fyers format (memoized)."""
         if ":" in symbol:
             exch_str, sym = symbol.split(":", 1)
-            full = self._format_symbol(Exchange[exch_str], sym.replace("-EQ", ""))
             exchange = Exchange[exch_str]
-        else:
-            exchange = Exchange.NSE
-            full = self._format_symbol(exchange, symbol)
+            return FyersDriver._format_symbol(exchange, sym.replace("-EQ", "")), exchange
+        return FyersDriver._format_symbol(Exchange.NSE, symbol), Exchange.NSE
+
+    @staticmethod
+    def _parse_quote(full: str, exchange: Exchange, resp: Any) -> Quote:
         try:
-            resp = self._fyers_model.quotes({"symbols": full})
             payload = (resp or {}).get("d", [{}])[0].get("v", {})
             last_price = float(payload.get("lp", 0.0))
         except Exception:
             last_price = 0.0
             resp = {"s": "error"}
-        return Quote(symbol=full.split(":", 1)[1].replace("-EQ", ""), exchange=exchange, last_price=last_price, raw=resp if isinstance(resp, dict) else None)
+        return Quote(symbol=full.split(":", 1)[1].replace("-EQ", ""), exchange=exchange, last_price=last_price, raw=retain_raw(resp if isinstance(resp, dict) else None))
 
     def get_quotes(self, symbols: List[str]) -> Dict[str, Quote]:  # type: ignore[override]
+        """Batched quotes keyed by the symbols as passed in.
+
+        Symbols are comma-joined up to the per-request cap; larger lists are split
+        and the chunks issued concurrently.
+        """
         if not self._fyers_model:
             return {}
-        # Ensure each is fully qualified for Fyers
-        fulls: List[str] = []
+        fulls, chunks = self._quote_chunks(symbols)
+
+        def fetch(chunk: List[str]) -> Dict[str, Quote]:
+            try:
+                return self._parse_quotes(self._fyers_model.quotes({"symbols": ",".join(chunk)}))
+            except Exception:
+                return {}
+
+        parsed: Dict[str, Quote] = {}
+        for part in map_concurrent(fetch, chunks):
+            parsed.update(part)
+        return {s: parsed[f] for s, f in fulls.items() if f in parsed}
+
+    def _quote_chunks(self, symbols: List[str]) -> Tuple[Dict[str, str], List[List[str]]]:
+        """Map caller symbols to Fyers form and split the unique ones into request-sized chunks."""
+        fulls: Dict[str, str] = {}
         for s in symbols:
-            if ":" in s:
-                ex, sym = s.split(":", 1)
-                fulls.append(self._format_symbol(Exchange[ex], sym.replace("-EQ", "")))
-            else:
-                fulls.append(self._format_symbol(Exchange.NSE, s))
-        data = {"symbols": ",".join(fulls)}
-        try:
-            resp = self._fyers_model.quotes(data)
-        except Exception:
-            return {}
+            try:
+                fulls[s] = self._fyers_symbol(s)[0]
+            except KeyError:
+                continue  # unknown exchange prefix
+        return fulls, chunked(list(dict.fromkeys(fulls.values())), QUOTES_MAX_SYMBOLS)
+
+    @staticmethod
+    def _parse_quotes(resp: Any) -> Dict[str, Quote]:
         out: Dict[str, Quote] = {}
         try:
             for item in (resp or {}).get("d", []):
@@ -457,14 +532,24 @@ class FyersDriver(BrokerDriver):
                 payload = item.get("v", {})
                 last_price = float(payload.get("lp", 0.0))
                 exch, tsym = sym.split(":", 1)
-                out[sym] = Quote(symbol=tsym.replace("-EQ", ""), exchange=Exchange[exch], last_price=last_price, raw=item)
+                out[sym] = Quote(symbol=tsym.replace("-EQ", ""), exchange=Exchange[exch], last_price=last_price, raw=retain_raw(item))
         except Exception:
             return out
         return out
 
     def get_history(self, symbol: str, interval: str, start: str, end: str, oi: bool = False) -> List[Dict[str, Any]]:
+        return columns_to_candles(self.get_history_array(symbol, interval, start, end, oi))
+
+    def get_history_array(self, symbol: str, interval: str, start: str, end: str, oi: bool = False) -> CandleColumns:
         if not self._fyers_model:
-            return []
+            return failed_columns()
+        try:
+            resp = self._fyers_model.history(self._history_payload(symbol, interval, start, end, oi))
+            return self._parse_history(resp)
+        except Exception:
+            return failed_columns()
+
+    def _history_payload(self, symbol: str, interval: str, start: str, end: str, oi: bool) -> Dict[str, Any]:
         interval_map = {
             "1m": "1",
             "3m": "3",
@@ -476,162 +561,76 @@ class FyersDriver(BrokerDriver):
             "day": "D",
             "1d": "D",
         }
-        if ":" in symbol:
-            exch_str, sym = symbol.split(":", 1)
-            exchange = Exchange[exch_str]
-            full = self._format_symbol(exchange, sym.replace("-EQ", ""))
-        else:
-            exchange = Exchange.NSE
-            full = self._format_symbol(exchange, symbol)
-        res = interval_map.get(interval, interval)
-        try:
-            payload = {
-                "symbol": full,
-                "resolution": res,
-                "date_format": "1",
-                "range_from": start,
-                "range_to": end,
-                "cont_flag": "1",
-                "oi_flag": "1" if oi else "0",
-            }
-            resp = self._fyers_model.history(payload)
-            if not (isinstance(resp, dict) and resp.get("s") == "ok"):
-                return []
-            raw = resp.get("candles", [])
-            out: List[Dict[str, Any]] = []
-            for c in raw:
-                # Expect [ts, o, h, l, c, v]
-                if not isinstance(c, (list, tuple)) or len(c) < 5:
-                    continue
-                try:
-                    ts = int(c[0])
-                except Exception:
-                    # Fallback: skip if timestamp invalid
-                    continue
-                o = float(c[1])
-                h = float(c[2])
-                l = float(c[3])
-                cl = float(c[4])
-                vol = int(c[5]) if len(c) > 5 and c[5] is not None else None
-                oi = int(c[6]) if len(c) > 6 and c[6] is not None else None
-                out.append({
-                    "ts": ts,
-                    "open": o,
-                    "high": h,
-                    "low": l,
-                    "close": cl,
-                    "volume": vol,
-                    "oi": oi,
-                })
-            return out
-        except Exception as E:
-            return []
-
-    # --- Instruments ---
-    def download_instruments(self) -> None:
-        self.master_contract_urls = [
-            "https://public.fyers.in/sym_details/NSE_FO.csv", 
-            "https://public.fyers.in/sym_details/BSE_FO.csv", 
-            "https://public.fyers.in/sym_details/NSE_CD.csv", 
-            "https://public.fyers.in/sym_details/NSE_COM.csv", 
-            "https://public.fyers.in/sym_details/NSE_CM.csv", 
-            "https://public.fyers.in/sym_details/BSE_CM.csv", 
-            "https://public.fyers.in/sym_details/MCX_COM.csv"
-            ]
-        self.master_contract_df = None
-        self.cache_file = ".cache/fyers_master_contract.csv"
-        
-        # Instrument type mapping
-        self.instrument_types = {
-            14: "INDEX",  # Index instruments
-            15: "STOCK"   # Stock instruments
-        }
-        response_text = ""
-        # Download the CSV file
-        for url in self.master_contract_urls:
-            response_temp = requests.get(url, timeout=30)
-            response_temp.raise_for_status()
-            response_text += response_temp.text
-
-        # Save to file
-        if not os.path.exists(os.path.dirname(self.cache_file)):
-            os.makedirs(os.path.dirname(self.cache_file))
-            
-        with open(self.cache_file, 'w') as f:
-            f.write(response_text)
-        
-        # Define column headers
-        headers = [
-            "Fytoken", "Symbol Details", "Exchange Instrument type", "Minimum lot size",
-            "Tick size", "ISIN", "Trading Session", "Last update date", "Expiry date",
-            "Symbol ticker", "Exchange", "Segment", "Scrip code", "Underlying symbol",
-            "Underlying scrip code", "Strike price", "Option type", "Underlying FyToken",
-            "Reserved column1", "Reserved column2", "Reserved column3"
-        ]
-        
-        header_mapping = {
-            "Fytoken": "token",
-            "Symbol Details": "symbol_details",
-            "Exchange Instrument type": "instrument_type",
-            "Minimum lot size": "lot_size",
-            "Tick size": "tick_size",
-            "ISIN": "isin",
-            "Trading Session": "trading_session",
-            "Last update date": "last_update_date",
-            "Expiry date": "expiry",
-            "Symbol ticker": "symbol",
-            "Exchange": "exchange",
-            "Strike price": "strike",
-            "Segment": "segment",
-            "Scrip code": "scrip_code",
-            "Underlying symbol": "underlying_symbol"
+        full, _ = self._fyers_symbol(symbol)
+        return {
+            "symbol": full,
+            "resolution": interval_map.get(interval, interval),
+            "date_format": "1",
+            "range_from": start,
+            "range_to": end,
+            "cont_flag": "1",
+            "oi_flag": "1" if oi else "0",
         }
 
-        # Read as DataFrame with headers
-        df = pd.read_csv(self.cache_file, names=headers, header=None)
-        df = df[header_mapping.keys()]
-
-        df.columns = header_mapping.values()
-        df['instrument_type'] = df['instrument_type'].map(self.instrument_types) # MAPPING TO STOCK/INDEX TODO - NOT USED MAYBE
-        df['instrument_type'] = df['symbol'].apply(lambda x: 'FUT' if x.endswith("FUT") else 'CE' if x.endswith("CE") else 'PE' if x.endswith("PE") else 'EQ')
-        df['expiry'] = pd.to_datetime(df['expiry'], unit='s', errors='coerce')
-        df['expiry'] = df['expiry'].apply(lambda x: pd.to_datetime(x).date() if not pd.isna(x) else np.nan)
-        df['days_to_expiry'] = df['expiry'].apply(lambda x: np.busday_count(datetime.now().date(), x) + 1 if not pd.isna(x) else np.nan)
-        # Updating Segment matching to match with what we have in the zerodha
-        def segment_mapping(x):
-            if x.endswith("FUT"):
-                if x.startswith("NSE"):
-                    return "NFO-FUT"
-                elif x.startswith("BSE"):
-                    return "BFO-FUT"
-                elif x.startswith("MCX"):
-                    return "MCX-FUT"
-            elif x.endswith("CE") or x.endswith("PE"):
-                if x.startswith("NSE"):
-                    return "NFO-OPT"
-                elif x.startswith("BSE"):
-                    return "BFO-OPT"
-            else:
-                if x.startswith("NSE"):
-                    return "NSE"
-                elif x.startswith("BSE"):
-                    return "BSE"
-        df['segment'] = df['symbol'].apply(segment_mapping)
-        df.to_csv(self.cache_file, index=False)
+    @staticmethod
+    def _parse_history(resp: Any) -> CandleColumns:
+        if isinstance(resp, dict) and resp.get("s") == "no_data":
+            return empty_columns()  # holiday, weekend or before listing: a valid empty range
+        if not (isinstance(resp, dict) and resp.get("s") == "ok"):
+            return failed_columns()
+        # Candles arrive as [ts, o, h, l, c, v, oi?] rows; parse straight into columns
+        return columns_from_rows(resp.get("candles", []))
+
+    # --- Instruments ---
+    def download_instruments(self, refresh: bool = False) -> None:
+        """Load the symbol master: today's columnar store, else today's raw files, else parallel conditional downloads."""
+        store = self._instrument_store
+        df = None if refresh or store is None else store.load(day=master_day(), categorical=False)
+        if df is None:
+            self.master_contract_urls = list(MASTER_CONTRACT_URLS)
+            df, stale = load_master_contract(self.master_contract_urls, refresh=refresh)
+            # A frame built from an old copy is not today's master; the next start retries the download
+            if store is not None and not stale:
+                df = store.save_and_reload(df, day=master_day())
+        # Dense process-local IDs for array-indexed state (not persisted)
+        df['symbol_id'] = symbol_ids.intern_many(df['symbol'])
         self.master_contract_df = df
 
-    def get_instruments(self) -> List[Instrument]:
-        return self.master_contract_df
-    
-    def get_nse_futures_symbols(self) -> List[str]:
+    def get_instruments(
+        self,
+        segments: Optional[List[str]] = None,
+        columns: Optional[List[str]] = None,
+        where: Optional[Dict[str, Any]] = None,
+    ) -> List[Instrument]:
+        """Whole master without arguments; otherwise only the given segments/columns/matching rows.
+
+        A pruned request reads just those slices from today's store when the full
+        master has not been loaded into this process.
+        """
+        if segments is None and columns is None and where is None:
+            return self.master_contract_df
+        if self.master_contract_df is None and self._instrument_store is not None:
+            # Plain columns, the same dtypes select_instruments returns from a loaded master
+            df = self._instrument_store.load(
+                segments=segments, columns=columns, where=where, day=master_day(), categorical=False
+            )
+            if df is not None:
+                if 'symbol' in df:
+                    df['symbol_id'] = symbol_ids.intern_many(df['symbol'])
+                return df
         if self.master_contract_df is None:
             self.download_instruments()
+        return select_instruments(self.master_contract_df, segments, columns, where)
+    
+    def get_nse_futures_symbols(self) -> List[str]:
+        # Only the futures segments are read from the store
+        futures_df = self.get_instruments(
+            segments=['NFO-FUT', 'MCX-FUT'], columns=['symbol', 'segment', 'expiry', 'underlying_symbol']
+        )
 
         # Filter for NSE futures contracts that have not expired
-        futures_df = self.master_contract_df[
-            ((self.master_contract_df['segment'] == 'NFO-FUT') |
-            (self.master_contract_df['segment'] == 'MCX-FUT')) &
-            (pd.to_datetime(self.master_contract_df['expiry']) >= pd.to_datetime('today').normalize())
+        futures_df = futures_df[
+            pd.to_datetime(futures_df['expiry']) >= pd.to_datetime('today').normalize()
         ].copy()
 
         '''futures_df = self.master_contract_df[
@@ -673,9 +672,10 @@ class FyersDriver(BrokerDriver):
         }
         if sym_u in index_map:
             sym_part = index_map[sym_u]
-        elif not (sym_u.endswith("CE") or sym_u.endswith("PE") or "FUT" in sym_u or sym_u.endswith("-INDEX")):
-            # Equity underlying
-            if not sym_u.endswith("-EQ"):
+        else:
+            info = parse_symbol(sym_u)
+            if info.kind == EQ and info.series is None:
+                # Equity underlying
                 sym_part = f"{sym_part}-EQ"
         data = {"symbol": f"{exch_part}:{sym_part}"}
         ts = kwargs.get("timestamp")
@@ -860,7 +860,7 @@ class FyersDriver(BrokerDriver):
                 if isinstance(symbol, str) and ":" in symbol:
                     exch_str, sym = symbol.split(":", 1)
                     symbol = self._format_symbol(Exchange[exch_str], sym.replace("-EQ", ""))
-                is_future = isinstance(symbol, str) and "FUT" in symbol.upper()
+                is_future = isinstance(symbol, str) and parse_symbol(symbol).is_future
                 sanitized.append(
                     {
                         "symbol": symbol,
@@ -929,9 +929,7 @@ class FyersDriver(BrokerDriver):
         try:
             has_equity = any(
                 isinstance(it.get("symbol"), str)
-                and it.get("symbol").upper().endswith("-EQ")
-                and ("FUT" not in it.get("symbol").upper())
-                and (not it.get("symbol").upper().endswith("CE") and not it.get("symbol").upper().endswith("PE"))
+                and parse_symbol(it["symbol"]).series == "EQ"
                 for it in sanitized
             )
         except Exception:
@@ -942,13 +940,12 @@ class FyersDriver(BrokerDriver):
             if getattr(self, "_access_token", None) and getattr(self, "_client_id", None):
                 # Match legacy implementation payload formatting
                 import json as _json
-                import requests as _requests  # type: ignore
                 url = "https://api.fyers.in/api/v2/span_margin"
                 headers = {
                     "Authorization": f"{self._client_id}:{self._access_token}",
                     "Content-Type": "application/json",
                 }
-                resp = _requests.post(url, headers=headers, data=_json.dumps({"data": sanitized}), timeout=30)
+                resp = get_session_manager().post(url, headers=headers, data=_json.dumps({"data": sanitized}), timeout=30)
                 try:
                     resp.raise_for_status()
                     return resp.json()
@@ -971,6 +968,10 @@ class FyersDriver(BrokerDriver):
         except Exception as e:  # noqa: BLE001
             return {"s": "error", "message": str(e)}
 
+    def warm_urls(self) -> List[str]:  # type: ignore[override]
+        # Orders/quotes/multi-order margin live on api-t1; span margin on api
+        return ["https://api-t1.fyers.in/", "https://api.fyers.in/"]
+
     def exit_positions(self, *args: Any, **kwargs: Any) -> Any:
         raise UnsupportedOperationError("FyersDriver.exit_positions not implemented yet in brokers2")
 
@@ -1003,18 +1004,125 @@ class FyersDriver(BrokerDriver):
                 resp = getattr(self._fyers_model, "place_basket_orders")(payloads)
                 if isinstance(resp, dict) and resp.get("s") == "ok":
                     oid = str(resp.get("id") or resp.get("order_id"))
-                    return [OrderResponse(status="ok", order_id=oid, raw=resp) for _ in payloads]
+                    return [OrderResponse(status="ok", order_id=oid, raw=retain_raw(resp)) for _ in payloads]
                 return [OrderResponse(status="error", order_id=None, message=str(resp))]
             # Fallback: individual placement
             results: List[OrderResponse] = []
             for p in payloads:
                 r = self._fyers_model.place_order(p)
                 if isinstance(r, dict) and r.get("s") == "ok":
-                    results.append(OrderResponse(status="ok", order_id=str(r.get("id") or r.get("order_id")), raw=r))
+                    results.append(OrderResponse(status="ok", order_id=str(r.get("id") or r.get("order_id")), raw=retain_raw(r)))
                 else:
                     results.append(OrderResponse(status="error", order_id=None, message=str(r)))
             return results
         except Exception as e:  # noqa: BLE001
             return [OrderResponse(status="error", order_id=None, message=str(e))]
 
+    # --- Async (fyers_apiv3 is_async=True) ---
+    def get_capabilities(self) -> BrokerCapabilities:
+        # Native coroutines need credentials and the SDK; the client itself is built on first async call.
+        # If that build fails, each *_async method falls back to the blocking call on a worker thread.
+        self.capabilities.supports_native_async = bool(self._client_id and self._access_token) and _fyers_model_class() is not None
+        return self.capabilities
+
+    def _async_model(self) -> Any:
+        """Lazily build a FyersModel whose endpoints return awaitables (once per client id/token)."""
+        key = (self._client_id, self._access_token) if self._client_id and self._access_token else None
+        if key is not None and key != self._fyers_model_async_key:
+            self._fyers_model_async_key = key
+            self._fyers_model_async = None
+            model_cls = _fyers_model_class()
+            if model_cls is not None:
+                try:  # pragma: no cover - relies on external package
+                    self._fyers_model_async = model_cls(
+                        client_id=self._client_id,
+                        token=self._access_token,
+                        is_async=True,
+                        log_path="logs",
+                    )
+                except Exception:
+                    pass
+        return self._fyers_model_async
+
+    async def get_quote_async(self, symbol: str) -> Quote:
+        model = self._async_model()
+        if model is None:  # blocking SDK call, kept off the event loop
+            return await asyncio.to_thread(self.get_quote, symbol)
+        full, exchange = self._fyers_symbol(symbol)
+        try:
+            resp = await model.quotes({"symbols": full})
+        except Exception:
+            resp = {"s": "error"}
+        return self._parse_quote(full, exchange, resp)
+
+    async def get_quotes_async(self, symbols: List[str]) -> Dict[str, Quote]:
+        model = self._async_model()
+        if model is None:  # blocking SDK call, kept off the event loop
+            return await asyncio.to_thread(self.get_quotes, symbols)
+        fulls, chunks = self._quote_chunks(symbols)
+
+        async def fetch(chunk: List[str]) -> Dict[str, Quote]:
+            try:
+                return self._parse_quotes(await model.quotes({"symbols": ",".join(chunk)}))
+            except Exception:
+                return {}
+
+        parsed: Dict[str, Quote] = {}
+        for part in await asyncio.gather(*(fetch(c) for c in chunks)):
+            parsed.update(part)
+        return {s: parsed[f] for s, f in fulls.items() if f in parsed}
+
+    async def get_history_async(self, symbol: str, interval: str, start: str, end: str, oi: bool = False) -> List[Dict[str, Any]]:
+        return columns_to_candles(await self.get_history_array_async(symbol, interval, start, end, oi))
+
+    async def get_history_array_async(self, symbol: str, interval: str, start: str, end: str, oi: bool = False) -> CandleColumns:
+        model = self._async_model()
+        if model is None:  # blocking SDK call, kept off the event loop
+            return await asyncio.to_thread(self.get_history_array, symbol, interval, start, end, oi)
+        try:
+            resp = await model.history(self._history_payload(symbol, interval, start, end, oi))
+            return self._parse_history(resp)
+        except Exception:
+            return failed_columns()
+
+    async def get_positions_async(self) -> List[Position]:
+        model = self._async_model()
+        if model is None:  # blocking SDK call, kept off the event loop
+            return await asyncio.to_thread(self.get_positions)
+        try:
+            return self._parse_positions(await model.positions())
+        except Exception:
+            return []
+
+    async def place_order_async(self, request: OrderRequest) -> OrderResponse:
+        model = self._async_model()
+        if model is None:  # blocking SDK call, kept off the event loop
+            return await asyncio.to_thread(self.place_order, request)
+        try:
+            resp = await model.place_order(self._order_payload(request))
+            return self._parse_order_response(resp)
+        except Exception as e:  # noqa: BLE001
+            return self._order_error(e)
+
+    async def cancel_order_async(self, order_id: str) -> OrderResponse:
+        model = self._async_model()
+        if model is None:  # blocking SDK call, kept off the event loop
+            return await asyncio.to_thread(self.cancel_order, order_id)
+        try:
+            resp = await model.cancel_order({"id": order_id})
+            return OrderResponse(status="ok", order_id=order_id, raw=retain_raw(resp if isinstance(resp, dict) else None))
+        except Exception as e:  # noqa: BLE001
+            return OrderResponse(status="error", order_id=order_id, message=str(e))
+
+    async def modify_order_async(self, order_id: str, updates: Dict[str, Any]) -> OrderResponse:
+        model = self._async_model()
+        if model is None:  # blocking SDK call, kept off the event loop
+            return await asyncio.to_thread(self.modify_order, order_id, updates)
+        try:
+            payload = {"id": order_id}
+            payload.update(updates)
+            resp = await model.modify_order(payload)
+            return OrderResponse(status="ok", order_id=order_id, raw=retain_raw(resp if isinstance(resp, dict) else None))
+        except Exception as e:  # noqa: BLE001
+            return OrderResponse(status="error", order_id=order_id, message=str(e))
 
@@ -0,0 +1,158 @@
+"""Fyers master contract: parallel conditional downloads, once-a-day cache, vectorized columns."""
+
+from __future__ import annotations
+
+from datetime import date, datetime, time as dtime
+import os
+from typing import Callable, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from ...cache.instruments import trading_day
+from ...net.batching import map_concurrent
+from ...net.http import download_cached
+
+
+# Fyers republishes the symbol master before the pre-open session; treat files
+# fetched after this time as good for the rest of the trading day.
+MASTER_REFRESH = dtime(7, 30)
+DEFAULT_MASTER_DIR = ".cache/fyers_master"
+
+MASTER_CONTRACT_URLS = [
+    "https://public.fyers.in/sym_details/NSE_FO.csv",
+    "https://public.fyers.in/sym_details/BSE_FO.csv",
+    "https://public.fyers.in/sym_details/NSE_CD.csv",
+    "https://public.fyers.in/sym_details/NSE_COM.csv",
+    "https://public.fyers.in/sym_details/NSE_CM.csv",
+    "https://public.fyers.in/sym_details/BSE_CM.csv",
+    "https://public.fyers.in/sym_details/MCX_COM.csv",
+]
+
+HEADERS = [
+    "Fytoken", "Symbol Details", "Exchange Instrument type", "Minimum lot size",
+    "Tick size", "ISIN", "Trading Session", "Last update date", "Expiry date",
+    "Symbol ticker", "Exchange", "Segment", "Scrip code", "Underlying symbol",
+    "Underlying scrip code", "Strike price", "Option type", "Underlying FyToken",
+    "Reserved column1", "Reserved column2", "Reserved column3",
+]
+
+HEADER_MAPPING = {
+    "Fytoken": "token",
+    "Symbol Details": "symbol_details",
+    "Exchange Instrument type": "instrument_type",
+    "Minimum lot size": "lot_size",
+    "Tick size": "tick_size",
+    "ISIN": "isin",
+    "Trading Session": "trading_session",
+    "Last update date": "last_update_date",
+    "Expiry date": "expiry",
+    "Symbol ticker": "symbol",
+    "Exchange": "exchange",
+    "Strike price": "strike",
+    "Segment": "segment",
+    "Scrip code": "scrip_code",
+    "Underlying symbol": "underlying_symbol",
+}
+
+# Ticker prefix -> derivatives segment (matches the zerodha segments). MCX options
+# have never been given a segment, so they stay None like unknown prefixes.
+_FUTURES_SEGMENT = {"NSE": "NFO-FUT", "BSE": "BFO-FUT", "MCX": "MCX-FUT"}
+_OPTIONS_SEGMENT = {"NSE": "NFO-OPT", "BSE": "BFO-OPT"}
+
+
+def master_day(ts: Optional[float] = None) -> date:
+    """Trading day a fetch at ``ts`` (epoch seconds, default now) belongs to."""
+    return trading_day(ts, MASTER_REFRESH)
+
+
+def fetched_today(fetched_at: float) -> bool:
+    return master_day(fetched_at) == master_day()
+
+
+def download_master_files(
+    urls: Sequence[str] = MASTER_CONTRACT_URLS,
+    directory: str = DEFAULT_MASTER_DIR,
+    *,
+    fresh: Optional[Callable[[float], bool]] = fetched_today,
+    max_workers: int = 8,
+) -> Tuple[List[str], bool]:
+    """Fetch every exchange file concurrently; each is skipped (same day) or revalidated (ETag/Last-Modified).
+
+    Returns ``(paths, stale)``; ``stale`` is true when any file is an older copy
+    kept because its download failed.
+    """
+
+    def fetch(url: str) -> Tuple[str, bool]:
+        path = os.path.join(directory, url.rsplit("/", 1)[-1])
+        path, _, stale = download_cached(url, path, fresh=fresh, timeout=30)
+        return path, stale
+
+    results = map_concurrent(fetch, list(urls), max_workers=max_workers)
+    return [path for path, _ in results], any(stale for _, stale in results)
+
+
+def read_master_files(paths: Sequence[str]) -> pd.DataFrame:
+    """Parse the raw exchange CSVs (no header row) into the driver's columns, plus ``option_type``."""
+    usecols = list(HEADER_MAPPING) + ["Option type"]
+    frames = [
+        pd.read_csv(p, names=HEADERS, header=None, usecols=usecols, low_memory=False)
+        for p in paths
+        if os.path.getsize(p) > 0
+    ]
+    df = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=usecols)
+    df = df[usecols]
+    df.columns = list(HEADER_MAPPING.values()) + ["option_type"]
+    return df
+
+
+def derive_columns(df: pd.DataFrame, today: Optional[date] = None) -> pd.DataFrame:
+    """Add instrument_type, expiry (date), days_to_expiry and segment without row-wise Python."""
+    today = today or datetime.now().date()
+    symbol = df["symbol"].to_numpy(dtype="U")
+    option = df.pop("option_type") if "option_type" in df else None
+    is_fut = np.char.endswith(symbol, "FUT")
+    if option is not None:
+        # The option-type column is authoritative (equities like RELIANCE end in CE too)
+        is_ce, is_pe = (option == "CE").to_numpy(), (option == "PE").to_numpy()
+    else:
+        is_ce, is_pe = np.char.endswith(symbol, "CE"), np.char.endswith(symbol, "PE")
+    kind = np.select([is_fut, is_ce, is_pe], ["FUT", "CE", "PE"], default="EQ")
+    df["instrument_type"] = kind
+
+    expiry = pd.to_datetime(pd.to_numeric(df["expiry"], errors="coerce"), unit="s", errors="coerce")
+    days = expiry.to_numpy(dtype="datetime64[D]")
+    valid = ~np.isnat(days)
+    dte = np.full(len(df), np.nan)
+    if valid.any():
+        dte[valid] = np.busday_count(np.datetime64(today, "D"), days[valid]) + 1
+    df["expiry"] = pd.Series(expiry.dt.date, index=df.index).where(valid, np.nan)
+    df["days_to_expiry"] = dte
+
+    prefix = pd.Series(symbol.astype("U3"))
+    futures = prefix.map(_FUTURES_SEGMENT).to_numpy(object)  # NaN for unmapped prefixes
+    options = prefix.map(_OPTIONS_SEGMENT).to_numpy(object)
+    cash = np.where(np.isin(prefix, ("NSE", "BSE")), prefix, None)
+    segment = np.where(is_fut, futures, np.where(is_ce | is_pe, options, cash))
+    # Unknown prefixes leave NaN from the map; normalise them to None
+    df["segment"] = pd.Series(segment, index=df.index, dtype=object).where(pd.notna(segment), None)
+    return df
+
+
+def load_master_contract(
+    urls: Sequence[str] = MASTER_CONTRACT_URLS,
+    directory: Optional[str] = None,
+    *,
+    refresh: bool = False,
+) -> Tuple[pd.DataFrame, bool]:
+    """Download (or reuse today's copy of) the Fyers symbol master.
+
+    Returns ``(frame, stale)``; a stale frame was built from at least one file
+    whose download failed and should not be stored as today's master.
+    """
+    from ...config import getenv
+
+    directory = directory or getenv("BROKER_MASTER_DIR") or DEFAULT_MASTER_DIR
+    paths, stale = download_master_files(urls, directory, fresh=None if refresh else fetched_today)
+    df = read_master_files(paths)
+    return derive_columns(df), stale
@@ -10,6 +10,7 @@ from typing import Any, Dict, List, Optional
 from ...core.enums import Exchange, OrderType, ProductType, TransactionType, Validity
 from ...core.errors import MarginUnavailableError, UnsupportedOperationError
 from ...core.interface import BrokerDriver
+from ...core.option_chain import DEFAULT_STRIKE_COUNT, build_option_chain
 from ...core.schemas import (
     BrokerCapabilities,
     Funds,
@@ -18,7 +19,9 @@ from ...core.schemas import (
     OrderResponse,
     Position,
     Quote,
+    retain_raw,
 )
+from ...symbols.index import InstrumentIndex
 
 
 class FyrodhaDriver(BrokerDriver):
@@ -126,7 +129,7 @@ class FyrodhaDriver(BrokerDriver):
                 average_price=new_avg,
                 pnl=existing.pnl,
                 product_type=existing.product_type,
-                raw=existing.raw,
+                raw=retain_raw(existing.raw),
             )
         else:
             self._positions[pos_key] = Position(
@@ -146,7 +149,7 @@ class FyrodhaDriver(BrokerDriver):
                 self._on_order_update_cb(None, {"event": "order_update", "status": "ok", "order_id": oid, "raw": self._orders[oid]})
             except Exception:
                 pass
-        return OrderResponse(status="ok", order_id=oid, raw=self._orders[oid])
+        return OrderResponse(status="ok", order_id=oid, raw=retain_raw(self._orders[oid]))
 
     def cancel_order(self, order_id: str) -> OrderResponse:
         od = self._orders.get(order_id)
@@ -158,7 +161,7 @@ class FyrodhaDriver(BrokerDriver):
                 self._on_order_update_cb(None, {"event": "order_update", "status": "cancelled", "order_id": order_id, "raw": od})
             except Exception:
                 pass
-        return OrderResponse(status="ok", order_id=order_id, raw=od)
+        return OrderResponse(status="ok", order_id=order_id, raw=retain_raw(od))
 
     def modify_order(self, order_id: str, updates: Dict[str, Any]) -> OrderResponse:
         od = self._orders.get(order_id)
@@ -170,7 +173,7 @@ class FyrodhaDriver(BrokerDriver):
                 self._on_order_update_cb(None, {"event": "order_update", "status": "modified", "order_id": order_id, "raw": od})
             except Exception:
                 pass
-        return OrderResponse(status="ok", order_id=order_id, raw=od)
+        return OrderResponse(status="ok", order_id=order_id, raw=retain_raw(od))
 
     def get_orderbook(self) -> List[Dict[str, Any]]:
         return list(self._orders.values())
@@ -190,9 +193,9 @@ class FyrodhaDriver(BrokerDriver):
         base = self._seed_quote(symbol)
         evolved = self._bm_step(base)
         exch, tsym = symbol.split(":", 1) if ":" in symbol else ("NSE", symbol)
-        return Quote(symbol=tsym.replace("-EQ", ""), exchange=Exchange[exch], last_price=evolved, raw={"seed": base, "sim": evolved})
+        return Quote(symbol=tsym.replace("-EQ", ""), exchange=Exchange[exch], last_price=evolved, raw=retain_raw(lambda: {"seed": base, "sim": evolved}))
 
-    def get_history(self, symbol: str, interval: str, start: str, end: str) -> List[Dict[str, Any]]:
+    def get_history(self, symbol: str, interval: str, start: str, end: str, oi: bool = False) -> List[Dict[str, Any]]:
         base = self._seed_quote(symbol)
         # Generate synthetic candles at ~15m resolution unless otherwise requested
         try:
@@ -225,14 +228,30 @@ class FyrodhaDriver(BrokerDriver):
     def download_instruments(self) -> None:
         self._seed_fyers.download_instruments()
 
-    def get_instruments(self) -> List[Instrument]:
-        return self._seed_fyers.get_instruments()
+    def get_instruments(
+        self,
+        segments: Optional[List[str]] = None,
+        columns: Optional[List[str]] = None,
+        where: Optional[Dict[str, Any]] = None,
+    ) -> List[Instrument]:
+        return self._seed_fyers.get_instruments(segments, columns, where)
 
     # --- Option chain ---
     def get_option_chain(self, underlying: str, exchange: str, **kwargs: Any) -> List[Dict[str, Any]]:
-        # Simulate by returning a grid of strikes around current spot
         sym = f"{exchange}:{underlying}" if ":" not in underlying else underlying
         spot = self._seed_quote(sym)
+        # Real strikes/expiry from the seed master, priced by the simulated quotes
+        try:
+            options = self.get_instruments(where={"instrument_type": ["CE", "PE"]})
+            legs = build_option_chain(
+                InstrumentIndex(options), sym, spot=spot,
+                strike_count=int(kwargs.get("strikecount", DEFAULT_STRIKE_COUNT)), get_quotes=self.get_quotes,
+            )
+            if legs:
+                return legs
+        except Exception:
+            pass
+        # No master available: simulate a grid of strikes around current spot
         lot = 50
         strikes = [round(spot + d, -1) for d in range(-300, 301, 50)]
         out: List[Dict[str, Any]] = []
@@ -1,10 +1,14 @@
 from __future__ import annotations
 
-from datetime import datetime
+from datetime import date, datetime, time as dtime
 import os
-from typing import Any, Dict, List, Optional
+import threading
+from typing import Any, Dict, List, Optional, Tuple
 from urllib import request
 
+from ...auth.tokens import TokenCache, resolve_token
+from ...cache.instruments import InstrumentStore, select_instruments, trading_day
+from ...core.candles import CandleColumns, columns_to_candles, failed_columns
 from ...core.enums import Exchange, OrderType, ProductType, TransactionType, Validity
 from ...core.errors import MarginUnavailableError, UnsupportedOperationError
 from ...core.interface import BrokerDriver
@@ -16,11 +20,25 @@ from ...core.schemas import (
     OrderResponse,
     Position,
     Quote,
+    retain_raw,
 )
+from ...logging import get_logger
 from ...mappings import MappingRegistry as M
+from ...net.batching import chunked
+from ...net.ratelimiter import quote_bucket
+from ...net.replay import replay_mode
+from ...symbols.ids import symbol_ids
 import pandas as pd
 import numpy as np
 
+
+logger = get_logger(__name__)
+
+# kite.quote accepts at most this many instruments per request
+QUOTES_MAX_INSTRUMENTS = 500
+# Kite regenerates the instruments dump once a day, before the pre-open session
+INSTRUMENTS_ROLLOVER = dtime(8, 30)
+
 class ZerodhaDriver(BrokerDriver):
     """Zerodha driver using kiteconnect when available.
 
@@ -49,56 +67,93 @@ class ZerodhaDriver(BrokerDriver):
             supports_cover_order=True,
             supports_multileg_order=False,
             supports_basket_orders=True,
+            max_quotes_per_request=QUOTES_MAX_INSTRUMENTS,
         )
         self._kite = None  # kiteconnect client if available
         self._kite_ws = None
-
-        # Try to wire a ready KiteConnect if env provides api_key + access_token
+        # instrument_token -> EXCH:TRADINGSYMBOL for subscribed instruments (ticks only carry tokens)
+        self._ws_token_symbols: Dict[int, str] = {}
+        self.master_contract_df = None
+        self._instrument_store = InstrumentStore.from_env("zerodha")
+        # EXCH:TRADINGSYMBOL <-> instrument_token, built once per master (see _token_maps)
+        self._tokens: Dict[str, int] = {}
+        self._token_symbols: Dict[int, str] = {}
+        # (master frame, trading day) the maps were built from; the frame is held, not its id()
+        self._tokens_key: Optional[Tuple[Any, date]] = None
+        self._tokens_lock = threading.Lock()
+
+        # Reuse a cached/env token when one profile call accepts it; log in only as fallback
         import os
         api_key = os.getenv("BROKER_API_KEY") or os.getenv("KITE_API_KEY") or os.getenv("ZERODHA_API_KEY")
         access_token = (
             os.getenv("BROKER_ACCESS_TOKEN") or os.getenv("KITE_ACCESS_TOKEN") or os.getenv("ZERODHA_ACCESS_TOKEN")
         )
-        if api_key and access_token:
-            try:  # pragma: no cover - external package
-                from kiteconnect import KiteConnect  # type: ignore
+        self._login_mode = (os.getenv("BROKER_LOGIN_MODE") or "auto").lower()
+        if api_key and not replay_mode():  # replay answers from the cassette, no login
+            resolve_token(
+                TokenCache.from_env("zerodha"),
+                api_key,
+                validate=lambda token: self._use_token(api_key, token),
+                login=self._login,
+                seed=access_token,
+            )
+        if self._kite is None and api_key and access_token:
+            # Unvalidated env token (e.g. profile call failed transiently)
+            self._kite = self._new_kite(api_key, access_token)
 
-                kite = KiteConnect(api_key=api_key)
-                kite.set_access_token(access_token)
-                self._kite = kite
-            except Exception:
-                self._kite = None
+    @staticmethod
+    def _new_kite(api_key: str, access_token: str) -> Any:
+        try:  # pragma: no cover - external package
+            from kiteconnect import KiteConnect  # type: ignore
 
-        # Optional TOTP login if requested and tokens missing
-        if self._kite is None:
-            login_mode = (os.getenv("BROKER_LOGIN_MODE") or "auto").lower()
-            if login_mode in ("totp", "auto"):
-                kite_totp = self._authenticate_via_totp()
-                if kite_totp is not None:
-                    self._kite = kite_totp
+            kite = KiteConnect(api_key=api_key)
+            kite.set_access_token(access_token)
+            return kite
+        except Exception:
+            return None
+
+    def _use_token(self, api_key: str, access_token: str) -> bool:
+        """Validate ``access_token`` with one profile call; keep the client on success."""
+        kite = self._new_kite(api_key, access_token)
+        if kite is None:
+            return False
+        try:
+            kite.profile()
+        except Exception:
+            return False
+        self._kite = kite
+        return True
+
+    def _login(self) -> Optional[str]:
+        """TOTP, then manual login as BROKER_LOGIN_MODE permits; returns the new access token."""
+        if self._login_mode in ("totp", "auto"):
+            kite_totp = self._authenticate_via_totp()
+            if kite_totp is not None:
+                self._kite = kite_totp
+                return getattr(kite_totp, "access_token", None)
 
         # Optional manual login if no token and login_mode permits
-        if self._kite is None:
-            login_mode = (os.getenv("BROKER_LOGIN_MODE") or "auto").lower()
-            if login_mode in ("manual", "auto"):
-                try:  # pragma: no cover - interactive
-                    from kiteconnect import KiteConnect  # type: ignore
-                    from ...auth.manual import manual_exchange_request_token
-
-                    api_key2 = api_key or os.getenv("KITE_API_KEY") or os.getenv("ZERODHA_API_KEY")
-                    api_secret = os.getenv("BROKER_API_SECRET") or os.getenv("KITE_API_SECRET") or os.getenv("ZERODHA_API_SECRET")
-                    if api_key2 and api_secret:
-                        kite2 = KiteConnect(api_key=api_key2)
-                        url = kite2.login_url()
-                        request_token = manual_exchange_request_token(url)
-                        sess = kite2.generate_session(request_token, api_secret)
-                        token = sess.get("access_token")
-                        if token:
-                            kite2.set_access_token(token)
-                            self._kite = kite2
-                except Exception:
-                    # Keep unauthenticated if manual flow fails
-                    pass
+        if self._login_mode in ("manual", "auto"):
+            try:  # pragma: no cover - interactive
+                from kiteconnect import KiteConnect  # type: ignore
+                from ...auth.manual import manual_exchange_request_token
+
+                api_key2 = os.getenv("BROKER_API_KEY") or os.getenv("KITE_API_KEY") or os.getenv("ZERODHA_API_KEY")
+                api_secret = os.getenv("BROKER_API_SECRET") or os.getenv("KITE_API_SECRET") or os.getenv("ZERODHA_API_SECRET")
+                if api_key2 and api_secret:
+                    kite2 = KiteConnect(api_key=api_key2)
+                    url = kite2.login_url()
+                    request_token = manual_exchange_request_token(url)
+                    sess = kite2.generate_session(request_token, api_secret)
+                    token = sess.get("access_token")
+                    if token:
+                        kite2.set_access_token(token)
+                        self._kite = kite2
+                        return token
+            except Exception:
+                # Keep unauthenticated if manual flow fails
+                pass
+        return None
 
     def _authenticate_via_totp(self) -> Optional[Any]:
         """Programmatic TOTP login using Zerodha web endpoints to obtain access token.
@@ -206,7 +261,7 @@ class ZerodhaDriver(BrokerDriver):
                             if p.get("product") == "NRML"
                             else (ProductType.INTRADAY if p.get("product") == "MIS" else ProductType.CNC)
                         ),
-                        raw=p,
+                        raw=retain_raw(p),
                     )
                 )
             return combined
@@ -237,7 +292,7 @@ class ZerodhaDriver(BrokerDriver):
                 trigger_price=request.stop_price,
                 tag=request.tag,
             )
-            resp = OrderResponse(status="ok", order_id=str(order_id), raw={"order_id": order_id})
+            resp = OrderResponse(status="ok", order_id=str(order_id), raw=retain_raw({"order_id": order_id}))
             # Optional: immediately notify via callback that order placement succeeded
             if isinstance(resp, OrderResponse) and resp.status == "ok":
                 if getattr(self, "_on_order_update_cb", None):
@@ -248,9 +303,9 @@ class ZerodhaDriver(BrokerDriver):
                 return resp
             
             if isinstance(resp, OrderResponse) and resp.status == "error":
-                return OrderResponse(status="error", order_id=str(resp.order_id), raw=resp.to_dict() if isinstance(resp, OrderResponse) else None)
+                return OrderResponse(status="error", order_id=str(resp.order_id), raw=retain_raw(lambda: resp.to_dict() if isinstance(resp, OrderResponse) else None))
             
-            return OrderResponse(status="error", order_id=-1, message=str(resp), raw=resp.to_dict() if isinstance(resp, OrderResponse) else None)
+            return OrderResponse(status="error", order_id=-1, message=str(resp), raw=retain_raw(lambda: resp.to_dict() if isinstance(resp, OrderResponse) else None))
         except Exception as e:  # noqa: BLE001
             # Emit synthetic order error update to mimic broker event stream for testing
             if getattr(self, "_on_order_update_cb", None):
@@ -265,7 +320,7 @@ class ZerodhaDriver(BrokerDriver):
             return OrderResponse(status="error", order_id=order_id, message="unauthenticated")
         try:
             resp = self._kite.cancel_order(variety=self._kite.VARIETY_REGULAR, order_id=order_id)
-            return OrderResponse(status="ok", order_id=str(order_id), raw=resp)
+            return OrderResponse(status="ok", order_id=str(order_id), raw=retain_raw(resp))
         except Exception as e:  # noqa: BLE001
             return OrderResponse(status="error", order_id=str(order_id), message=str(e))
 
@@ -274,7 +329,7 @@ class ZerodhaDriver(BrokerDriver):
             return OrderResponse(status="error", order_id=order_id, message="unauthenticated")
         try:
             resp = self._kite.modify_order(variety=self._kite.VARIETY_REGULAR, order_id=order_id, **updates)
-            return OrderResponse(status="ok", order_id=str(order_id), raw=resp)
+            return OrderResponse(status="ok", order_id=str(order_id), raw=retain_raw(resp))
         except Exception as e:  # noqa: BLE001
             return OrderResponse(status="error", order_id=str(order_id), message=str(e))
 
@@ -302,11 +357,63 @@ class ZerodhaDriver(BrokerDriver):
         payload = next(iter(data.values()))
         last_price = float(payload.get("last_price", 0.0))
         exch, tradingsymbol = symbol.split(":", 1)
-        return Quote(symbol=tradingsymbol, exchange=Exchange[exch], last_price=last_price, raw=data)
+        return Quote(symbol=tradingsymbol, exchange=Exchange[exch], last_price=last_price, raw=retain_raw(data))
+
+    def get_quotes(self, symbols: List[str]) -> Dict[str, Quote]:  # type: ignore[override]
+        """Batched quotes via ``kite.quote([...])``, keyed by the symbols as passed in.
 
-    def get_history(self, symbol: str, interval: str, start: str, end: str) -> List[Dict[str, Any]]:
+        Lists above Kite's per-request instrument cap are split and sent one after
+        another, paced by the shared quote budget (Kite allows 1 request/s). The
+        gateway sends one chunk per call and has already waited for the first.
+        A failed chunk is logged and its symbols are left out.
+        """
         if not self._kite:
-            return []
+            return {}
+        wanted = [s for s in dict.fromkeys(symbols) if isinstance(s, str) and ":" in s]
+        bucket = quote_bucket("zerodha")
+
+        data: Dict[str, Any] = {}
+        for i, chunk in enumerate(chunked(wanted, QUOTES_MAX_INSTRUMENTS)):
+            if i and bucket is not None:
+                bucket.acquire()
+            try:
+                data.update(self._kite.quote(chunk) or {})
+            except Exception as e:
+                logger.warning("Kite quote request for %d instruments failed: %s", len(chunk), e)
+        out: Dict[str, Quote] = {}
+        for s in wanted:
+            payload = data.get(s)
+            if payload is None:
+                continue
+            try:
+                out[s] = self._parse_quote(s, payload)
+            except Exception:
+                continue
+        return out
+
+    @staticmethod
+    def _parse_quote(symbol: str, payload: Dict[str, Any]) -> Quote:
+        exch, tradingsymbol = symbol.split(":", 1)
+        depth = payload.get("depth") or {}
+        buy = (depth.get("buy") or [{}])[0]
+        sell = (depth.get("sell") or [{}])[0]
+        return Quote(
+            symbol=tradingsymbol,
+            exchange=Exchange[exch],
+            last_price=float(payload.get("last_price", 0.0)),
+            bid=buy.get("price"),
+            ask=sell.get("price"),
+            volume=payload.get("volume"),
+            timestamp=payload.get("timestamp"),
+            raw=retain_raw(payload),
+        )
+
+    def get_history(self, symbol: str, interval: str, start: str, end: str, oi: bool = False) -> List[Dict[str, Any]]:
+        return columns_to_candles(self.get_history_array(symbol, interval, start, end, oi))
+
+    def get_history_array(self, symbol: str, interval: str, start: str, end: str, oi: bool = False) -> CandleColumns:
+        if not self._kite:
+            return failed_columns()
         exch, tradingsymbol = symbol.split(":", 1)
         # Normalize common interval aliases to Kite format
         imap = {
@@ -325,49 +432,65 @@ class ZerodhaDriver(BrokerDriver):
         if interval_kite is None:
             raise Exception(f"Invalid interval: {interval}")
         try:
-            try:
-                instruments = self._kite.instruments(exch)
-            except Exception:
-                instruments = self._kite.instruments()
-            token = None
-            for inst in instruments:
-                if inst.get("exchange") == exch and inst.get("tradingsymbol") == tradingsymbol:
-                    token = inst.get("instrument_token")
-                    break
+            tokens, _ = self._token_maps()
+            token = tokens.get(symbol)
             if token is None and exch == "NSE":
-                for inst in self._kite.instruments("NFO"):
-                    if inst.get("tradingsymbol") == tradingsymbol:
-                        token = inst.get("instrument_token")
-                        break
+                token = tokens.get(f"NFO:{tradingsymbol}")
             if token is None:
-                return []
-            data = self._kite.historical_data(token, from_date=start, to_date=end, interval=interval_kite)
-            # Normalize to [{ts, open, high, low, close, volume}]
-            out: List[Dict[str, Any]] = []
-            for c in data or []:
-                try:
-                    dt = c.get("date")
-                    ts = int(getattr(dt, "timestamp", lambda: None)()) if dt is not None else None
-                    if ts is None:
-                        # Attempt to coerce using pandas-like to_pydatetime if present
-                        ts = int(dt.to_pydatetime().timestamp()) if hasattr(dt, "to_pydatetime") else None
-                except Exception:
-                    ts = None
-                out.append({
-                    "ts": ts,
-                    "open": float(c.get("open", 0.0)),
-                    "high": float(c.get("high", 0.0)),
-                    "low": float(c.get("low", 0.0)),
-                    "close": float(c.get("close", 0.0)),
-                    "volume": int(c.get("volume", 0)) if c.get("volume") is not None else None,
-                })
-            return out
+                return failed_columns()
+            data = self._kite.historical_data(token, from_date=start, to_date=end, interval=interval_kite, oi=oi)
+            return self._parse_history(data or [])
         except Exception as e:
             print(f"Error getting history: {e}")
-            return []
+            return failed_columns()
+
+    @staticmethod
+    def _candle_ts(dt: Any) -> Optional[int]:
+        try:
+            if hasattr(dt, "timestamp"):
+                return int(dt.timestamp())
+            # Attempt to coerce using pandas-like to_pydatetime if present
+            return int(dt.to_pydatetime().timestamp()) if hasattr(dt, "to_pydatetime") else None
+        except Exception:
+            return None
+
+    @classmethod
+    def _parse_history(cls, data: List[Dict[str, Any]]) -> CandleColumns:
+        # Kite returns [{date, open, high, low, close, volume, oi?}]; build columns directly
+        rows = [(cls._candle_ts(c.get("date")), c) for c in data]
+        rows = [(ts, c) for ts, c in rows if ts is not None]
+        n = len(rows)
+
+        def column(name: str, default: float) -> np.ndarray:
+            return np.fromiter(
+                (default if c.get(name) is None else float(c[name]) for _, c in rows), dtype=np.float64, count=n
+            )
+
+        return {
+            "ts": np.fromiter((ts for ts, _ in rows), dtype=np.int64, count=n),
+            "open": column("open", 0.0),
+            "high": column("high", 0.0),
+            "low": column("low", 0.0),
+            "close": column("close", 0.0),
+            "volume": column("volume", np.nan),
+            "oi": column("oi", np.nan),
+        }
 
     # --- Instruments ---
-    def download_instruments(self) -> None:
+    def download_instruments(self, refresh: bool = False) -> None:
+        """Load the instrument master from today's columnar store, else from ``kite.instruments()``."""
+        store = self._instrument_store
+        day = trading_day(rollover=INSTRUMENTS_ROLLOVER)
+        df = None if refresh or store is None else store.load(day=day, categorical=False)
+        if df is None:
+            df = self._fetch_instruments()
+            if store is not None:
+                df = store.save_and_reload(df, day=day)
+        self._assign_ids(df)
+        self.master_contract_df = df
+        return df
+
+    def _fetch_instruments(self) -> pd.DataFrame:
         df = pd.DataFrame(self._kite.instruments())
         columns = ["instrument_token", "exchange_token", "tradingsymbol", "name", "last_price", "expiry", "strike", "tick_size", "lot_size", "instrument_type", "segment", "exchange"]
         header_mapping = {
@@ -388,15 +511,88 @@ class ZerodhaDriver(BrokerDriver):
         df.columns = list(header_mapping.values())
         df['expiry'] = pd.to_datetime(df['expiry']).dt.date
         df['days_to_expiry'] = df['expiry'].apply(lambda x: np.busday_count(datetime.now().date(), x) + 1 if not pd.isna(x) else np.nan)
-        self.master_contract_df = df
-        self.cache_file = ".cache/zerodha_master_contract.csv"
-        if not os.path.exists(os.path.dirname(self.cache_file)):
-            os.makedirs(os.path.dirname(self.cache_file))
-        df.to_csv(self.cache_file, index=False)
         return df
 
-    def get_instruments(self) -> List[Instrument]:
-        return self.master_contract_df
+    @staticmethod
+    def _assign_ids(df: pd.DataFrame) -> None:
+        """Dense process-local IDs keyed by EXCH:SYMBOL (what quotes and ticks use); tokens alias to them."""
+        if 'exchange' not in df or 'symbol' not in df:
+            return
+        ids = symbol_ids.intern_many(df['exchange'].astype(str) + ":" + df['symbol'].astype(str))
+        if 'token' in df:
+            symbol_ids.alias_many(df['token'].astype(int).tolist(), ids)
+        df['symbol_id'] = ids
+
+    def get_instruments(
+        self,
+        segments: Optional[List[str]] = None,
+        columns: Optional[List[str]] = None,
+        where: Optional[Dict[str, Any]] = None,
+    ) -> List[Instrument]:
+        """Whole master without arguments; otherwise only the given segments/columns/matching rows.
+
+        A pruned request reads just those slices from today's store when the full
+        master has not been loaded into this process.
+        """
+        if segments is None and columns is None and where is None:
+            return self.master_contract_df
+        if self.master_contract_df is None and self._instrument_store is not None:
+            # Plain columns, the same dtypes select_instruments returns from a loaded master
+            df = self._instrument_store.load(
+                segments=segments,
+                columns=columns,
+                where=where,
+                day=trading_day(rollover=INSTRUMENTS_ROLLOVER),
+                categorical=False,
+            )
+            if df is not None:
+                self._assign_ids(df)
+                return df
+        if self.master_contract_df is None:
+            self.download_instruments()
+        return select_instruments(self.master_contract_df, segments, columns, where)
+
+    def _token_maps(self) -> Tuple[Dict[str, int], Dict[int, str]]:
+        """(EXCH:TRADINGSYMBOL -> instrument_token, token -> symbol) from the cached master.
+
+        Built from three columns of the loaded master (or today's store) and reused
+        until the master is reloaded or the trading day rolls over.
+        """
+        master, day = self.master_contract_df, trading_day(rollover=INSTRUMENTS_ROLLOVER)
+
+        def current() -> bool:
+            key = self._tokens_key
+            return key is not None and key[0] is master and key[1] == day
+
+        if current():
+            return self._tokens, self._token_symbols
+        with self._tokens_lock:
+            if not current():
+                try:
+                    df = self.get_instruments(columns=["exchange", "symbol", "token"])
+                except Exception:
+                    df = None
+                if df is None or df.empty:
+                    return {}, {}  # retried on the next call
+                symbols = (df["exchange"].astype(str) + ":" + df["symbol"].astype(str)).tolist()
+                tokens = df["token"].astype("int64").tolist()
+                self._tokens = dict(zip(symbols, tokens))
+                self._token_symbols = dict(zip(tokens, symbols))
+                self._tokens_key = (master, day)
+        return self._tokens, self._token_symbols
+
+    def _resolve_tokens(self, symbols: List[Any]) -> Dict[int, Optional[str]]:
+        """Instrument tokens for ``symbols`` (EXCH:SYMBOL strings or tokens), with their symbols where known."""
+        tokens, token_symbols = self._token_maps()
+        out: Dict[int, Optional[str]] = {}
+        for s in symbols:
+            if isinstance(s, int):
+                out[int(s)] = token_symbols.get(int(s))
+            elif isinstance(s, str) and ":" in s:
+                tok = tokens.get(s)
+                if tok is not None:
+                    out[tok] = s
+        return out
 
     # --- Option chain ---
     def get_option_chain(self, underlying: str, exchange: str, **kwargs: Any) -> List[Dict[str, Any]]:
@@ -407,16 +603,19 @@ class ZerodhaDriver(BrokerDriver):
             _, underlying_name = underlying.split(":", 1)
         else:
             underlying_name = underlying
+        # Cached master (today's store or the loaded frame) instead of downloading kite.instruments(exchange)
         try:
-            instruments = self._kite.instruments(exchange)
+            df = self.get_instruments(
+                segments=["NFO-OPT", "BFO-OPT"], where={"exchange": exchange, "name": underlying_name}
+            )
         except Exception:
-            instruments = []
-        out = [
-            i
-            for i in instruments
-            if i.get("name") == underlying_name and i.get("segment") in ("NFO-OPT", "BFO-OPT")
-        ]
-        return out
+            return []
+        if df is None or df.empty:
+            return []
+        # Same keys as kite.instruments() rows
+        reverse = {"token": "instrument_token", "symbol": "tradingsymbol"}
+        df = df.drop(columns=[c for c in ("days_to_expiry", "symbol_id") if c in df]).rename(columns=reverse)
+        return df.astype(object).to_dict(orient="records")
 
     # --- WS ---
     def connect_websocket(
@@ -459,29 +658,15 @@ class ZerodhaDriver(BrokerDriver):
             return
 
     def symbols_to_subscribe(self, symbols: List[str]) -> None:  # type: ignore[override]
-        # Zerodha expects instrument tokens. We need to map EXCH:SYMBOL to tokens using instruments API.
+        # Zerodha expects instrument tokens; map EXCH:SYMBOL through the cached token map
         if not self._kite_ws or not self._kite:
             return
         try:
-            instruments = []
-            try:
-                instruments = self._kite.instruments()
-            except Exception:
-                instruments = []
-            index: Dict[str, int] = {}
-            for inst in instruments:
-                key = f"{inst.get('exchange')}:{inst.get('tradingsymbol')}"
-                tok = inst.get("instrument_token")
-                if key and tok is not None:
-                    index[key] = int(tok)
-            tokens: List[int] = []
-            for s in symbols:
-                if isinstance(s, int):
-                    tokens.append(int(s))
-                elif isinstance(s, str) and ":" in s:
-                    tok = index.get(s)
-                    if tok is not None:
-                        tokens.append(int(tok))
+            resolved = self._resolve_tokens(symbols)
+            for tok, sym in resolved.items():
+                if sym is not None:
+                    self._ws_token_symbols[tok] = sym
+            tokens = list(resolved)
             if tokens:
                 self._kite_ws.subscribe(tokens)
                 if hasattr(self._kite_ws, "set_mode"):
@@ -489,6 +674,34 @@ class ZerodhaDriver(BrokerDriver):
         except Exception:
             return
 
+    def quotes_from_ticks(self, ticks: Any) -> List[Tuple[str, Quote]]:  # type: ignore[override]
+        out: List[Tuple[str, Quote]] = []
+        for tick in ticks if isinstance(ticks, list) else [ticks]:
+            if not isinstance(tick, dict) or tick.get("last_price") is None:
+                continue
+            token = tick.get("instrument_token")
+            sym = self._ws_token_symbols.get(token) or self._token_symbols.get(token)
+            if sym is None:
+                continue
+            exch, tsym = sym.split(":", 1)
+            depth = tick.get("depth") or {}
+            buy = (depth.get("buy") or [{}])[0]
+            sell = (depth.get("sell") or [{}])[0]
+            try:
+                out.append((sym, Quote(
+                    symbol=tsym,
+                    exchange=Exchange[exch],
+                    last_price=float(tick["last_price"]),
+                    bid=buy.get("price"),
+                    ask=sell.get("price"),
+                    volume=tick.get("volume_traded"),
+                    timestamp=tick.get("exchange_timestamp") or tick.get("last_trade_time"),
+                    raw=retain_raw(tick),
+                )))
+            except (KeyError, TypeError, ValueError):
+                continue
+        return out
+
     def connect_order_websocket(
         self,
         *,
@@ -516,7 +729,16 @@ class ZerodhaDriver(BrokerDriver):
                 pass
 
     def unsubscribe(self, symbols: List[str]) -> None:  # type: ignore[override]
-        return None
+        if not self._kite_ws or not self._kite:
+            return
+        try:
+            tokens = list(self._resolve_tokens(symbols))
+            if tokens:
+                self._kite_ws.unsubscribe(tokens)
+                for tok in tokens:
+                    self._ws_token_symbols.pop(tok, None)
+        except Exception:
+            return
 
     # --- Margins ---
     def get_margins_required(self, orders: List[Dict[str, Any]] | List[OrderRequest]) -> Any:
@@ -560,6 +782,9 @@ class ZerodhaDriver(BrokerDriver):
         except Exception as e:  # noqa: BLE001
             return {"error": str(e)}
 
+    def warm_urls(self) -> List[str]:  # type: ignore[override]
+        return ["https://api.kite.trade/"]
+
     def exit_positions(self, *args: Any, **kwargs: Any) -> Any:
         raise UnsupportedOperationError("ZerodhaDriver.exit_positions not implemented yet in brokers2")
 
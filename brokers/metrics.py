@@ -0,0 +1,328 @@
+from __future__ import annotations
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+import threading
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from .core.interceptors import CallContext, Interceptor
+from .logging import get_logger
+
+
+logger = get_logger(__name__)
+
+# Power-of-two buckets: bucket i holds values in [2**(i-1), 2**i)
+_BUCKETS = 40
+
+
+class Histogram:
+    """Fixed log2-bucket histogram; recording is a bit_length and a few adds."""
+
+    __slots__ = ("counts", "count", "total", "min", "max")
+
+    def __init__(self) -> None:
+        self.counts = [0] * (_BUCKETS + 1)
+        self.count = 0
+        self.total = 0
+        self.min: Optional[int] = None
+        self.max: Optional[int] = None
+
+    def record(self, value: int) -> None:
+        v = max(0, int(value))
+        self.counts[min(v.bit_length(), _BUCKETS)] += 1
+        self.count += 1
+        self.total += v
+        if self.min is None or v < self.min:
+            self.min = v
+        if self.max is None or v > self.max:
+            self.max = v
+
+    def quantile(self, q: float) -> int:
+        """Upper bound of the bucket holding the q-quantile (0 when empty)."""
+        if not self.count:
+            return 0
+        rank = q * self.count
+        seen = 0
+        for i, c in enumerate(self.counts):
+            seen += c
+            if seen >= rank and c:
+                return min(1 << i, self.max or 0) if i else 0
+        return self.max or 0
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "mean": (self.total / self.count) if self.count else 0.0,
+            "min": self.min or 0,
+            "p50": self.quantile(0.50),
+            "p90": self.quantile(0.90),
+            "p99": self.quantile(0.99),
+            "max": self.max or 0,
+        }
+
+
+class MethodStats:
+    __slots__ = ("latency_us", "request_items", "response_items", "calls", "errors", "empty", "in_flight", "max_in_flight")
+
+    def __init__(self) -> None:
+        self.latency_us = Histogram()
+        self.request_items = Histogram()
+        self.response_items = Histogram()
+        self.calls = 0
+        self.errors = 0  # raised exceptions plus error-status responses
+        self.empty = 0  # empty results; drivers also report swallowed failures this way
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+
+StatsKey = Tuple[str, str, str]  # (broker, layer, method)
+
+
+class MetricsRegistry:
+    """In-memory store of per (broker, layer, method) call statistics."""
+
+    def __init__(self) -> None:
+        self._stats: Dict[StatsKey, MethodStats] = {}
+        self._lock = threading.Lock()
+
+    def _get(self, key: StatsKey) -> MethodStats:
+        stats = self._stats.get(key)
+        if stats is None:
+            with self._lock:
+                stats = self._stats.setdefault(key, MethodStats())
+        return stats
+
+    def begin(self, key: StatsKey, request_items: int) -> MethodStats:
+        stats = self._get(key)
+        with self._lock:
+            stats.calls += 1
+            stats.in_flight += 1
+            stats.max_in_flight = max(stats.max_in_flight, stats.in_flight)
+            stats.request_items.record(request_items)
+        return stats
+
+    def end(self, stats: MethodStats, elapsed_us: int, response_items: Optional[int], error: bool = False) -> None:
+        """Close a call; ``response_items`` is None when it raised."""
+        with self._lock:
+            stats.in_flight -= 1
+            stats.latency_us.record(elapsed_us)
+            if response_items is None or error:
+                stats.errors += 1
+            if response_items is not None:
+                stats.response_items.record(response_items)
+                if response_items == 0:
+                    stats.empty += 1
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Plain-dict view keyed by ``broker.layer.method``."""
+        with self._lock:
+            return {
+                f"{b}.{layer}.{m}": {
+                    "calls": s.calls,
+                    "errors": s.errors,
+                    "empty": s.empty,
+                    "in_flight": s.in_flight,
+                    "max_in_flight": s.max_in_flight,
+                    "latency_us": s.latency_us.summary(),
+                    "request_items": s.request_items.summary(),
+                    "response_items": s.response_items.summary(),
+                }
+                for (b, layer, m), s in sorted(self._stats.items())
+            }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stats.clear()
+
+
+def _items(obj: Any) -> int:
+    """Cheap payload size in items (not bytes): container length, rows for columnar candles."""
+    if obj is None:
+        return 0
+    if isinstance(obj, (str, bytes)):
+        return 1
+    if isinstance(obj, dict) and "ts" in obj and hasattr(obj["ts"], "__len__"):
+        return len(obj["ts"])
+    try:
+        return len(obj)
+    except TypeError:
+        return 1
+
+
+def _is_error(result: Any) -> bool:
+    """Error reported as a value: ``OrderResponse(status="error")`` or a legacy ``{"s": "error"}`` dict."""
+    status = getattr(result, "status", None)
+    if status is None and isinstance(result, dict):
+        status = result.get("s", result.get("status"))
+    return isinstance(status, str) and status.lower() == "error"
+
+
+class MetricsInterceptor(Interceptor):
+    """Records wall time, in-flight count, errors, empty results and payload item counts per call.
+
+    Errors are raised exceptions plus error-status responses. Drivers that swallow
+    a failure and return an empty list or empty columns show up under ``empty``.
+    """
+
+    def __init__(self, registry: Optional[MetricsRegistry] = None) -> None:
+        self.registry = registry or metrics_registry
+
+    def intercept(self, ctx: CallContext, call_next: Callable[[], Any]) -> Any:
+        stats = self.registry.begin((ctx.broker, ctx.layer, ctx.method), _items(ctx.args[0]) if ctx.args else 0)
+        start = time.perf_counter_ns()
+        try:
+            result = call_next()
+        except BaseException:
+            self.registry.end(stats, (time.perf_counter_ns() - start) // 1000, None)
+            raise
+        self.registry.end(stats, (time.perf_counter_ns() - start) // 1000, _items(result), _is_error(result))
+        return result
+
+    async def intercept_async(self, ctx: CallContext, call_next: Callable[[], Awaitable[Any]]) -> Any:
+        stats = self.registry.begin((ctx.broker, ctx.layer, ctx.method), _items(ctx.args[0]) if ctx.args else 0)
+        start = time.perf_counter_ns()
+        try:
+            result = await call_next()
+        except BaseException:
+            self.registry.end(stats, (time.perf_counter_ns() - start) // 1000, None)
+            raise
+        self.registry.end(stats, (time.perf_counter_ns() - start) // 1000, _items(result), _is_error(result))
+        return result
+
+
+# --- Sinks ---
+class MetricsSink:
+    """Receives periodic registry snapshots."""
+
+    def emit(self, snapshot: Dict[str, Dict[str, Any]]) -> None:  # pragma: no cover - interface
+        raise NotImplementedError
+
+
+class MemorySink(MetricsSink):
+    """Keeps the last ``keep`` snapshots in memory."""
+
+    def __init__(self, keep: int = 60) -> None:
+        self.keep = keep
+        self.snapshots: List[Tuple[float, Dict[str, Dict[str, Any]]]] = []
+
+    def emit(self, snapshot: Dict[str, Dict[str, Any]]) -> None:
+        self.snapshots.append((time.time(), snapshot))
+        del self.snapshots[: -self.keep]
+
+
+class LogSink(MetricsSink):
+    """One INFO line per broker/layer/method with call counts and latency percentiles."""
+
+    def emit(self, snapshot: Dict[str, Dict[str, Any]]) -> None:
+        for key, s in snapshot.items():
+            lat = s["latency_us"]
+            logger.info(
+                "%s calls=%d errors=%d empty=%d in_flight=%d p50=%.1fms p99=%.1fms max=%.1fms resp_items_p50=%d",
+                key,
+                s["calls"],
+                s["errors"],
+                s["empty"],
+                s["in_flight"],
+                lat["p50"] / 1000.0,
+                lat["p99"] / 1000.0,
+                lat["max"] / 1000.0,
+                s["response_items"]["p50"],
+            )
+
+
+class PeriodicReporter:
+    """Background thread pushing registry snapshots to sinks every ``interval`` seconds."""
+
+    def __init__(self, registry: MetricsRegistry, sinks: List[MetricsSink], interval: float = 60.0) -> None:
+        self.registry = registry
+        self.sinks = list(sinks)
+        self.interval = float(interval)
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> "PeriodicReporter":
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="broker-metrics", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            snapshot = self.registry.snapshot()
+            for sink in self.sinks:
+                try:
+                    sink.emit(snapshot)
+                except Exception:
+                    logger.debug("Metrics sink failed", exc_info=True)
+
+
+class MetricsEndpoint:
+    """Serves ``GET /metrics`` as a JSON snapshot from a daemon thread."""
+
+    def __init__(self, registry: MetricsRegistry, host: str = "127.0.0.1", port: int = 9108) -> None:
+        reg = registry
+
+        class _Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:  # noqa: N802 - http.server API
+                if self.path.rstrip("/") not in ("", "/metrics"):
+                    self.send_error(404)
+                    return
+                body = json.dumps(reg.snapshot()).encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args: Any) -> None:
+                return None
+
+        self._server = ThreadingHTTPServer((host, port), _Handler)
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def address(self) -> Tuple[str, int]:
+        return self._server.server_address[:2]  # type: ignore[return-value]
+
+    def start(self) -> "MetricsEndpoint":
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._server.serve_forever, name="broker-metrics-http", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+
+# Process-wide default registry
+metrics_registry = MetricsRegistry()
+
+_env_started = False
+_env_lock = threading.Lock()
+
+
+def interceptors_from_env() -> List[Interceptor]:
+    """Interceptors enabled by BROKER_METRICS; starts the configured log/endpoint sinks once."""
+    from .config import getenv, getenv_bool
+
+    global _env_started
+    if not getenv_bool("BROKER_METRICS", False):
+        return []
+    with _env_lock:
+        if not _env_started:
+            _env_started = True
+            interval = getenv("BROKER_METRICS_LOG_INTERVAL_S")
+            if interval:
+                PeriodicReporter(metrics_registry, [LogSink()], float(interval)).start()
+            port = getenv("BROKER_METRICS_PORT")
+            if port:
+                try:
+                    MetricsEndpoint(metrics_registry, port=int(port)).start()
+                except OSError:
+                    logger.warning("Could not bind metrics endpoint on port %s", port)
+    return [MetricsInterceptor(metrics_registry)]
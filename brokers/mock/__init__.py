@@ -0,0 +1,6 @@
+"""Local mock of the Fyers and Kite APIs for offline development and load tests."""
+
+from .market import MockMarket
+from .server import MockBrokerServer, MockConfig, use_mock_server
+
+__all__ = ["MockBrokerServer", "MockConfig", "MockMarket", "use_mock_server"]
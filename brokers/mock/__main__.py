@@ -0,0 +1,41 @@
+"""Run the mock broker server: ``python -m brokers.mock --port 8900 --latency-ms 20 --error-rate 0.01``."""
+
+from __future__ import annotations
+
+import argparse
+
+from .server import MockBrokerServer, MockConfig
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Local mock of the Fyers v3 and Kite Connect APIs")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8900)
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Base latency added to every REST call")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="Uniform +/- jitter around the base latency")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of REST calls answered with a 5xx")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="Fraction of REST calls answered with a 429")
+    parser.add_argument("--tick-hz", type=float, default=1.0, help="Kite ticker frames per second per connection")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    config = MockConfig(
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate,
+        rate_limit_rate=args.rate_limit_rate,
+        tick_hz=args.tick_hz,
+        seed=args.seed,
+    )
+    server = MockBrokerServer(args.host, args.port, config)
+    print(f"Mock broker listening on {server.url} (ws: {server.ws_url})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,197 @@
+"""Simulated instrument universe, prices and order book behind the mock server."""
+
+from __future__ import annotations
+
+from datetime import date, datetime, timedelta
+import itertools
+import math
+import random
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+
+# Underlying -> (spot, strike step, lot size)
+INDICES: Dict[str, Tuple[float, int, int]] = {"NIFTY": (24000.0, 50, 75), "BANKNIFTY": (52000.0, 100, 35)}
+STOCKS: Dict[str, float] = {"SBIN": 800.0, "INFY": 1500.0, "RELIANCE": 2900.0, "TCS": 4000.0, "HDFCBANK": 1650.0}
+# Index names as each broker spells them
+INDEX_NAMES = {"NIFTY": ("NIFTY 50", "NIFTY50-INDEX"), "BANKNIFTY": ("NIFTY BANK", "NIFTYBANK-INDEX")}
+
+
+def monthly_expiry(today: date) -> date:
+    """Last Thursday of the current month (next month's once it has passed)."""
+    for offset in (0, 1):
+        y = today.year + (today.month - 1 + offset) // 12
+        m = (today.month - 1 + offset) % 12 + 1
+        last = date(y + m // 12, m % 12 + 1, 1) - timedelta(days=1)
+        expiry = last - timedelta(days=(last.weekday() - 3) % 7)
+        if expiry >= today:
+            return expiry
+    return today
+
+
+class MockMarket:
+    """Simulated instruments, random-walk prices and an order/position book.
+
+    Symbols are kept in both broker spellings: Kite ``NSE:SBIN``/``NFO:NIFTY24OCT24000CE``
+    and Fyers ``NSE:SBIN-EQ``/``NSE:NIFTY24OCT24000CE``. Marketable orders fill
+    immediately at the last price; limit orders rest until cancelled.
+    """
+
+    def __init__(self, *, seed: int = 7, strikes_each_side: int = 10, today: Optional[date] = None) -> None:
+        self.rng = random.Random(seed)
+        self.instruments: List[Dict[str, Any]] = []
+        self.by_token: Dict[int, Dict[str, Any]] = {}
+        self.by_kite: Dict[str, Dict[str, Any]] = {}
+        self.by_fyers: Dict[str, Dict[str, Any]] = {}
+        self.prices: Dict[int, float] = {}
+        self.volumes: Dict[int, int] = {}
+        self.orders: Dict[str, Dict[str, Any]] = {}
+        self.trades: List[Dict[str, Any]] = []
+        self.positions: Dict[int, Dict[str, Any]] = {}
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._build(strikes_each_side, today or date.today())
+
+    # --- Universe ---
+    def _add(self, exchange: str, kite_sym: str, fyers_sym: str, price: float, **extra: Any) -> None:
+        token = 256265 + len(self.instruments) * 256
+        inst = {
+            "instrument_token": token,
+            "exchange_token": token // 256,
+            "exchange": exchange,
+            "tradingsymbol": kite_sym,
+            "fyers_symbol": fyers_sym,
+            "name": extra.pop("name", kite_sym),
+            "kind": extra.pop("kind", "EQ"),
+            "strike": extra.pop("strike", 0.0),
+            "expiry": extra.pop("expiry", None),
+            "lot_size": extra.pop("lot_size", 1),
+            "tick_size": 0.05,
+        }
+        self.instruments.append(inst)
+        self.by_token[token] = inst
+        self.by_kite[f"{exchange}:{kite_sym}"] = inst
+        self.by_fyers[fyers_sym] = inst
+        self.prices[token] = price
+        self.volumes[token] = 0
+
+    def _build(self, strikes_each_side: int, today: date) -> None:
+        for sym, price in STOCKS.items():
+            self._add("NSE", sym, f"NSE:{sym}-EQ", price, name=sym)
+        expiry = monthly_expiry(today)
+        code = expiry.strftime("%y%b").upper()
+        for und, (spot, step, lot) in INDICES.items():
+            kite_name, fyers_name = INDEX_NAMES[und]
+            self._add("NSE", kite_name, f"NSE:{fyers_name}", spot, name=und, kind="INDEX")
+            self._add("NFO", f"{und}{code}FUT", f"NSE:{und}{code}FUT", spot * 1.002, name=und, kind="FUT", expiry=expiry, lot_size=lot)
+            atm = round(spot / step) * step
+            for k in range(-strikes_each_side, strikes_each_side + 1):
+                strike = atm + k * step
+                for opt in ("CE", "PE"):
+                    intrinsic = max(0.0, spot - strike) if opt == "CE" else max(0.0, strike - spot)
+                    sym = f"{und}{code}{strike}{opt}"
+                    self._add("NFO", sym, f"NSE:{sym}", intrinsic + spot * 0.01, name=und, kind=opt, strike=float(strike), expiry=expiry, lot_size=lot)
+
+    def resolve(self, symbol: str) -> Optional[Dict[str, Any]]:
+        """Instrument for a Kite or Fyers symbol, or a numeric token."""
+        if isinstance(symbol, int) or str(symbol).isdigit():
+            return self.by_token.get(int(symbol))
+        return self.by_kite.get(symbol) or self.by_fyers.get(symbol)
+
+    # --- Prices ---
+    def step(self, tokens: Optional[List[int]] = None) -> None:
+        """Advance the random walk for ``tokens`` (all instruments by default)."""
+        with self._lock:
+            for token in tokens if tokens is not None else list(self.prices):
+                p = self.prices[token]
+                self.prices[token] = max(0.05, round(p * (1.0 + self.rng.gauss(0.0, 0.0005)), 2))
+                self.volumes[token] += self.rng.randint(1, 50) * self.by_token[token]["lot_size"]
+
+    def snapshot(self, token: int) -> Dict[str, Any]:
+        """Last price, day OHLC, volume and a five-level book around it."""
+        p = self.prices[token]
+        spread = max(0.05, round(p * 0.0002, 2))
+        return {
+            "last_price": p,
+            "volume": self.volumes[token],
+            "open": round(p * 0.995, 2),
+            "high": round(p * 1.01, 2),
+            "low": round(p * 0.99, 2),
+            "close": round(p * 0.998, 2),
+            "buy": [(round(p - spread * (i + 1), 2), 50 * (i + 1), i + 1) for i in range(5)],
+            "sell": [(round(p + spread * (i + 1), 2), 50 * (i + 1), i + 1) for i in range(5)],
+        }
+
+    def candles(self, token: int, start: datetime, end: datetime, seconds: int) -> List[Tuple[int, float, float, float, float, int, int]]:
+        """Deterministic synthetic candles (same inputs, same bars) during 09:15-15:30."""
+        base = self.prices[token]
+        out = []
+        t = int(start.timestamp()) // seconds * seconds
+        stop = int(end.timestamp())
+        while t <= stop and len(out) < 20000:
+            tod = (t + 19800) % 86400  # seconds since IST midnight
+            if seconds >= 86400 or 33300 <= tod < 55800:
+                r = random.Random(token * 1_000_003 + t)
+                o = base * (1.0 + 0.02 * math.sin(t / 86400.0)) * (1.0 + r.gauss(0.0, 0.002))
+                c = o * (1.0 + r.gauss(0.0, 0.002))
+                out.append((t, round(o, 2), round(max(o, c) * 1.001, 2), round(min(o, c) * 0.999, 2), round(c, 2), r.randint(100, 10000), r.randint(0, 100000)))
+            t += seconds
+        return out
+
+    # --- Orders ---
+    def place(self, inst: Dict[str, Any], qty: int, side: int, limit: float = 0.0, product: str = "INTRADAY", tag: Optional[str] = None) -> Dict[str, Any]:
+        """``side`` is +1 buy / -1 sell; ``limit`` 0 means market."""
+        token = inst["instrument_token"]
+        with self._lock:
+            oid = f"{datetime.now():%y%m%d}{next(self._ids):08d}"
+            ltp = self.prices[token]
+            marketable = not limit or (side > 0 and limit >= ltp) or (side < 0 and limit <= ltp)
+            order = {
+                "order_id": oid,
+                "instrument": inst,
+                "qty": int(qty),
+                "side": side,
+                "limit": float(limit or 0.0),
+                "product": product,
+                "tag": tag,
+                "status": "COMPLETE" if marketable else "OPEN",
+                "filled": int(qty) if marketable else 0,
+                "avg_price": ltp if marketable else 0.0,
+                "time": datetime.now(),
+            }
+            self.orders[oid] = order
+            if marketable:
+                self._fill(order, ltp)
+            return order
+
+    def _fill(self, order: Dict[str, Any], price: float) -> None:
+        token = order["instrument"]["instrument_token"]
+        self.trades.append({"order_id": order["order_id"], "trade_id": f"T{order['order_id']}", "price": price, "qty": order["qty"], "time": datetime.now()})
+        pos = self.positions.setdefault(token, {"instrument": order["instrument"], "qty": 0, "buy_qty": 0, "sell_qty": 0, "buy_value": 0.0, "sell_value": 0.0, "product": order["product"]})
+        pos["qty"] += order["side"] * order["qty"]
+        key = "buy" if order["side"] > 0 else "sell"
+        pos[f"{key}_qty"] += order["qty"]
+        pos[f"{key}_value"] += price * order["qty"]
+
+    def modify(self, order_id: str, qty: Optional[int] = None, limit: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            order = self.orders.get(order_id)
+            if order is None or order["status"] != "OPEN":
+                return None
+            if qty:
+                order["qty"] = int(qty)
+            if limit is not None:
+                order["limit"] = float(limit)
+            return order
+
+    def cancel(self, order_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            order = self.orders.get(order_id)
+            if order is None or order["status"] != "OPEN":
+                return None
+            order["status"] = "CANCELLED"
+            return order
+
+    def pnl(self, pos: Dict[str, Any]) -> float:
+        ltp = self.prices[pos["instrument"]["instrument_token"]]
+        return round(pos["sell_value"] - pos["buy_value"] + pos["qty"] * ltp, 2)
@@ -0,0 +1,640 @@
+"""Local stand-in for the Fyers v3 and Kite Connect APIs.
+
+One HTTP port serves the following:
+- Fyers REST (``/api/v3/*``, ``/data/*``, ``/api/v2/span_margin``, ``/sym_details/*.csv``).
+- Kite REST (``/user/*``, ``/orders``, ``/quote``, ``/instruments``...).
+- The Kite ticker websocket (binary ltp/quote/full packets).
+
+Latency, jitter, 5xx and 429 injection apply to every REST call, so the real
+drivers can be load-tested offline.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import csv
+import io
+import json
+import random
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from ..codec import dumps, loads
+from ..logging import get_logger
+from ..net.session import SessionManager, get_session_manager, set_session_manager
+from . import ws as wsproto
+from .market import MockMarket
+
+
+logger = get_logger(__name__)
+
+Response = Tuple[int, str, bytes]
+_JSON = "application/json"
+
+# Fyers order type codes -> limit price applies
+_FYERS_LIMIT_TYPES = (1, 4)
+_KITE_STATUS_FYERS = {"COMPLETE": 2, "CANCELLED": 1, "REJECTED": 5, "OPEN": 6}
+
+
+@dataclass
+class MockConfig:
+    latency_ms: float = 0.0
+    jitter_ms: float = 0.0
+    error_rate: float = 0.0  # fraction of REST calls answered 5xx
+    rate_limit_rate: float = 0.0  # fraction answered 429
+    tick_hz: float = 1.0  # websocket frames per second per connection
+    seed: int = 7
+
+
+class MockBrokerServer:
+    """Threaded HTTP/websocket server backed by a ``MockMarket``."""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, config: Optional[MockConfig] = None, market: Optional[MockMarket] = None) -> None:
+        self.config = config or MockConfig()
+        self.market = market or MockMarket(seed=self.config.seed)
+        self._rng = random.Random(self.config.seed)
+        self._rng_lock = threading.Lock()
+        self._stats: Dict[str, int] = {}
+        self._stats_lock = threading.Lock()
+        self._stopping = threading.Event()
+        mock = self
+
+        class _Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def _handle(self) -> None:
+                if self.headers.get("Upgrade", "").lower() == "websocket":
+                    mock._serve_kite_ws(self)
+                    return
+                parts = urlsplit(self.path)
+                length = int(self.headers.get("Content-Length") or 0)
+                body = self.rfile.read(length) if length else b""
+                status, ctype, payload = mock.dispatch(self.command, parts.path, parse_qs(parts.query), body, self.headers.get("Content-Type", ""))
+                self.send_response(status)
+                self.send_header("Content-Type", ctype)
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            do_GET = do_POST = do_PUT = do_PATCH = do_DELETE = do_HEAD = _handle
+
+            def log_message(self, *args: Any) -> None:
+                return None
+
+        self._server = ThreadingHTTPServer((host, port), _Handler)
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    # --- Lifecycle ---
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def ws_url(self) -> str:
+        return self.url.replace("http://", "ws://", 1)
+
+    def start(self) -> "MockBrokerServer":
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._server.serve_forever, name="broker-mock", daemon=True)
+            self._thread.start()
+        return self
+
+    def serve_forever(self) -> None:
+        self._server.serve_forever()
+
+    def stop(self) -> None:
+        self._stopping.set()
+        self._server.shutdown()
+        self._server.server_close()
+
+    def stats(self) -> Dict[str, int]:
+        """Request counts per route plus injected errors and websocket frames sent."""
+        with self._stats_lock:
+            return dict(self._stats)
+
+    def _count(self, key: str, n: int = 1) -> None:
+        with self._stats_lock:
+            self._stats[key] = self._stats.get(key, 0) + n
+
+    # --- REST ---
+    def dispatch(self, method: str, path: str, query: Dict[str, List[str]], body: bytes, ctype: str) -> Response:
+        fyers = path.startswith(("/api/", "/data/", "/sym_details/"))
+        self._count(f"{method} {path}")
+        with self._rng_lock:
+            delay = self.config.latency_ms + self._rng.uniform(-self.config.jitter_ms, self.config.jitter_ms)
+            roll = self._rng.random()
+        if delay > 0:
+            time.sleep(delay / 1000.0)
+        if roll < self.config.rate_limit_rate:
+            self._count("injected_429")
+            if fyers:
+                return _json(429, {"s": "error", "code": 429, "message": "request limit reached"})
+            return _json(429, {"status": "error", "error_type": "NetworkException", "message": "Too many requests"})
+        if roll < self.config.rate_limit_rate + self.config.error_rate:
+            self._count("injected_5xx")
+            if fyers:
+                return _json(500, {"s": "error", "code": -1, "message": "mock: injected server error"})
+            return _json(503, {"status": "error", "error_type": "NetworkException", "message": "mock: injected server error"})
+        params: Dict[str, Any] = {k: v[0] if len(v) == 1 else v for k, v in query.items()}
+        if body:
+            if "json" in ctype or body[:1] in (b"{", b"["):
+                try:
+                    payload = loads(body)
+                except ValueError:
+                    payload = {}
+                if isinstance(payload, dict):
+                    params.update(payload)
+                else:
+                    params["_body"] = payload
+            else:
+                params.update({k: v[0] for k, v in parse_qs(body.decode("utf-8")).items()})
+        try:
+            if fyers:
+                return self._fyers(method, path, params)
+            return self._kite(method, path, params, query)
+        except Exception as e:  # noqa: BLE001
+            logger.debug("Mock route failed", exc_info=True)
+            if fyers:
+                return _json(400, {"s": "error", "code": -50, "message": str(e)})
+            return _json(400, {"status": "error", "error_type": "InputException", "message": str(e)})
+
+    # Fyers v3
+    def _fyers(self, method: str, path: str, p: Dict[str, Any]) -> Response:
+        m = self.market
+        route = (method, path)
+        if route == ("GET", "/api/v3/profile"):
+            return _fy({"data": {"fy_id": "XM0000", "name": "Mock Trader", "email_id": "mock@example.com"}})
+        if route == ("GET", "/api/v3/funds"):
+            used = sum(abs(pos["qty"]) * m.prices[t] * 0.2 for t, pos in m.positions.items())
+            return _fy({"fund_limit": [{"id": 1, "title": "Total Balance", "equityAmount": 1_000_000.0, "availableBalance": 1_000_000.0 - used, "utilizedAmount": used}]})
+        if route == ("GET", "/api/v3/positions"):
+            net = [self._fy_position(pos) for pos in m.positions.values()]
+            return _fy({"netPositions": net, "overall": {"count_total": len(net), "pl_total": sum(x["pl"] for x in net)}})
+        if route == ("GET", "/api/v3/orders"):
+            orders = [self._fy_order(o) for o in m.orders.values() if not p.get("id") or o["order_id"] == p["id"]]
+            return _fy({"orderBook": orders})
+        if route == ("GET", "/api/v3/tradebook"):
+            return _fy({"tradeBook": [self._fy_trade(t) for t in m.trades]})
+        if path == "/api/v3/orders/sync":
+            if method == "POST":
+                return _fy(self._fy_place(p), code=1101)
+            if method == "PATCH":
+                order = m.modify(str(p.get("id")), p.get("qty"), p.get("limitPrice"))
+                return _fy({"id": p.get("id"), "message": "Successfully modified order"}) if order else _fy_err(-52, "Order not open")
+            if method == "DELETE":
+                order = m.cancel(str(p.get("id")))
+                return _fy({"id": p.get("id"), "message": "Successfully cancelled order"}) if order else _fy_err(-52, "Order not open")
+        if route == ("POST", "/api/v3/multi-order/sync"):
+            results = []
+            for o in p.get("_body") or []:
+                try:
+                    results.append({"statusCode": 200, "body": {"s": "ok", "code": 1101, **self._fy_place(o)}})
+                except Exception as e:  # noqa: BLE001
+                    results.append({"statusCode": 400, "body": {"s": "error", "code": -50, "message": str(e)}})
+            return _fy({"data": results})
+        if route == ("POST", "/api/v3/multiorder/margin"):
+            total = sum(self._margin(o.get("symbol"), o.get("qty")) for o in p.get("data") or [])
+            return _fy({"data": {"margin_avail": 1_000_000.0, "margin_total": total, "margin_new_order": total}})
+        if route == ("POST", "/api/v2/span_margin"):
+            total = sum(self._margin(o.get("symbol"), o.get("qty")) for o in p.get("data") or [])
+            return _fy({"data": {"span": total * 0.75, "exposure": total * 0.25, "total": total}})
+        if route == ("GET", "/data/quotes"):
+            return _fy({"d": [self._fy_quote(s) for s in str(p.get("symbols", "")).split(",") if s]})
+        if route == ("GET", "/data/depth"):
+            return _fy({"d": {s: self._fy_depth(s) for s in str(p.get("symbol", "")).split(",") if m.resolve(s)}})
+        if route == ("GET", "/data/history"):
+            return _fy({"candles": self._fy_history(p)})
+        if method == "GET" and path.startswith("/sym_details/"):
+            return 200, "text/csv", self._fy_master(path.rsplit("/", 1)[-1])
+        return _fy_err(-404, f"Unknown route {method} {path}", status=404)
+
+    def _fy_place(self, p: Dict[str, Any]) -> Dict[str, Any]:
+        inst = self.market.resolve(str(p.get("symbol")))
+        if inst is None:
+            raise ValueError(f"Invalid symbol {p.get('symbol')}")
+        limit = float(p.get("limitPrice") or 0.0) if int(p.get("type", 2)) in _FYERS_LIMIT_TYPES else 0.0
+        order = self.market.place(inst, int(p.get("qty") or 0), 1 if int(p.get("side", 1)) > 0 else -1, limit, str(p.get("productType") or "INTRADAY"), p.get("orderTag"))
+        return {"id": order["order_id"], "message": "Order Submitted Successfully"}
+
+    def _fy_order(self, o: Dict[str, Any]) -> Dict[str, Any]:
+        inst = o["instrument"]
+        return {
+            "id": o["order_id"],
+            "symbol": inst["fyers_symbol"],
+            "qty": o["qty"],
+            "filledQty": o["filled"],
+            "remainingQuantity": o["qty"] - o["filled"],
+            "side": o["side"],
+            "type": 1 if o["limit"] else 2,
+            "limitPrice": o["limit"],
+            "tradedPrice": o["avg_price"],
+            "productType": o["product"],
+            "status": _KITE_STATUS_FYERS.get(o["status"], 6),
+            "orderTag": o["tag"],
+            "orderDateTime": o["time"].strftime("%d-%b-%Y %H:%M:%S"),
+            "exchOrdId": o["order_id"],
+        }
+
+    def _fy_trade(self, t: Dict[str, Any]) -> Dict[str, Any]:
+        o = self.market.orders[t["order_id"]]
+        return {"orderNumber": t["order_id"], "tradeNumber": t["trade_id"], "symbol": o["instrument"]["fyers_symbol"], "tradePrice": t["price"], "tradedQty": t["qty"], "side": o["side"], "productType": o["product"], "orderDateTime": t["time"].strftime("%d-%b-%Y %H:%M:%S")}
+
+    def _fy_position(self, pos: Dict[str, Any]) -> Dict[str, Any]:
+        inst = pos["instrument"]
+        traded = pos["buy_qty"] + pos["sell_qty"]
+        avg = (pos["buy_value"] + pos["sell_value"]) / traded if traded else 0.0
+        return {"symbol": inst["fyers_symbol"], "netQty": pos["qty"], "qty": pos["qty"], "qtyTraded": traded, "buyQty": pos["buy_qty"], "sellQty": pos["sell_qty"], "avgPrice": round(avg, 2), "ltp": self.market.prices[inst["instrument_token"]], "pl": self.market.pnl(pos), "productType": pos["product"]}
+
+    def _fy_quote(self, symbol: str) -> Dict[str, Any]:
+        inst = self.market.resolve(symbol)
+        if inst is None:
+            return {"n": symbol, "s": "error", "v": {"errmsg": "invalid symbol"}}
+        snap = self.market.snapshot(inst["instrument_token"])
+        ltp = snap["last_price"]
+        return {
+            "n": symbol,
+            "s": "ok",
+            "v": {
+                "lp": ltp,
+                "ch": round(ltp - snap["close"], 2),
+                "chp": round((ltp / snap["close"] - 1.0) * 100.0, 2) if snap["close"] else 0.0,
+                "bid": snap["buy"][0][0],
+                "ask": snap["sell"][0][0],
+                "spread": round(snap["sell"][0][0] - snap["buy"][0][0], 2),
+                "open_price": snap["open"],
+                "high_price": snap["high"],
+                "low_price": snap["low"],
+                "prev_close_price": snap["close"],
+                "volume": snap["volume"],
+                "tt": int(time.time()),
+                "symbol": symbol,
+                "fyToken": str(inst["instrument_token"]),
+                "exchange": "NSE",
+                "short_name": inst["tradingsymbol"],
+            },
+        }
+
+    def _fy_depth(self, symbol: str) -> Dict[str, Any]:
+        inst = self.market.resolve(symbol)
+        snap = self.market.snapshot(inst["instrument_token"])  # type: ignore[index]
+        return {
+            "ltp": snap["last_price"],
+            "bids": [{"price": p, "volume": q, "ord": o} for p, q, o in snap["buy"]],
+            "ask": [{"price": p, "volume": q, "ord": o} for p, q, o in snap["sell"]],
+            "totalbuyqty": sum(q for _, q, _ in snap["buy"]),
+            "totalsellqty": sum(q for _, q, _ in snap["sell"]),
+        }
+
+    def _fy_history(self, p: Dict[str, Any]) -> List[List[Any]]:
+        inst = self.market.resolve(str(p.get("symbol")))
+        if inst is None:
+            raise ValueError("Invalid symbol")
+        res = str(p.get("resolution", "D")).upper()
+        seconds = 86400 if res in ("D", "1D") else int(res) * 60
+        if str(p.get("date_format", "0")) == "1":
+            start = datetime.strptime(str(p["range_from"]), "%Y-%m-%d")
+            end = datetime.strptime(str(p["range_to"]), "%Y-%m-%d").replace(hour=23, minute=59)
+        else:
+            start, end = datetime.fromtimestamp(int(p["range_from"])), datetime.fromtimestamp(int(p["range_to"]))
+        with_oi = str(p.get("oi_flag", "0")) == "1"
+        return [list(c) if with_oi else list(c[:6]) for c in self.market.candles(inst["instrument_token"], start, end, seconds)]
+
+    def _fy_master(self, name: str) -> bytes:
+        derivs = name.startswith("NSE_FO")
+        cash = name.startswith("NSE_CM")
+        out = io.StringIO()
+        writer = csv.writer(out)
+        for inst in self.market.instruments:
+            kind = inst["kind"]
+            if not ((derivs and kind in ("FUT", "CE", "PE")) or (cash and kind in ("EQ", "INDEX"))):
+                continue
+            expiry = int(datetime.combine(inst["expiry"], datetime.min.time()).timestamp()) + 52200 if inst["expiry"] else ""
+            writer.writerow([
+                inst["instrument_token"], inst["tradingsymbol"], {"EQ": 0, "INDEX": 10, "FUT": 11}.get(kind, 14),
+                inst["lot_size"], inst["tick_size"], "", "0915-1530|1815-1915:", datetime.now().strftime("%Y-%m-%d"),
+                expiry, inst["fyers_symbol"], 10, 11 if derivs else 10, inst["exchange_token"], inst["name"],
+                inst["exchange_token"], inst["strike"] or -1.0, kind if kind in ("CE", "PE") else "XX", "", "", "", "",
+            ])
+        return out.getvalue().encode("utf-8")
+
+    # Kite Connect
+    def _kite(self, method: str, path: str, p: Dict[str, Any], query: Dict[str, List[str]]) -> Response:
+        m = self.market
+        parts = [x for x in path.split("/") if x]
+        if (method, path) == ("GET", "/user/profile"):
+            return _kt({"user_id": "MK0000", "user_name": "Mock Trader", "email": "mock@example.com", "broker": "ZERODHA", "exchanges": ["NSE", "NFO"], "products": ["CNC", "NRML", "MIS"], "order_types": ["MARKET", "LIMIT", "SL", "SL-M"]})
+        if method == "GET" and parts[:2] == ["user", "margins"]:
+            used = sum(abs(pos["qty"]) * m.prices[t] * 0.2 for t, pos in m.positions.items())
+            equity = {"enabled": True, "net": 1_000_000.0 - used, "available": {"cash": 1_000_000.0, "live_balance": 1_000_000.0 - used, "opening_balance": 1_000_000.0}, "utilised": {"debits": used, "span": used * 0.75, "exposure": used * 0.25}}
+            return _kt(equity if len(parts) == 3 else {"equity": equity, "commodity": {"enabled": False, "net": 0.0}})
+        if (method, path) == ("GET", "/portfolio/positions"):
+            net = [self._kt_position(pos) for pos in m.positions.values()]
+            return _kt({"net": net, "day": net})
+        if (method, path) == ("GET", "/portfolio/holdings"):
+            return _kt([])
+        if (method, path) == ("GET", "/orders"):
+            return _kt([self._kt_order(o) for o in m.orders.values()])
+        if method == "GET" and len(parts) == 2 and parts[0] == "orders":
+            order = m.orders.get(parts[1])
+            return _kt([self._kt_order(order)]) if order else _kt_err("OrderException", "Order not found", 404)
+        if (method, path) == ("GET", "/trades"):
+            return _kt([self._kt_trade(t) for t in m.trades])
+        if parts and parts[0] == "orders" and len(parts) in (2, 3):
+            if method == "POST" and len(parts) == 2:
+                inst = m.resolve(f"{p.get('exchange')}:{p.get('tradingsymbol')}")
+                if inst is None:
+                    return _kt_err("InputException", "Invalid tradingsymbol", 400)
+                limit = float(p.get("price") or 0.0) if p.get("order_type") in ("LIMIT", "SL") else 0.0
+                order = m.place(inst, int(p.get("quantity") or 0), 1 if p.get("transaction_type") == "BUY" else -1, limit, str(p.get("product") or "MIS"), p.get("tag"))
+                return _kt({"order_id": order["order_id"]})
+            if len(parts) == 3 and method in ("PUT", "DELETE"):
+                if method == "PUT":
+                    order = m.modify(parts[2], p.get("quantity"), float(p["price"]) if p.get("price") else None)
+                else:
+                    order = m.cancel(parts[2])
+                return _kt({"order_id": parts[2]}) if order else _kt_err("OrderException", "Order not open", 400)
+        if method == "GET" and parts and parts[0] == "quote":
+            keys = query.get("i", [])
+            mode = parts[1] if len(parts) > 1 else "full"
+            return _kt({k: self._kt_quote(k, mode) for k in keys if m.resolve(k)})
+        if method == "GET" and parts[:2] == ["instruments", "historical"] and len(parts) == 4:
+            return _kt({"candles": self._kt_history(int(parts[2]), parts[3], p)})
+        if method == "GET" and parts and parts[0] == "instruments":
+            return 200, "text/csv", self._kt_instruments(parts[1] if len(parts) > 1 else None)
+        if (method, path) == ("POST", "/margins/orders"):
+            return _kt([self._kt_margin(o) for o in p.get("_body") or []])
+        if (method, path) == ("POST", "/margins/basket"):
+            legs = [self._kt_margin(o) for o in p.get("_body") or []]
+            total = sum(x["total"] for x in legs)
+            return _kt({"initial": {"total": total}, "final": {"total": total}, "orders": legs})
+        return _kt_err("GeneralException", f"Route not found: {method} {path}", 404)
+
+    def _kt_order(self, o: Dict[str, Any]) -> Dict[str, Any]:
+        inst = o["instrument"]
+        return {
+            "order_id": o["order_id"],
+            "exchange_order_id": o["order_id"],
+            "status": o["status"],
+            "tradingsymbol": inst["tradingsymbol"],
+            "exchange": inst["exchange"],
+            "instrument_token": inst["instrument_token"],
+            "transaction_type": "BUY" if o["side"] > 0 else "SELL",
+            "order_type": "LIMIT" if o["limit"] else "MARKET",
+            "product": o["product"],
+            "variety": "regular",
+            "quantity": o["qty"],
+            "filled_quantity": o["filled"],
+            "pending_quantity": o["qty"] - o["filled"],
+            "price": o["limit"],
+            "average_price": o["avg_price"],
+            "tag": o["tag"],
+            "order_timestamp": o["time"].strftime("%Y-%m-%d %H:%M:%S"),
+        }
+
+    def _kt_trade(self, t: Dict[str, Any]) -> Dict[str, Any]:
+        o = self.market.orders[t["order_id"]]
+        inst = o["instrument"]
+        return {"trade_id": t["trade_id"], "order_id": t["order_id"], "tradingsymbol": inst["tradingsymbol"], "exchange": inst["exchange"], "instrument_token": inst["instrument_token"], "transaction_type": "BUY" if o["side"] > 0 else "SELL", "product": o["product"], "average_price": t["price"], "quantity": t["qty"], "fill_timestamp": t["time"].strftime("%Y-%m-%d %H:%M:%S")}
+
+    def _kt_position(self, pos: Dict[str, Any]) -> Dict[str, Any]:
+        inst = pos["instrument"]
+        traded = pos["buy_qty"] + pos["sell_qty"]
+        return {
+            "tradingsymbol": inst["tradingsymbol"],
+            "exchange": inst["exchange"],
+            "instrument_token": inst["instrument_token"],
+            "product": pos["product"],
+            "quantity": pos["qty"],
+            "overnight_quantity": 0,
+            "multiplier": 1,
+            "average_price": round((pos["buy_value"] + pos["sell_value"]) / traded, 2) if traded else 0.0,
+            "last_price": self.market.prices[inst["instrument_token"]],
+            "pnl": self.market.pnl(pos),
+            "buy_quantity": pos["buy_qty"],
+            "sell_quantity": pos["sell_qty"],
+            "buy_value": pos["buy_value"],
+            "sell_value": pos["sell_value"],
+        }
+
+    def _kt_quote(self, key: str, mode: str) -> Dict[str, Any]:
+        inst = self.market.resolve(key)
+        snap = self.market.snapshot(inst["instrument_token"])  # type: ignore[index]
+        out: Dict[str, Any] = {"instrument_token": inst["instrument_token"], "last_price": snap["last_price"]}  # type: ignore[index]
+        if mode == "ltp":
+            return out
+        out["ohlc"] = {k: snap[k] for k in ("open", "high", "low", "close")}
+        if mode == "ohlc":
+            return out
+        now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        out.update({
+            "timestamp": now,
+            "last_trade_time": now,
+            "last_quantity": 1,
+            "average_price": snap["last_price"],
+            "volume": snap["volume"],
+            "buy_quantity": sum(q for _, q, _ in snap["buy"]),
+            "sell_quantity": sum(q for _, q, _ in snap["sell"]),
+            "net_change": round(snap["last_price"] - snap["close"], 2),
+            "oi": 0,
+            "depth": {
+                "buy": [{"price": p, "quantity": q, "orders": o} for p, q, o in snap["buy"]],
+                "sell": [{"price": p, "quantity": q, "orders": o} for p, q, o in snap["sell"]],
+            },
+        })
+        return out
+
+    def _kt_history(self, token: int, interval: str, p: Dict[str, Any]) -> List[List[Any]]:
+        if token not in self.market.by_token:
+            raise ValueError("invalid token")
+        seconds = 86400 if interval == "day" else int(interval.replace("minute", "") or 1) * 60
+
+        def parse(s: str) -> datetime:
+            return datetime.fromisoformat(str(s).strip())
+
+        candles = self.market.candles(token, parse(p["from"]), parse(p["to"]), seconds)
+        with_oi = str(p.get("oi", "0")) == "1"
+        return [[datetime.fromtimestamp(c[0]).strftime("%Y-%m-%dT%H:%M:%S+0530"), *c[1:6], *(c[6:] if with_oi else ())] for c in candles]
+
+    def _kt_instruments(self, exchange: Optional[str]) -> bytes:
+        out = io.StringIO()
+        writer = csv.writer(out)
+        writer.writerow(["instrument_token", "exchange_token", "tradingsymbol", "name", "last_price", "expiry", "strike", "tick_size", "lot_size", "instrument_type", "segment", "exchange"])
+        for inst in self.market.instruments:
+            if exchange and inst["exchange"] != exchange:
+                continue
+            kind = inst["kind"]
+            segment = "INDICES" if kind == "INDEX" else (f"NFO-{'FUT' if kind == 'FUT' else 'OPT'}" if inst["exchange"] == "NFO" else inst["exchange"])
+            writer.writerow([
+                inst["instrument_token"], inst["exchange_token"], inst["tradingsymbol"], inst["name"], 0.0,
+                inst["expiry"].isoformat() if inst["expiry"] else "", inst["strike"], inst["tick_size"], inst["lot_size"],
+                "EQ" if kind == "INDEX" else kind, segment, inst["exchange"],
+            ])
+        return out.getvalue().encode("utf-8")
+
+    def _kt_margin(self, o: Dict[str, Any]) -> Dict[str, Any]:
+        total = self._margin(f"{o.get('exchange')}:{o.get('tradingsymbol')}", o.get("quantity"))
+        return {"type": "equity", "tradingsymbol": o.get("tradingsymbol"), "exchange": o.get("exchange"), "span": total * 0.75, "exposure": total * 0.25, "total": total}
+
+    def _margin(self, symbol: Any, qty: Any) -> float:
+        inst = self.market.resolve(str(symbol))
+        if inst is None:
+            return 0.0
+        return round(abs(int(qty or 0)) * self.market.prices[inst["instrument_token"]] * 0.2, 2)
+
+    # --- Kite ticker websocket ---
+    def _serve_kite_ws(self, handler: BaseHTTPRequestHandler) -> None:
+        key = handler.headers.get("Sec-WebSocket-Key", "")
+        handler.send_response(101, "Switching Protocols")
+        handler.send_header("Upgrade", "websocket")
+        handler.send_header("Connection", "Upgrade")
+        handler.send_header("Sec-WebSocket-Accept", wsproto.accept_key(key))
+        handler.end_headers()
+        handler.wfile.flush()
+        self._count("ws_connections")
+
+        modes: Dict[int, str] = {}
+        lock = threading.Lock()
+        closed = threading.Event()
+
+        def send(payload: bytes, opcode: int = wsproto.OP_BINARY) -> None:
+            with lock:
+                handler.wfile.write(wsproto.encode_frame(payload, opcode))
+                handler.wfile.flush()
+
+        def reader() -> None:
+            try:
+                while not closed.is_set():
+                    frame = wsproto.read_frame(handler.rfile)
+                    if frame is None or frame[0] == wsproto.OP_CLOSE:
+                        break
+                    opcode, data = frame
+                    if opcode == wsproto.OP_PING:
+                        send(data, wsproto.OP_PONG)
+                    elif opcode == wsproto.OP_TEXT:
+                        self._kite_ws_command(json.loads(data), modes, lock)
+            except Exception:
+                logger.debug("Mock websocket reader stopped", exc_info=True)
+            finally:
+                closed.set()
+
+        threading.Thread(target=reader, name="broker-mock-ws", daemon=True).start()
+        interval = 1.0 / max(self.config.tick_hz, 0.001)
+        try:
+            while not closed.wait(interval) and not self._stopping.is_set():
+                with lock:
+                    subs = dict(modes)
+                if not subs:
+                    continue
+                self.market.step(list(subs))
+                ts = int(time.time())
+                packets = [
+                    wsproto.kite_packet(tok, self.market.snapshot(tok), mode, self.market.by_token[tok]["kind"] != "INDEX", ts)
+                    for tok, mode in subs.items()
+                ]
+                send(wsproto.kite_message(packets))
+                self._count("ws_frames")
+                self._count("ws_packets", len(packets))
+        except Exception:
+            logger.debug("Mock websocket writer stopped", exc_info=True)
+        finally:
+            closed.set()
+            handler.close_connection = True
+
+    def _kite_ws_command(self, msg: Dict[str, Any], modes: Dict[int, str], lock: threading.Lock) -> None:
+        action, value = msg.get("a"), msg.get("v")
+        with lock:
+            if action == "subscribe":
+                for tok in value or []:
+                    if int(tok) in self.market.by_token:
+                        modes.setdefault(int(tok), wsproto.MODE_QUOTE)
+            elif action == "unsubscribe":
+                for tok in value or []:
+                    modes.pop(int(tok), None)
+            elif action == "mode" and isinstance(value, list) and len(value) == 2:
+                for tok in value[1] or []:
+                    if int(tok) in modes:
+                        modes[int(tok)] = str(value[0])
+
+
+def _json(status: int, payload: Any) -> Response:
+    return status, _JSON, dumps(payload)
+
+
+def _fy(payload: Dict[str, Any], code: int = 200) -> Response:
+    return _json(200, {"s": "ok", "code": code, "message": "", **payload})
+
+
+def _fy_err(code: int, message: str, status: int = 400) -> Response:
+    return _json(status, {"s": "error", "code": code, "message": message})
+
+
+def _kt(data: Any) -> Response:
+    return _json(200, {"status": "success", "data": data})
+
+
+def _kt_err(error_type: str, message: str, status: int) -> Response:
+    return _json(status, {"status": "error", "error_type": error_type, "message": message, "data": None})
+
+
+# --- Pointing the drivers at a mock ---
+MOCK_HOSTS = ("api-t1.fyers.in", "api.fyers.in", "public.fyers.in", "api.kite.trade")
+
+
+class _RoutedSessionManager(SessionManager):
+    """Rewrites broker hosts to the mock before delegating to the pooled sessions."""
+
+    def __init__(self, base_url: str, **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+        self.base_url = base_url.rstrip("/")
+
+    def request(self, method: str, url: str, **kwargs: Any) -> Any:
+        parts = urlsplit(url)
+        if parts.hostname in MOCK_HOSTS:
+            url = self.base_url + parts.path + (f"?{parts.query}" if parts.query else "")
+        return super().request(method, url, **kwargs)
+
+
+def use_mock_server(base_url: str) -> None:
+    """Send SDK, HTTP and Kite ticker traffic to the mock at ``base_url``.
+
+    Patches the SDK endpoint constants when the SDKs are importable and swaps the
+    process-wide session manager for one that rewrites the broker hosts. Call it
+    before the driver is created.
+    """
+    base = base_url.rstrip("/")
+    try:  # pragma: no cover - optional dependency
+        from fyers_apiv3 import fyersModel  # type: ignore
+
+        cfg = getattr(fyersModel, "Config", None)
+        if cfg is not None:
+            if hasattr(cfg, "API"):
+                cfg.API = f"{base}/api/v3"
+            if hasattr(cfg, "DATA_API"):
+                cfg.DATA_API = f"{base}/data"
+    except Exception:
+        pass
+    try:  # pragma: no cover - optional dependency
+        from kiteconnect import KiteConnect, KiteTicker  # type: ignore
+
+        if hasattr(KiteConnect, "_default_root_uri"):
+            KiteConnect._default_root_uri = base
+        if hasattr(KiteTicker, "ROOT_URI"):
+            KiteTicker.ROOT_URI = base.replace("http", "ws", 1)
+    except Exception:
+        pass
+    current = get_session_manager()
+    set_session_manager(_RoutedSessionManager(
+        base,
+        pool_connections=current.pool_connections,
+        pool_maxsize=current.pool_maxsize,
+        retries=current.retries,
+        backoff_factor=current.backoff_factor,
+        timeout=current.timeout,
+    ))
+    logger.info("Broker traffic routed to mock server at %s", base)
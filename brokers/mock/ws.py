@@ -0,0 +1,87 @@
+"""Minimal server-side WebSocket (RFC 6455) framing and Kite ticker packets."""
+
+from __future__ import annotations
+
+import base64
+import hashlib
+import struct
+from typing import Any, Dict, List, Optional, Tuple
+
+
+_GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+
+OP_TEXT = 0x1
+OP_BINARY = 0x2
+OP_CLOSE = 0x8
+OP_PING = 0x9
+OP_PONG = 0xA
+
+
+def accept_key(client_key: str) -> str:
+    return base64.b64encode(hashlib.sha1((client_key + _GUID).encode("ascii")).digest()).decode("ascii")
+
+
+def encode_frame(payload: bytes, opcode: int = OP_BINARY) -> bytes:
+    """Unmasked, unfragmented server frame."""
+    n = len(payload)
+    if n < 126:
+        header = struct.pack("!BB", 0x80 | opcode, n)
+    elif n < 1 << 16:
+        header = struct.pack("!BBH", 0x80 | opcode, 126, n)
+    else:
+        header = struct.pack("!BBQ", 0x80 | opcode, 127, n)
+    return header + payload
+
+
+def read_frame(rfile: Any) -> Optional[Tuple[int, bytes]]:
+    """Read one client frame as ``(opcode, payload)``; None on EOF."""
+    head = rfile.read(2)
+    if len(head) < 2:
+        return None
+    opcode = head[0] & 0x0F
+    masked = head[1] & 0x80
+    n = head[1] & 0x7F
+    if n == 126:
+        n = struct.unpack("!H", rfile.read(2))[0]
+    elif n == 127:
+        n = struct.unpack("!Q", rfile.read(8))[0]
+    mask = rfile.read(4) if masked else b""
+    data = rfile.read(n)
+    if masked:
+        data = bytes(b ^ mask[i % 4] for i, b in enumerate(data))
+    return opcode, data
+
+
+# --- Kite ticker binary packets (prices in paise, big-endian int32) ---
+MODE_LTP = "ltp"
+MODE_QUOTE = "quote"
+MODE_FULL = "full"
+
+
+def _paise(x: float) -> int:
+    return int(round(x * 100))
+
+
+def kite_packet(token: int, snap: Dict[str, Any], mode: str, tradable: bool, ts: int) -> bytes:
+    """One instrument packet: 8 bytes (ltp), 28/32 (index quote/full), 44 (quote) or 184 (full)."""
+    ltp = _paise(snap["last_price"])
+    if mode == MODE_LTP:
+        return struct.pack(">ii", token, ltp)
+    ohlc = (_paise(snap["high"]), _paise(snap["low"]), _paise(snap["open"]), _paise(snap["close"]))
+    if not tradable:
+        change = ltp - ohlc[3]
+        base = struct.pack(">iiiiiii", token, ltp, *ohlc, change)
+        return base + struct.pack(">i", ts) if mode == MODE_FULL else base
+    buy_qty = sum(q for _, q, _ in snap["buy"])
+    sell_qty = sum(q for _, q, _ in snap["sell"])
+    quote = struct.pack(">iiiiiiiiiii", token, ltp, 1, ltp, snap["volume"], buy_qty, sell_qty, ohlc[2], ohlc[0], ohlc[1], ohlc[3])
+    if mode == MODE_QUOTE:
+        return quote
+    extra = struct.pack(">iiiii", ts, 0, 0, 0, ts)
+    depth = b"".join(struct.pack(">iihxx", q, _paise(p), o) for p, q, o in snap["buy"] + snap["sell"])
+    return quote + extra + depth
+
+
+def kite_message(packets: List[bytes]) -> bytes:
+    """Frame body: packet count then ``(length, packet)`` pairs."""
+    return struct.pack(">H", len(packets)) + b"".join(struct.pack(">H", len(p)) + p for p in packets)
@@ -1,7 +1,41 @@
-"""Networking helpers: rate limiter and HTTP client wrappers."""
-
-from .ratelimiter import rate_limited, rate_limited_fyers
-
-__all__ = ["rate_limited", "rate_limited_fyers"]
+"""Networking helpers: rate limiter, request batching, pooled HTTP sessions, keep-alive, record/replay and client wrappers."""
 
+from .batching import MicroBatcher, SingleFlight, chunked, map_concurrent
+from .keepalive import KeepAlive, in_market_hours
+from .replay import Cassette, TickPlayer, install_recorder, install_replay, lognormal_latency
+from .ratelimiter import (
+    AccountRateLimiter,
+    Priority,
+    TokenBucket,
+    account_limiter,
+    history_bucket,
+    quote_bucket,
+    rate_limited,
+    rate_limited_fyers,
+)
+from .session import SessionManager, get_session_manager, set_session_manager
 
+__all__ = [
+    "AccountRateLimiter",
+    "Priority",
+    "account_limiter",
+    "KeepAlive",
+    "in_market_hours",
+    "MicroBatcher",
+    "SingleFlight",
+    "TokenBucket",
+    "chunked",
+    "history_bucket",
+    "map_concurrent",
+    "quote_bucket",
+    "rate_limited",
+    "rate_limited_fyers",
+    "Cassette",
+    "TickPlayer",
+    "install_recorder",
+    "install_replay",
+    "lognormal_latency",
+    "SessionManager",
+    "get_session_manager",
+    "set_session_manager",
+]
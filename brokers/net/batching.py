@@ -0,0 +1,233 @@
+from __future__ import annotations
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import threading
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Tuple, TypeVar
+
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+# Upper bound on concurrent batch requests issued for one call
+BATCH_MAX_WORKERS = 8
+
+
+def chunked(items: Sequence[T], size: int) -> List[List[T]]:
+    """Split ``items`` into consecutive lists of at most ``size`` elements."""
+    size = max(1, int(size))
+    return [list(items[i : i + size]) for i in range(0, len(items), size)]
+
+
+def map_concurrent(fn: Callable[[T], R], items: Sequence[T], max_workers: int = BATCH_MAX_WORKERS) -> List[R]:
+    """Apply ``fn`` to each item on a short-lived thread pool, preserving order.
+
+    A single item runs inline so the common small call pays no pool overhead.
+    """
+    if len(items) <= 1:
+        return [fn(x) for x in items]
+    with ThreadPoolExecutor(max_workers=min(len(items), max_workers)) as pool:
+        return list(pool.map(fn, items))
+
+
+class _Batch:
+    __slots__ = ("keys", "enqueued", "done", "results", "error")
+
+    def __init__(self) -> None:
+        self.keys: Dict[Any, None] = {}
+        self.enqueued: List[float] = []
+        self.done = threading.Event()
+        self.results: Dict[Any, Any] = {}
+        self.error: Optional[BaseException] = None
+
+
+class MicroBatcher:
+    """Coalesce single-key lookups from many threads into one batched call.
+
+    The first caller opens a batch and waits up to ``window`` seconds (or until
+    ``max_batch`` keys are queued); every caller arriving meanwhile joins it. The
+    opener then runs ``fn(keys)`` once and all callers pick their value from the
+    returned dict (``None`` when the key is absent). Errors from ``fn`` are
+    re-raised in every waiting caller.
+    """
+
+    def __init__(self, fn: Callable[[List[Any]], Dict[Any, Any]], *, window: float = 0.003, max_batch: int = 50) -> None:
+        self.fn = fn
+        self.window = float(window)
+        self.max_batch = max(1, int(max_batch))
+        self._cond = threading.Condition()
+        self._pending: Optional[_Batch] = None
+        # Metrics
+        self.batches = 0
+        self.requests = 0
+        self.max_batch_seen = 0
+        self._delay_sum = 0.0
+        self.max_delay = 0.0
+
+    def submit(self, key: Any) -> Any:
+        with self._cond:
+            batch = self._pending
+            leader = batch is None
+            if leader:
+                batch = self._pending = _Batch()
+            batch.keys[key] = None
+            batch.enqueued.append(time.monotonic())
+            if len(batch.keys) >= self.max_batch:
+                self._pending = None
+                self._cond.notify_all()
+            if leader:
+                self._cond.wait_for(lambda: self._pending is not batch, timeout=self.window)
+                if self._pending is batch:
+                    self._pending = None
+        if leader:
+            self._dispatch(batch)
+        else:
+            batch.done.wait()
+        if batch.error is not None:
+            raise batch.error
+        return batch.results.get(key)
+
+    def _dispatch(self, batch: _Batch) -> None:
+        started = time.monotonic()
+        delays = [started - t for t in batch.enqueued]
+        with self._cond:
+            self.batches += 1
+            self.requests += len(delays)
+            self.max_batch_seen = max(self.max_batch_seen, len(batch.keys))
+            self._delay_sum += sum(delays)
+            self.max_delay = max(self.max_delay, max(delays))
+        try:
+            batch.results = self.fn(list(batch.keys)) or {}
+        except BaseException as e:  # propagate to every waiter, not just the leader
+            batch.error = e
+        finally:
+            batch.done.set()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            return {
+                "batches": self.batches,
+                "requests": self.requests,
+                "avg_batch_size": (self.requests / self.batches) if self.batches else 0.0,
+                "max_batch_size": self.max_batch_seen,
+                "avg_queue_delay_ms": (self._delay_sum / self.requests * 1000.0) if self.requests else 0.0,
+                "max_queue_delay_ms": self.max_delay * 1000.0,
+                "window_ms": self.window * 1000.0,
+            }
+
+
+class _Call:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """Share one in-flight call (and optionally its result for ``ttl`` seconds) per key.
+
+    Concurrent ``do(key, fn)`` calls with the same key run ``fn`` once; the others
+    wait and receive the same object, so callers must treat it as read-only.
+    ``invalidate`` also detaches calls already in flight: later callers start a
+    fresh call, and the detached result is returned to its waiters but not cached.
+    """
+
+    def __init__(self, ttl: float = 0.0) -> None:
+        self.ttl = float(ttl)
+        self._lock = threading.Lock()
+        self._inflight: Dict[Any, _Call] = {}
+        self._results: Dict[Any, Any] = {}
+        self._generation = 0
+        # Metrics
+        self.calls = 0
+        self.executed = 0
+        self.shared = 0
+        self.cached = 0
+
+    def _join(self, key: Any) -> Tuple[Optional[_Call], bool, int]:
+        """(call, leader, generation); a fresh cached result comes back as an already completed call."""
+        with self._lock:
+            self.calls += 1
+            if self.ttl > 0 and key in self._results:
+                stamp, value = self._results[key]
+                if time.monotonic() - stamp < self.ttl:
+                    self.cached += 1
+                    call = _Call()
+                    call.result = value
+                    call.done.set()
+                    return call, False, self._generation
+            call = self._inflight.get(key)
+            leader = call is None
+            if leader:
+                call = self._inflight[key] = _Call()
+                self.executed += 1
+            else:
+                self.shared += 1
+            return call, leader, self._generation
+
+    def _finish(self, key: Any, call: _Call, generation: int) -> None:
+        with self._lock:
+            if self._inflight.get(key) is call:
+                self._inflight.pop(key)
+            # A call started before invalidate() may have read pre-change state
+            if self.ttl > 0 and call.error is None and generation == self._generation:
+                self._results[key] = (time.monotonic(), call.result)
+        call.done.set()
+
+    @staticmethod
+    def _outcome(call: _Call) -> Any:
+        if call.error is not None:
+            raise call.error
+        return call.result
+
+    def do(self, key: Any, fn: Callable[[], R]) -> R:
+        call, leader, generation = self._join(key)
+        if not leader:
+            call.done.wait()
+        else:
+            try:
+                call.result = fn()
+            except BaseException as e:
+                call.error = e
+            finally:
+                self._finish(key, call, generation)
+        return self._outcome(call)
+
+    async def do_async(self, key: Any, fn: Callable[[], Awaitable[R]]) -> R:
+        """``do`` for coroutine functions; shares calls and results with threaded callers."""
+        call, leader, generation = self._join(key)
+        if not leader:
+            if not call.done.is_set():
+                await asyncio.get_running_loop().run_in_executor(None, call.done.wait)
+        else:
+            try:
+                call.result = await fn()
+            except BaseException as e:
+                call.error = e
+            finally:
+                self._finish(key, call, generation)
+        return self._outcome(call)
+
+    def invalidate(self, key: Any = None) -> None:
+        """Drop cached results and detach in-flight calls (all keys when ``key`` is None)."""
+        with self._lock:
+            self._generation += 1
+            if key is None:
+                self._results.clear()
+                self._inflight.clear()
+            else:
+                self._results.pop(key, None)
+                self._inflight.pop(key, None)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "calls": self.calls,
+                "executed": self.executed,
+                "shared": self.shared,
+                "cached": self.cached,
+                "ttl": self.ttl,
+            }
@@ -1,39 +1,110 @@
 from __future__ import annotations
 
-from typing import Any, Dict, Optional
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
 
+from ..codec import dumps, loads
 from ..core.errors import HTTPError
+from ..logging import get_logger
+from .session import get_session_manager
 
 
-DEFAULT_TIMEOUT = 15
-
+logger = get_logger(__name__)
 
-def _requests():  # lazy import to avoid hard dependency if unused
-    try:  # pragma: no cover - optional dependency
-        import requests  # type: ignore
-
-        return requests
-    except Exception as e:  # pragma: no cover
-        raise HTTPError("'requests' is required for HTTP operations") from e
+DEFAULT_TIMEOUT = 15
 
 
 def get_json(url: str, *, headers: Optional[Dict[str, str]] = None, params: Optional[Dict[str, Any]] = None, timeout: int = DEFAULT_TIMEOUT) -> Dict[str, Any]:
-    requests = _requests()
     try:
-        r = requests.get(url, headers=headers, params=params, timeout=timeout)
+        r = get_session_manager().get(url, headers=headers, params=params, timeout=timeout)
         r.raise_for_status()
-        return r.json()
+        return loads(r.content)
     except Exception as e:  # noqa: BLE001
         raise HTTPError(f"GET {url} failed: {e}") from e
 
 
 def post_json(url: str, *, headers: Optional[Dict[str, str]] = None, json: Optional[Dict[str, Any]] = None, timeout: int = DEFAULT_TIMEOUT) -> Dict[str, Any]:
-    requests = _requests()
     try:
-        r = requests.post(url, headers=headers, json=json, timeout=timeout)
+        body = None
+        if json is not None:
+            # Encode once with the fast codec instead of requests' stdlib json=
+            body = dumps(json)
+            headers = {"Content-Type": "application/json", **(headers or {})}
+        r = get_session_manager().post(url, headers=headers, data=body, timeout=timeout)
         r.raise_for_status()
-        return r.json()
+        return loads(r.content)
     except Exception as e:  # noqa: BLE001
         raise HTTPError(f"POST {url} failed: {e}") from e
 
 
+def write_atomic(path: str, data: bytes) -> None:
+    """Replace ``path`` with ``data`` in one rename; on failure the tmp file is removed and the error re-raised."""
+    # Per-process/thread tmp name so concurrent writers never share a partial file
+    tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        raise
+
+
+def download_cached(
+    url: str,
+    path: str,
+    *,
+    fresh: Optional[Callable[[float], bool]] = None,
+    timeout: int = 30,
+) -> Tuple[str, bool, bool]:
+    """Download ``url`` to ``path``, revalidating with ETag / If-Modified-Since.
+
+    A ``<path>.meta`` sidecar keeps the validators and the fetch time. When
+    ``fresh(fetched_at)`` is true, the cached file is used without any request.
+    A 304 only refreshes the fetch time. Returns ``(path, changed, stale)``. If
+    the request fails but a cached copy exists, that copy is returned with
+    ``stale`` set and a warning logged; its fetch time is left alone, so the
+    next call tries the download again.
+    """
+    meta_path = f"{path}.meta"
+    meta: Dict[str, Any] = {}
+    if os.path.exists(path) and os.path.exists(meta_path):
+        try:
+            with open(meta_path, "rb") as f:
+                meta = loads(f.read())
+        except Exception:
+            meta = {}
+    if meta and fresh is not None and fresh(float(meta.get("fetched", 0.0))):
+        return path, False, False
+
+    headers: Dict[str, str] = {}
+    if meta.get("etag"):
+        headers["If-None-Match"] = meta["etag"]
+    if meta.get("last_modified"):
+        headers["If-Modified-Since"] = meta["last_modified"]
+    try:
+        r = get_session_manager().get(url, headers=headers, timeout=timeout)
+        if r.status_code != 304:
+            r.raise_for_status()
+    except Exception as e:  # noqa: BLE001
+        if meta:
+            fetched = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(float(meta.get("fetched", 0.0))))
+            logger.warning("GET %s failed (%s); using the cached copy fetched at %s", url, e, fetched)
+            return path, False, True
+        raise HTTPError(f"GET {url} failed: {e}") from e
+
+    changed = r.status_code != 304
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    if changed:
+        write_atomic(path, r.content)
+        meta = {"etag": r.headers.get("ETag"), "last_modified": r.headers.get("Last-Modified")}
+    meta["fetched"] = time.time()
+    write_atomic(meta_path, dumps(meta))
+    return path, changed, False
@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+from datetime import datetime, time as dtime, timedelta, timezone
+import threading
+from typing import Any, Callable, Optional, Tuple
+
+from ..logging import get_logger
+
+
+logger = get_logger(__name__)
+
+IST = timezone(timedelta(hours=5, minutes=30))
+DEFAULT_INTERVAL = 30.0
+# Slightly wider than the 09:15-15:30 session so pre-open orders find warm connections
+DEFAULT_HOURS: Tuple[dtime, dtime] = (dtime(9, 0), dtime(15, 35))
+
+
+def in_market_hours(now: Optional[datetime] = None, hours: Tuple[dtime, dtime] = DEFAULT_HOURS) -> bool:
+    """True on weekdays between ``hours`` (IST)."""
+    now = (now or datetime.now(IST)).astimezone(IST)
+    return now.weekday() < 5 and hours[0] <= now.time() <= hours[1]
+
+
+def parse_hours(spec: Optional[str]) -> Tuple[dtime, dtime]:
+    """Parse ``"HH:MM-HH:MM"``; falls back to DEFAULT_HOURS."""
+    try:
+        start, end = (datetime.strptime(x.strip(), "%H:%M").time() for x in (spec or "").split("-", 1))
+        return start, end
+    except Exception:
+        return DEFAULT_HOURS
+
+
+class KeepAlive:
+    """Daemon thread calling ``ping`` every ``interval`` seconds during market hours.
+
+    Idle pooled connections are otherwise dropped by servers and middleboxes,
+    leaving the next order to pay DNS/TCP/TLS again.
+    """
+
+    def __init__(
+        self,
+        ping: Callable[[], Any],
+        interval: float = DEFAULT_INTERVAL,
+        *,
+        hours: Optional[Tuple[dtime, dtime]] = DEFAULT_HOURS,
+    ) -> None:
+        self.ping = ping
+        self.interval = float(interval)
+        self.hours = hours  # None = ping around the clock
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> "KeepAlive":
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="broker-keepalive", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            if self.hours is not None and not in_market_hours(hours=self.hours):
+                continue
+            try:
+                self.ping()
+            except Exception:
+                logger.debug("Keep-alive ping failed", exc_info=True)
@@ -1,6 +1,14 @@
 from __future__ import annotations
 
-from typing import Any, Callable, Optional, TypeVar, cast
+import asyncio
+from collections import deque
+from enum import IntEnum
+from functools import wraps
+import heapq
+import itertools
+import threading
+import time
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple, TypeVar, cast
 
 
 F = TypeVar("F", bound=Callable[..., Any])
@@ -36,9 +44,271 @@ def rate_limited(
     return decorator
 
 
-def rate_limited_fyers() -> Callable[[F], F]:
-    """Preconfigured rate limiter for Fyers API calls."""
+class TokenBucket:
+    """Thread-safe token bucket shared by every caller of a broker endpoint family.
 
-    return rate_limited(calls_per_second=9, calls_per_minute=195, calls_per_day=99900)
+    ``acquire`` reserves a token and sleeps until it becomes valid, so concurrent
+    callers are paced at ``rate`` calls per second instead of a fixed sleep.
+    """
 
+    def __init__(self, rate: float, capacity: Optional[float] = None) -> None:
+        self.rate = float(rate)
+        self.capacity = float(capacity if capacity is not None else rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
 
+    def _reserve(self, tokens: float = 1.0) -> float:
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= tokens
+            return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+    def acquire(self, tokens: float = 1.0) -> None:
+        wait = self._reserve(tokens)
+        if wait > 0:
+            time.sleep(wait)
+
+    async def acquire_async(self, tokens: float = 1.0) -> None:
+        wait = self._reserve(tokens)
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+
+# Historical-data request budgets (calls per second), kept just under broker limits
+HISTORY_RATE_LIMITS: Dict[str, float] = {
+    "fyers": 9,
+    "zerodha": 3,
+}
+
+_history_buckets: Dict[str, TokenBucket] = {}
+_history_buckets_lock = threading.Lock()
+
+
+def history_bucket(broker: str) -> Optional[TokenBucket]:
+    """Return the process-wide history bucket for a broker, or None if unlimited."""
+
+    key = (broker or "").lower()
+    rate = HISTORY_RATE_LIMITS.get(key)
+    if rate is None:
+        return None
+    with _history_buckets_lock:
+        bucket = _history_buckets.get(key)
+        if bucket is None:
+            bucket = _history_buckets[key] = TokenBucket(rate)
+        return bucket
+
+
+# Quote-endpoint budgets (requests per second) for brokers that limit quotes below
+# the account-wide window; Kite allows one /quote request per second
+QUOTE_RATE_LIMITS: Dict[str, float] = {
+    "zerodha": 1,
+}
+
+_quote_buckets: Dict[str, TokenBucket] = {}
+_quote_buckets_lock = threading.Lock()
+
+
+def quote_bucket(broker: str) -> Optional[TokenBucket]:
+    """Return the process-wide quote bucket for a broker, or None if only the account limit applies."""
+
+    key = (broker or "").lower()
+    rate = QUOTE_RATE_LIMITS.get(key)
+    if rate is None:
+        return None
+    with _quote_buckets_lock:
+        bucket = _quote_buckets.get(key)
+        if bucket is None:
+            bucket = _quote_buckets[key] = TokenBucket(rate)
+        return bucket
+
+
+class Priority(IntEnum):
+    """Queue lanes for the account limiter; lower values are served first."""
+
+    ORDER = 0  # place/modify/cancel
+    NORMAL = 1  # quotes, account reads, margins
+    BULK = 2  # history backfills and other bulk jobs
+
+
+class _Window:
+    """Sliding-window log: admission times of the calls made in the last ``period`` seconds."""
+
+    __slots__ = ("name", "limit", "period", "calls")
+
+    def __init__(self, name: str, limit: int, period: float) -> None:
+        self.name = name
+        self.limit = int(limit)
+        self.period = float(period)
+        self.calls: Deque[float] = deque()
+
+    def expire(self, now: float) -> None:
+        cutoff = now - self.period
+        calls = self.calls
+        while calls and calls[0] <= cutoff:
+            calls.popleft()
+
+    def remaining(self) -> int:
+        return max(0, self.limit - len(self.calls))
+
+    def wait_time(self, now: float) -> float:
+        """Seconds until the oldest logged call leaves the window (0 when there is room)."""
+        if len(self.calls) < self.limit:
+            return 0.0
+        return self.calls[len(self.calls) - self.limit] + self.period - now
+
+
+WINDOW_PERIODS = {"second": 1.0, "minute": 60.0, "day": 86400.0}
+
+# Poll interval for asyncio waiters queued behind another caller
+_ASYNC_POLL = 0.005
+
+
+class AccountRateLimiter:
+    """Process-wide limiter enforcing several windows (per second/minute/day) at once.
+
+    Every window is a sliding-window log, so no ``period``-long span ever admits
+    more than its limit; a call proceeds only when all windows have room. One
+    ``acquire`` covers one HTTP request. Waiters queue by ``Priority`` (FIFO
+    within a lane), so order calls overtake queued quote/history backfills. Usable from threads
+    (``acquire``) and asyncio (``acquire_async``).
+    """
+
+    def __init__(self, limits: Dict[str, int]) -> None:
+        self.windows: List[_Window] = [
+            _Window(name, limit, WINDOW_PERIODS[name]) for name, limit in limits.items() if limit
+        ]
+        self._cond = threading.Condition()
+        self._queue: List[Tuple[int, int]] = []
+        self._seq = itertools.count()
+
+    def _enqueue(self, priority: Priority) -> Tuple[int, int]:
+        ticket = (int(priority), next(self._seq))
+        heapq.heappush(self._queue, ticket)
+        return ticket
+
+    def _drop(self, ticket: Tuple[int, int]) -> None:
+        try:
+            self._queue.remove(ticket)
+            heapq.heapify(self._queue)
+        except ValueError:
+            pass
+        self._cond.notify_all()
+
+    def _try_take(self, ticket: Tuple[int, int]) -> Optional[float]:
+        """Log a call for ``ticket`` if it heads the queue; else return the wait (None = not head)."""
+        if self._queue[0] != ticket:
+            return None
+        now = time.monotonic()
+        wait = 0.0
+        for w in self.windows:
+            w.expire(now)
+            wait = max(wait, w.wait_time(now))
+        if wait > 0:
+            return wait
+        for w in self.windows:
+            w.calls.append(now)
+        heapq.heappop(self._queue)
+        self._cond.notify_all()
+        return 0.0
+
+    def acquire(self, priority: Priority = Priority.NORMAL) -> None:
+        with self._cond:
+            ticket = self._enqueue(priority)
+            try:
+                while True:
+                    wait = self._try_take(ticket)
+                    if wait == 0.0:
+                        return
+                    self._cond.wait(wait)
+            except BaseException:
+                self._drop(ticket)
+                raise
+
+    async def acquire_async(self, priority: Priority = Priority.NORMAL) -> None:
+        with self._cond:
+            ticket = self._enqueue(priority)
+        try:
+            while True:
+                with self._cond:
+                    wait = self._try_take(ticket)
+                if wait == 0.0:
+                    return
+                await asyncio.sleep(_ASYNC_POLL if wait is None else wait)
+        except BaseException:
+            with self._cond:
+                self._drop(ticket)
+            raise
+
+    def headroom(self) -> Dict[str, Any]:
+        """Calls still available right now per window, plus the queue depth."""
+        with self._cond:
+            now = time.monotonic()
+            out: Dict[str, Any] = {}
+            for w in self.windows:
+                w.expire(now)
+                out[w.name] = {"remaining": w.remaining(), "limit": w.limit}
+            out["queued"] = len(self._queue)
+            return out
+
+    def remaining(self) -> int:
+        """Calls that can be made immediately without waiting (min across windows)."""
+        head = self.headroom()
+        return min((v["remaining"] for k, v in head.items() if k != "queued"), default=0)
+
+
+# Account-wide request budgets, kept just under each broker's published limits
+ACCOUNT_RATE_LIMITS: Dict[str, Dict[str, int]] = {
+    "fyers": {"second": 9, "minute": 195, "day": 99900},
+    "zerodha": {"second": 9},
+}
+
+_account_limiters: Dict[Tuple[str, str], AccountRateLimiter] = {}
+_account_limiters_lock = threading.Lock()
+
+
+def account_limiter(broker: str, account: Optional[str] = None) -> Optional[AccountRateLimiter]:
+    """Return the process-wide limiter for ``(broker, account)``, or None when unlimited.
+
+    ``account`` defaults to BROKER_ID. Set BROKER_RATE_LIMIT=false to disable, or
+    override windows with BROKER_RATE_LIMIT_PER_SECOND/_PER_MINUTE/_PER_DAY.
+    """
+    from ..config import getenv, getenv_bool
+
+    if not getenv_bool("BROKER_RATE_LIMIT", True):
+        return None
+    key = ((broker or "").lower(), account or getenv("BROKER_ID") or "default")
+    with _account_limiters_lock:
+        limiter = _account_limiters.get(key)
+        if limiter is None:
+            limits = dict(ACCOUNT_RATE_LIMITS.get(key[0], {}))
+            for name in WINDOW_PERIODS:
+                override = getenv(f"BROKER_RATE_LIMIT_PER_{name.upper()}")
+                if override:
+                    limits[name] = int(override)
+            if not any(limits.values()):
+                return None
+            limiter = _account_limiters[key] = AccountRateLimiter(limits)
+        return limiter
+
+
+def rate_limited_fyers(priority: Priority = Priority.NORMAL) -> Callable[[F], F]:
+    """Decorator drawing each call from the shared Fyers account budget (``account_limiter("fyers")``).
+
+    Kept for callers of the old per-function limiter; new code should go through
+    the gateway, which already paces every REST call against the same budget.
+    """
+
+    def decorator(func: F) -> F:
+        @wraps(func)
+        def wrapped(*args: Any, **kwargs: Any) -> Any:
+            limiter = account_limiter("fyers")
+            if limiter is not None:
+                limiter.acquire(priority)
+            return func(*args, **kwargs)
+
+        return cast(F, wrapped)
+
+    return decorator
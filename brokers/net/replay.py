@@ -0,0 +1,507 @@
+"""Record/replay transport for offline benchmarking of the real drivers.
+
+Recording wraps a driver's SDK client (``FyersModel``/``KiteConnect``), the
+pooled HTTP session manager and websocket callbacks. Every exchange goes to a
+gzip'd JSON-lines *cassette*. Replay serves the same responses from the
+cassette, with no network or credentials. Latency can be the recorded one, a
+fixed or synthetic one, or none.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import base64
+from collections import defaultdict, deque
+from datetime import date, datetime
+import gzip
+import inspect
+import json
+import math
+import random
+import threading
+import time
+from typing import Any, Callable, Deque, Dict, Iterable, List, Optional, Tuple, Union
+
+from ..codec import dumps, loads
+from ..core.errors import BrokerError
+from ..logging import get_logger
+from .session import SessionManager
+
+
+logger = get_logger(__name__)
+
+# Driver attributes holding broker SDK clients, per driver
+SDK_CLIENT_ATTRS: Tuple[str, ...] = ("_fyers_model", "_fyers_model_async", "_kite")
+
+Latency = Union[None, str, float, Callable[[Dict[str, Any]], float]]
+
+
+class ReplayError(BrokerError):
+    """A replayed call has no recording, or its recording was an error."""
+
+
+# --- Encoding ---
+def _to_json(obj: Any) -> Any:
+    """Make SDK payloads JSON-safe, tagging the types JSON cannot round-trip."""
+    if obj is None or isinstance(obj, (str, bool, int, float)):
+        return obj
+    if isinstance(obj, dict):
+        return {str(k): _to_json(v) for k, v in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [_to_json(v) for v in obj]
+    if isinstance(obj, datetime):
+        return {"$dt": obj.isoformat()}
+    if isinstance(obj, date):
+        return {"$d": obj.isoformat()}
+    if isinstance(obj, (bytes, bytearray)):
+        return {"$b64": base64.b64encode(bytes(obj)).decode("ascii")}
+    item = getattr(obj, "item", None)  # numpy scalars
+    if callable(item):
+        return item()
+    return str(obj)
+
+
+def _from_json(obj: Any) -> Any:
+    if isinstance(obj, list):
+        return [_from_json(v) for v in obj]
+    if isinstance(obj, dict):
+        if len(obj) == 1:
+            (tag, val), = obj.items()
+            if tag == "$dt":
+                return datetime.fromisoformat(val)
+            if tag == "$d":
+                return date.fromisoformat(val)
+            if tag == "$b64":
+                return base64.b64decode(val)
+        return {k: _from_json(v) for k, v in obj.items()}
+    return obj
+
+
+def call_key(*parts: Any) -> str:
+    """Stable match key for a request (argument order of dict keys ignored)."""
+    return json.dumps(_to_json(list(parts)), sort_keys=True, separators=(",", ":"))
+
+
+# --- Cassette ---
+class Cassette:
+    """Gzip'd JSON-lines store of recorded exchanges.
+
+    Record kinds: ``call`` (SDK method), ``http`` (session manager request) and
+    ``ws`` (websocket frame). ``at`` is seconds since recording started and
+    ``t`` the call latency.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.records: List[Dict[str, Any]] = []
+        self._fh: Any = None
+        self._start = time.monotonic()
+        self._lock = threading.Lock()
+
+    # Recording
+    def append(self, record: Dict[str, Any]) -> None:
+        record["at"] = round(time.monotonic() - self._start, 6)
+        line = dumps(record) + b"\n"
+        with self._lock:
+            if self._fh is None:
+                self._fh = gzip.open(self.path, "ab")
+            self._fh.write(line)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._fh is not None:
+                self._fh.close()
+                self._fh = None
+
+    # Replay
+    @classmethod
+    def load(cls, path: str) -> "Cassette":
+        cassette = cls(path)
+        with gzip.open(path, "rb") as fh:
+            cassette.records = [loads(line) for line in fh if line.strip()]
+        return cassette
+
+
+# --- Latency ---
+def lognormal_latency(median_ms: float, sigma: float = 0.5, *, seed: int = 0) -> Callable[[Dict[str, Any]], float]:
+    """Synthetic latency sampler (seconds) with a fixed seed for repeatable runs."""
+    rng = random.Random(seed)
+    mu = math.log(median_ms / 1000.0)
+    lock = threading.Lock()
+
+    def sample(_record: Dict[str, Any]) -> float:
+        with lock:
+            return rng.lognormvariate(mu, sigma)
+
+    return sample
+
+
+def _delay(latency: Latency, record: Dict[str, Any]) -> float:
+    if latency is None or latency == "none":
+        return 0.0
+    if latency == "recorded":
+        return float(record.get("t") or 0.0)
+    if callable(latency):
+        return float(latency(record))
+    return float(latency)
+
+
+class _Player:
+    """Serves recorded responses in recorded order, per exact key then per method."""
+
+    def __init__(self, records: Iterable[Dict[str, Any]], kind: str, latency: Latency, strict: bool) -> None:
+        self.latency = latency
+        self.strict = strict
+        self._exact: Dict[Tuple[str, str], Deque[Dict[str, Any]]] = defaultdict(deque)
+        self._by_method: Dict[str, Deque[Dict[str, Any]]] = defaultdict(deque)
+        for r in records:
+            if r.get("k") == kind:
+                r["blob"] = dumps(r.get("r"))
+                self._exact[(r["m"], r["q"])].append(r)
+                self._by_method[r["m"]].append(r)
+        self._lock = threading.Lock()
+
+    def _take(self, method: str, key: str) -> Tuple[Dict[str, Any], float]:
+        with self._lock:
+            queue = self._exact.get((method, key))
+            if not queue and not self.strict:
+                queue = self._by_method.get(method)
+            if not queue:
+                raise ReplayError(f"No recording for {method}", context={"key": key})
+            record = queue[0]
+            queue.rotate(-1)  # cycle so long load tests never run dry
+        return record, _delay(self.latency, record)
+
+    def next(self, method: str, key: str) -> Dict[str, Any]:
+        record, delay = self._take(method, key)
+        if delay > 0:
+            time.sleep(delay)
+        return record
+
+    async def anext(self, method: str, key: str) -> Dict[str, Any]:
+        """``next`` for awaitable clients; the replayed latency does not block the event loop."""
+        record, delay = self._take(method, key)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        return record
+
+
+# --- SDK clients ---
+class RecordingClient:
+    """Proxy recording every method call on an SDK client (sync or awaitable)."""
+
+    def __init__(self, target: Any, cassette: Cassette, name: str) -> None:
+        self._target = target
+        self._cassette = cassette
+        self._name = name
+
+    def __getattr__(self, attr: str) -> Any:
+        value = getattr(self._target, attr)
+        if not callable(value) or attr.startswith("_"):
+            return value
+        cassette, name = self._cassette, self._name
+
+        def record(args: Tuple[Any, ...], kwargs: Dict[str, Any], start: float, result: Any, error: Optional[BaseException]) -> None:
+            rec: Dict[str, Any] = {"k": "call", "n": name, "m": attr, "q": call_key(args, kwargs), "t": round(time.perf_counter() - start, 6)}
+            if error is not None:
+                rec["e"] = str(error)
+            else:
+                rec["r"] = _to_json(result)
+            cassette.append(rec)
+
+        def call(*args: Any, **kwargs: Any) -> Any:
+            start = time.perf_counter()
+            try:
+                result = value(*args, **kwargs)
+            except Exception as e:
+                record(args, kwargs, start, None, e)
+                raise
+            if inspect.isawaitable(result):
+                async def awaited() -> Any:
+                    try:
+                        out = await result
+                    except Exception as e:
+                        record(args, kwargs, start, None, e)
+                        raise
+                    record(args, kwargs, start, out, None)
+                    return out
+
+                return awaited()
+            record(args, kwargs, start, result, None)
+            return result
+
+        return call
+
+
+class ReplayClient:
+    """Stand-in SDK client answering from a cassette (awaitable results when ``is_async``)."""
+
+    def __init__(self, player: _Player, *, is_async: bool = False) -> None:
+        self._player = player
+        self._is_async = is_async
+
+    @staticmethod
+    def _result(record: Dict[str, Any]) -> Any:
+        if "e" in record:
+            raise ReplayError(record["e"])
+        return _from_json(loads(record["blob"]))
+
+    def _answer(self, method: str, args: Tuple[Any, ...], kwargs: Dict[str, Any]) -> Any:
+        return self._result(self._player.next(method, call_key(args, kwargs)))
+
+    def __getattr__(self, attr: str) -> Any:
+        if attr.startswith("_"):
+            raise AttributeError(attr)
+        if self._is_async:
+            async def acall(*args: Any, **kwargs: Any) -> Any:
+                return self._result(await self._player.anext(attr, call_key(args, kwargs)))
+
+            return acall
+        return lambda *args, **kwargs: self._answer(attr, args, kwargs)
+
+
+# --- HTTP ---
+def _http_key(kwargs: Dict[str, Any]) -> str:
+    data = kwargs.get("data")
+    if isinstance(data, (bytes, bytearray)):
+        data = bytes(data).decode("utf-8", "replace")
+    return call_key(kwargs.get("params"), data, kwargs.get("json"))
+
+
+def _body(content: bytes) -> Dict[str, Any]:
+    try:
+        return {"b": content.decode("utf-8")}
+    except UnicodeDecodeError:
+        return {"b64": base64.b64encode(content).decode("ascii")}
+
+
+class RecordingSessionManager(SessionManager):
+    """SessionManager that also writes every exchange to a cassette."""
+
+    def __init__(self, cassette: Cassette, **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+        self.cassette = cassette
+
+    def request(self, method: str, url: str, **kwargs: Any) -> Any:
+        start = time.perf_counter()
+        resp = super().request(method, url, **kwargs)
+        rec = {"k": "http", "m": f"{method.upper()} {url}", "q": _http_key(kwargs), "s": resp.status_code, "t": round(time.perf_counter() - start, 6)}
+        rec.update(_body(resp.content))
+        self.cassette.append(rec)
+        return resp
+
+
+class ReplayResponse:
+    """The parts of ``requests.Response`` the package uses."""
+
+    def __init__(self, status_code: int, content: bytes, url: str) -> None:
+        self.status_code = status_code
+        self.content = content
+        self.url = url
+        self.headers: Dict[str, str] = {}
+
+    @property
+    def ok(self) -> bool:
+        return self.status_code < 400
+
+    @property
+    def text(self) -> str:
+        return self.content.decode("utf-8", "replace")
+
+    def json(self) -> Any:
+        return loads(self.content)
+
+    def raise_for_status(self) -> None:
+        if not self.ok:
+            raise ReplayError(f"{self.status_code} for {self.url}")
+
+    def close(self) -> None:
+        return None
+
+
+class ReplaySessionManager(SessionManager):
+    """SessionManager answering from a cassette; never opens a socket."""
+
+    def __init__(self, player: _Player) -> None:
+        super().__init__()
+        self._player = player
+
+    def request(self, method: str, url: str, **kwargs: Any) -> Any:
+        record = self._player.next(f"{method.upper()} {url}", _http_key(kwargs))
+        content = base64.b64decode(record["b64"]) if "b64" in record else record.get("b", "").encode("utf-8")
+        return ReplayResponse(int(record.get("s", 200)), content, url)
+
+
+# --- Websocket frames ---
+def _call_ws_cb(cb: Any, payload: Any) -> None:
+    # Drivers pass (ws, message); fall back to (message) like the Fyers order socket wrapper
+    try:
+        cb(None, payload)
+    except TypeError:
+        cb(payload)
+
+
+class TickPlayer:
+    """Feeds recorded websocket frames to callbacks at ``speed`` x the recorded pace (0 = flat out)."""
+
+    def __init__(self, records: Iterable[Dict[str, Any]], speed: float = 1.0, loops: int = 1) -> None:
+        self.frames = [r for r in records if r.get("k") == "ws"]
+        self.speed = float(speed)
+        self.loops = max(1, int(loops))
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self, callbacks: Dict[str, Any]) -> "TickPlayer":
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, args=(callbacks,), name="broker-replay-ws", daemon=True)
+            self._thread.start()
+        return self
+
+    def run(self, callbacks: Dict[str, Any]) -> None:
+        """Play synchronously (benchmarks)."""
+        self._run(callbacks)
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def join(self, timeout: Optional[float] = None) -> None:
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def _run(self, callbacks: Dict[str, Any]) -> None:
+        if not self.frames:
+            return
+        blobs = [(f["c"], f["at"], dumps(f.get("r"))) for f in self.frames]
+        for _ in range(self.loops):
+            origin = time.monotonic()
+            first = blobs[0][1]
+            for channel, at, blob in blobs:
+                if self._stop.is_set():
+                    return
+                if self.speed > 0:
+                    wait = (at - first) / self.speed - (time.monotonic() - origin)
+                    if wait > 0:
+                        time.sleep(wait)
+                cb = callbacks.get(channel)
+                if cb is None:
+                    continue
+                try:
+                    _call_ws_cb(cb, _from_json(loads(blob)))
+                except Exception:
+                    logger.debug("Replay callback failed", exc_info=True)
+
+
+def _ws_recorder(cassette: Cassette, channel: str, cb: Any) -> Any:
+    def wrapped(ws: Any, message: Any = None) -> Any:
+        cassette.append({"k": "ws", "c": channel, "r": _to_json(message)})
+        return cb(ws, message)
+
+    return wrapped
+
+
+# --- Installation ---
+_WS_CHANNELS = (("connect_websocket", "on_ticks", "ticks"), ("connect_order_websocket", "on_order_update", "orders"))
+
+
+def _recording_connect(original: Any, kwarg: str, channel: str, cassette: Cassette) -> Callable[..., Any]:
+    def connect(*args: Any, **kwargs: Any) -> Any:
+        if kwargs.get(kwarg) is not None:
+            kwargs[kwarg] = _ws_recorder(cassette, channel, kwargs[kwarg])
+        return original(*args, **kwargs)
+
+    return connect
+
+
+def _replay_connect(kwarg: str, channel: str, callbacks: Dict[str, Any], player: TickPlayer) -> Callable[..., None]:
+    def connect(*args: Any, **kwargs: Any) -> None:
+        if kwargs.get(kwarg) is not None:
+            callbacks[channel] = kwargs[kwarg]
+        on_connect = kwargs.get("on_connect")
+        if callable(on_connect):
+            try:
+                _call_ws_cb(on_connect, None)
+            except Exception:
+                pass
+        player.start(callbacks)
+
+    return connect
+
+
+def install_recorder(driver: Any, cassette: Cassette) -> None:
+    """Record the driver's SDK calls, pooled HTTP and websocket frames into ``cassette``."""
+    from .session import set_session_manager
+
+    for attr in SDK_CLIENT_ATTRS:
+        client = getattr(driver, attr, None)
+        if client is not None:
+            setattr(driver, attr, RecordingClient(client, cassette, attr.lstrip("_")))
+    lazy_async = getattr(driver, "_async_model", None)
+    if callable(lazy_async):
+        # FyersDriver builds its async client on first use
+        def async_model() -> Any:
+            client = lazy_async()
+            if client is not None and not isinstance(client, RecordingClient):
+                client = driver._fyers_model_async = RecordingClient(client, cassette, "fyers_model_async")
+            return client
+
+        driver._async_model = async_model
+    set_session_manager(RecordingSessionManager(cassette))
+    for method, kwarg, channel in _WS_CHANNELS:
+        setattr(driver, method, _recording_connect(getattr(driver, method), kwarg, channel, cassette))
+
+
+def install_replay(
+    driver: Any,
+    cassette: Cassette,
+    *,
+    latency: Latency = "recorded",
+    speed: float = 1.0,
+    strict: bool = False,
+) -> TickPlayer:
+    """Answer the driver's SDK calls, pooled HTTP and websockets from ``cassette``.
+
+    ``strict=False`` falls back to any recording of the same method when the
+    exact arguments were never recorded (e.g. a later history window). Returns
+    the websocket frame player, which starts when the driver connects.
+    """
+    from .session import set_session_manager
+
+    calls = _Player(cassette.records, "call", latency, strict)
+    for attr in SDK_CLIENT_ATTRS:
+        if hasattr(driver, attr):
+            setattr(driver, attr, ReplayClient(calls, is_async=attr.endswith("_async")))
+    set_session_manager(ReplaySessionManager(_Player(cassette.records, "http", latency, strict)))
+    callbacks: Dict[str, Any] = {}
+    player = TickPlayer(cassette.records, speed=speed)
+    for method, kwarg, channel in _WS_CHANNELS:
+        setattr(driver, method, _replay_connect(kwarg, channel, callbacks, player))
+    return player
+
+
+def replay_mode() -> bool:
+    """True when BROKER_TRANSPORT=replay; drivers then skip token validation and login."""
+    from ..config import getenv
+
+    return (getenv("BROKER_TRANSPORT") or "").lower() == "replay" and bool(getenv("BROKER_CASSETTE"))
+
+
+def install_from_env(driver: Any) -> Optional[Cassette]:
+    """Apply BROKER_TRANSPORT=record|replay with BROKER_CASSETTE (and replay latency/speed)."""
+    from ..config import getenv
+
+    mode = (getenv("BROKER_TRANSPORT") or "").lower()
+    path = getenv("BROKER_CASSETTE")
+    if mode not in ("record", "replay") or not path:
+        return None
+    if mode == "record":
+        import atexit
+
+        cassette = Cassette(path)
+        atexit.register(cassette.close)
+        install_recorder(driver, cassette)
+        return cassette
+    cassette = Cassette.load(path)
+    raw_latency = (getenv("BROKER_REPLAY_LATENCY") or "recorded").lower()
+    latency: Latency = raw_latency if raw_latency in ("recorded", "none") else float(raw_latency) / 1000.0
+    install_replay(driver, cassette, latency=latency, speed=float(getenv("BROKER_REPLAY_SPEED") or 1.0))
+    return cassette
@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+import threading
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+from ..core.errors import HTTPError
+
+
+DEFAULT_TIMEOUT = 15
+DEFAULT_POOL_CONNECTIONS = 4
+DEFAULT_POOL_MAXSIZE = 16
+DEFAULT_RETRIES = 2
+DEFAULT_BACKOFF = 0.2
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+# Methods retried on read errors / retryable statuses. Connection failures are
+# retried for every method since the request never reached the server.
+RETRY_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+
+def _requests():  # lazy import to avoid hard dependency if unused
+    try:  # pragma: no cover - optional dependency
+        import requests  # type: ignore
+
+        return requests
+    except Exception as e:  # pragma: no cover
+        raise HTTPError("'requests' is required for HTTP operations") from e
+
+
+class SessionManager:
+    """Thread-safe registry of keep-alive ``requests`` sessions, one per scheme+host.
+
+    Each session mounts an ``HTTPAdapter`` with its own connection pool and a
+    urllib3 retry/backoff policy, so repeated calls to the same broker host reuse
+    TCP+TLS connections instead of handshaking every time.
+    """
+
+    def __init__(
+        self,
+        *,
+        pool_connections: int = DEFAULT_POOL_CONNECTIONS,
+        pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+        retries: int = DEFAULT_RETRIES,
+        backoff_factor: float = DEFAULT_BACKOFF,
+        timeout: float = DEFAULT_TIMEOUT,
+    ) -> None:
+        self.pool_connections = int(pool_connections)
+        self.pool_maxsize = int(pool_maxsize)
+        self.retries = int(retries)
+        self.backoff_factor = float(backoff_factor)
+        self.timeout = timeout
+        self._sessions: Dict[Tuple[str, str], Any] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> "SessionManager":
+        from ..config import getenv
+
+        def num(key: str, default: float) -> float:
+            v = getenv(key)
+            return float(v) if v else default
+
+        return cls(
+            pool_maxsize=int(num("BROKER_HTTP_POOL_MAXSIZE", DEFAULT_POOL_MAXSIZE)),
+            retries=int(num("BROKER_HTTP_RETRIES", DEFAULT_RETRIES)),
+            backoff_factor=num("BROKER_HTTP_BACKOFF", DEFAULT_BACKOFF),
+            timeout=num("BROKER_HTTP_TIMEOUT", DEFAULT_TIMEOUT),
+        )
+
+    def _new_session(self) -> Any:
+        requests = _requests()
+        from requests.adapters import HTTPAdapter  # type: ignore
+        from urllib3.util.retry import Retry  # type: ignore
+
+        retry = Retry(
+            total=self.retries,
+            connect=self.retries,
+            read=self.retries,
+            status=self.retries,
+            backoff_factor=self.backoff_factor,
+            status_forcelist=RETRY_STATUSES,
+            allowed_methods=RETRY_METHODS,
+            raise_on_status=False,
+            respect_retry_after_header=True,
+        )
+        adapter = HTTPAdapter(pool_connections=self.pool_connections, pool_maxsize=self.pool_maxsize, max_retries=retry)
+        session = requests.Session()
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+
+    def session_for(self, url: str) -> Any:
+        parts = urlsplit(url)
+        key = (parts.scheme, parts.netloc)
+        session = self._sessions.get(key)
+        if session is None:
+            with self._lock:
+                session = self._sessions.get(key)
+                if session is None:
+                    session = self._sessions[key] = self._new_session()
+        return session
+
+    def request(self, method: str, url: str, **kwargs: Any) -> Any:
+        kwargs.setdefault("timeout", self.timeout)
+        return self.session_for(url).request(method, url, **kwargs)
+
+    def get(self, url: str, **kwargs: Any) -> Any:
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs: Any) -> Any:
+        return self.request("POST", url, **kwargs)
+
+    def warm(self, url: str, timeout: float = 5.0) -> bool:
+        """Open a pooled connection to ``url``'s host (DNS + TCP + TLS) ahead of real calls."""
+        try:
+            self.request("HEAD", url, timeout=timeout, allow_redirects=False).close()
+            return True
+        except Exception:
+            return False
+
+    def close(self) -> None:
+        with self._lock:
+            sessions = list(self._sessions.values())
+            self._sessions.clear()
+        for s in sessions:
+            try:
+                s.close()
+            except Exception:
+                continue
+
+
+_manager: Optional[SessionManager] = None
+_manager_lock = threading.Lock()
+
+
+def get_session_manager() -> SessionManager:
+    """Process-wide session manager (configured from env on first use)."""
+    global _manager
+    if _manager is None:
+        with _manager_lock:
+            if _manager is None:
+                _manager = SessionManager.from_env()
+    return _manager
+
+
+def set_session_manager(manager: SessionManager) -> None:
+    global _manager
+    with _manager_lock:
+        old, _manager = _manager, manager
+    if old is not None and old is not manager:
+        old.close()
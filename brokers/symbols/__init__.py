@@ -1,7 +1,18 @@
-"""Symbol normalization and broker-specific resolvers."""
+"""Symbol normalization, parsing, integer IDs and broker-specific resolvers."""
 
+from .ids import IdTable, SymbolIds, symbol_ids
+from .index import InstrumentIndex
+from .parser import SymbolInfo, instrument_kind, parse_symbol
 from .registry import SymbolRegistry, symbol_registry
 
-__all__ = ["SymbolRegistry", "symbol_registry"]
-
-
+__all__ = [
+    "IdTable",
+    "InstrumentIndex",
+    "SymbolIds",
+    "SymbolInfo",
+    "SymbolRegistry",
+    "instrument_kind",
+    "parse_symbol",
+    "symbol_ids",
+    "symbol_registry",
+]
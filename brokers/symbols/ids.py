@@ -0,0 +1,165 @@
+"""Dense integer IDs for instruments, and NumPy state tables indexed by them.
+
+``symbol_ids`` hands out IDs 0, 1, 2, ... in first-seen order. Drivers intern the
+whole master contract when it loads, keyed by broker-native symbol
+(``NSE:SBIN-EQ`` on Fyers, ``NSE:SBIN`` on Kite), and alias exchange tokens to
+the same ID. Hot per-tick state then lives in ``IdTable`` columns: one array
+write per tick instead of a dict update keyed by a string.
+"""
+
+from __future__ import annotations
+
+import threading
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+
+UNKNOWN = -1
+
+
+class SymbolIds:
+    """Thread-safe symbol <-> dense integer ID interning.
+
+    Lookups are plain dict/list reads; only new symbols take the lock. IDs are
+    never reused, so arrays indexed by them stay valid for the process lifetime.
+    """
+
+    def __init__(self) -> None:
+        self._ids: Dict[Hashable, int] = {}
+        self._symbols: List[str] = []
+        self._lock = threading.Lock()
+
+    def intern(self, symbol: str) -> int:
+        """ID for ``symbol``, assigning the next one if it is new."""
+        sid = self._ids.get(symbol)
+        if sid is not None:
+            return sid
+        with self._lock:
+            sid = self._ids.get(symbol)
+            if sid is None:
+                sid = self._ids[symbol] = len(self._symbols)
+                self._symbols.append(symbol)
+        return sid
+
+    def intern_many(self, symbols: Iterable[str]) -> np.ndarray:
+        """Intern a batch (e.g. a master-contract column); returns their IDs as int32."""
+        ids = self._ids
+        out: List[int] = []
+        with self._lock:
+            for symbol in symbols:
+                sid = ids.get(symbol)
+                if sid is None:
+                    sid = ids[symbol] = len(self._symbols)
+                    self._symbols.append(symbol)
+                out.append(sid)
+        return np.asarray(out, dtype=np.int32)
+
+    def alias(self, key: Hashable, sid: int) -> None:
+        """Make another key (an exchange token, an alternate spelling) resolve to ``sid``."""
+        self._ids[key] = int(sid)
+
+    def alias_many(self, keys: Iterable[Hashable], ids: Iterable[int]) -> None:
+        with self._lock:
+            self._ids.update(zip(keys, (int(i) for i in ids)))
+
+    def id_of(self, key: Hashable) -> int:
+        """ID for a symbol or alias, ``UNKNOWN`` (-1) if never interned."""
+        return self._ids.get(key, UNKNOWN)
+
+    def ids_of(self, keys: Iterable[Hashable]) -> np.ndarray:
+        get = self._ids.get
+        return np.fromiter((get(k, UNKNOWN) for k in keys), dtype=np.int32)
+
+    def symbol_of(self, sid: int) -> Optional[str]:
+        return self._symbols[sid] if 0 <= sid < len(self._symbols) else None
+
+    def symbols_of(self, ids: Iterable[int]) -> List[Optional[str]]:
+        return [self.symbol_of(int(i)) for i in ids]
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._ids
+
+    def __len__(self) -> int:
+        return len(self._symbols)
+
+
+class IdTable:
+    """Growable column store indexed by symbol ID.
+
+    ``IdTable(ltp=np.float64, qty=np.int64)`` keeps one NumPy array per column;
+    ``table.ltp[sid]`` reads a value and ``table.set(sid, ltp=..., qty=...)``
+    writes. Float columns start as NaN, integer columns as 0. Columns grow
+    (doubling) when an ID beyond the current capacity is written.
+    """
+
+    def __init__(self, capacity: int = 1024, **columns: Any) -> None:
+        if not columns:
+            raise ValueError("IdTable needs at least one column")
+        self._dtypes: Dict[str, np.dtype] = {name: np.dtype(dt) for name, dt in columns.items()}
+        self._capacity = 0
+        self._lock = threading.Lock()
+        self._grow(max(1, int(capacity)))
+
+    @staticmethod
+    def _blank(dtype: np.dtype, n: int) -> np.ndarray:
+        if dtype.kind == "f":
+            return np.full(n, np.nan, dtype=dtype)
+        return np.zeros(n, dtype=dtype)
+
+    def _grow(self, needed: int) -> None:
+        with self._lock:
+            if needed <= self._capacity:
+                return
+            n = max(needed, self._capacity * 2)
+            for name, dtype in self._dtypes.items():
+                new = self._blank(dtype, n)
+                old = self.__dict__.get(name)
+                if old is not None:
+                    new[: len(old)] = old
+                setattr(self, name, new)
+            self._capacity = n
+
+    @property
+    def capacity(self) -> int:
+        return self._capacity
+
+    @property
+    def columns(self) -> Tuple[str, ...]:
+        return tuple(self._dtypes)
+
+    def ensure(self, sid: int) -> None:
+        """Make sure ``sid`` is addressable (e.g. after interning a new master contract)."""
+        if sid >= self._capacity:
+            self._grow(sid + 1)
+
+    def set(self, sid: int, **values: Any) -> None:
+        if sid >= self._capacity:
+            self._grow(sid + 1)
+        for name, value in values.items():
+            getattr(self, name)[sid] = value
+
+    def get(self, sid: int, column: str) -> Any:
+        if not 0 <= sid < self._capacity:
+            return self._blank(self._dtypes[column], 1)[0]
+        return getattr(self, column)[sid]
+
+    def take(self, column: str, ids: np.ndarray) -> np.ndarray:
+        """Vectorized gather; IDs out of range (or ``UNKNOWN``) read as the blank value."""
+        ids = np.asarray(ids, dtype=np.int64)
+        col = getattr(self, column)
+        out = self._blank(self._dtypes[column], len(ids))
+        ok = (ids >= 0) & (ids < len(col))
+        out[ok] = col[ids[ok]]
+        return out
+
+    def clear(self) -> None:
+        with self._lock:
+            for name, dtype in self._dtypes.items():
+                setattr(self, name, self._blank(dtype, self._capacity))
+
+
+symbol_ids = SymbolIds()
+
+
+__all__ = ["IdTable", "SymbolIds", "UNKNOWN", "symbol_ids"]
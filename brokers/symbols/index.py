@@ -0,0 +1,197 @@
+"""Hash and sorted-array lookups over an instrument master frame.
+
+``InstrumentIndex(df)`` is built once from ``get_instruments()`` output (either
+driver) and answers the questions strategies otherwise ask with DataFrame
+masks:
+
+- ``index[symbol]`` / ``index.get(symbol)``: the instrument record (a dict, like
+  ``to_dict(orient="records")``) through one dict lookup.
+- ``index.nearest(underlying, expiry, option_type, strike)``: closest listed
+  strike by bisecting a sorted per-chain strike array. ``underlying`` and/or
+  ``expiry`` may be None to search every chain of that option type.
+- ``index.expiries(underlying)`` / ``index.next_expiry(underlying)``: sorted
+  expiry calendar per underlying.
+"""
+
+from __future__ import annotations
+
+from bisect import bisect_left
+from datetime import date, datetime
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .parser import CE, FUT, PE, parse_symbol
+
+
+ChainKey = Tuple[Optional[str], Optional[date], str]
+
+# Column holding the derivative's underlying, by driver (Fyers, Kite, generic)
+_UNDERLYING_COLUMNS = ("underlying_symbol", "name", "underlying")
+
+
+class InstrumentIndex:
+    """Immutable lookups over one master-contract frame; rebuild it when the master reloads."""
+
+    def __init__(self, df: pd.DataFrame) -> None:
+        df = df.reset_index(drop=True)
+        n = self._n = len(df)
+        # (name, values, numpy scalar -> python) per column, for building records
+        self._fields = [(c, a, a.dtype != object) for c, a in ((c, df[c].to_numpy()) for c in df.columns)]
+        symbols = df["symbol"].to_numpy(dtype=object) if "symbol" in df else np.empty(n, dtype=object)
+
+        # symbol -> row; first listing wins, as a DataFrame filter + [0] would (reversed so earlier rows overwrite)
+        rows: Dict[Any, int] = dict(zip(symbols[::-1].tolist(), range(n - 1, -1, -1)))
+        if "exchange" in df and n and isinstance(df["exchange"].iloc[0], str):
+            # Kite frames carry bare tradingsymbols; accept EXCH:SYMBOL as well
+            bare = ~df["symbol"].astype(str).str.contains(":", regex=False).to_numpy()
+            keys = (df["exchange"].astype(str) + ":" + df["symbol"].astype(str)).to_numpy(dtype=object)[bare]
+            aliases = dict(zip(keys[::-1].tolist(), np.flatnonzero(bare)[::-1].tolist()))
+            rows = {**aliases, **rows}  # a real symbol always beats an alias
+        self._rows = rows
+
+        kind = self._kinds(df, symbols)
+        underlying = self._underlyings(df, symbols)
+        expiry = self._expiries(df)
+        strike = pd.to_numeric(df["strike"], errors="coerce").to_numpy(dtype=np.float64) if "strike" in df else np.full(n, np.nan)
+
+        # Expiry calendar from options and futures with a known expiry
+        deriv = np.isin(kind, (CE, PE, FUT)) & pd.notna(expiry)
+        calendar: Dict[Optional[str], set] = {}
+        option_calendar: Dict[Optional[str], set] = {}
+        for u, e, k in set(zip(underlying[deriv].tolist(), expiry[deriv].tolist(), kind[deriv].tolist())):
+            for cal in (calendar, option_calendar) if k != FUT else (calendar,):
+                cal.setdefault(u, set()).add(e)
+                cal.setdefault(None, set()).add(e)
+        self._calendar: Dict[Optional[str], List[date]] = {u: sorted(es) for u, es in calendar.items()}
+        self._option_calendar: Dict[Optional[str], List[date]] = {u: sorted(es) for u, es in option_calendar.items()}
+
+        # Strike chains, each sorted by strike: exact (underlying, expiry, type) plus wildcard rollups
+        self._chains: Dict[ChainKey, Tuple[np.ndarray, np.ndarray]] = {}
+        opt = np.flatnonzero(np.isin(kind, (CE, PE)) & ~np.isnan(strike))
+        if len(opt):
+            exp_opt = expiry[opt]
+            self._group(opt, strike, [underlying[opt], exp_opt, kind[opt]])
+            self._group(opt, strike, [np.full(len(opt), None, dtype=object), exp_opt, kind[opt]])
+            self._group(opt, strike, [np.full(len(opt), None, dtype=object), np.full(len(opt), None, dtype=object), kind[opt]])
+
+    # --- Build helpers ---
+    @staticmethod
+    def _kinds(df: pd.DataFrame, symbols: np.ndarray) -> np.ndarray:
+        if "instrument_type" in df:
+            return df["instrument_type"].astype(object).to_numpy(dtype=object)
+        return np.array([parse_symbol(s).kind for s in symbols.tolist()], dtype=object)
+
+    @staticmethod
+    def _underlyings(df: pd.DataFrame, symbols: np.ndarray) -> np.ndarray:
+        for col in _UNDERLYING_COLUMNS:
+            if col in df:
+                codes, uniques = pd.factorize(df[col].astype(object))
+                upper = np.array([str(u).upper() for u in uniques] + [None], dtype=object)
+                out = upper[codes]  # -1 (missing) picks the trailing None
+                missing = codes < 0
+                if missing.any():
+                    out[missing] = [parse_symbol(s).underlying for s in symbols[missing].tolist()]
+                return out
+        return np.array([parse_symbol(s).underlying for s in symbols.tolist()], dtype=object)
+
+    @staticmethod
+    def _expiries(df: pd.DataFrame) -> np.ndarray:
+        if "expiry" not in df:
+            return np.full(len(df), None, dtype=object)
+        days = pd.to_datetime(df["expiry"].astype(object), errors="coerce").to_numpy(dtype="datetime64[D]")
+        # Few distinct expiries: one date object per value
+        values, inverse = np.unique(days, return_inverse=True)
+        objects = np.array([None if np.isnat(v) else v.astype(object) for v in values], dtype=object)
+        return objects[inverse.reshape(-1)] if len(values) else np.full(len(df), None, dtype=object)
+
+    def _group(self, rows: np.ndarray, strike: np.ndarray, keys: List[np.ndarray]) -> None:
+        codes = [pd.factorize(k, use_na_sentinel=False)[0] for k in keys]
+        order = np.lexsort([strike[rows]] + codes[::-1])
+        sorted_codes = np.stack([c[order] for c in codes])
+        breaks = np.flatnonzero(np.any(sorted_codes[:, 1:] != sorted_codes[:, :-1], axis=0)) + 1
+        for lo, hi in zip(np.r_[0, breaks], np.r_[breaks, len(order)]):
+            first = order[lo]
+            key = tuple(k[first] for k in keys)
+            members = rows[order[lo:hi]]
+            self._chains[key] = (strike[members], members)
+
+    # --- Symbol lookups ---
+    def row(self, symbol: str) -> int:
+        """Row position of ``symbol`` in the source frame, -1 when unknown."""
+        return self._rows.get(symbol, -1)
+
+    def record(self, row: int) -> Dict[str, Any]:
+        return {name: values[row].item() if native else values[row] for name, values, native in self._fields}
+
+    def get(self, symbol: str, default: Any = None) -> Any:
+        row = self._rows.get(symbol)
+        return default if row is None else self.record(row)
+
+    def __getitem__(self, symbol: str) -> Dict[str, Any]:
+        row = self._rows.get(symbol)
+        if row is None:
+            raise KeyError(symbol)
+        return self.record(row)
+
+    def __contains__(self, symbol: object) -> bool:
+        return symbol in self._rows
+
+    def __len__(self) -> int:
+        return self._n
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._rows)
+
+    # --- Strike chains ---
+    @staticmethod
+    def _key(underlying: Optional[str], expiry: Any, option_type: str) -> ChainKey:
+        if isinstance(expiry, datetime):
+            expiry = expiry.date()
+        elif expiry is not None and not isinstance(expiry, date):
+            expiry = pd.Timestamp(expiry).date()
+        return (underlying.upper() if underlying is not None else None, expiry, option_type)
+
+    def strikes(self, underlying: Optional[str], expiry: Any, option_type: str) -> np.ndarray:
+        """Sorted strikes listed for the chain (empty when none)."""
+        chain = self._chains.get(self._key(underlying, expiry, option_type))
+        return chain[0] if chain is not None else np.empty(0)
+
+    def nearest(
+        self,
+        underlying: Optional[str],
+        expiry: Any,
+        option_type: str,
+        strike: float,
+        tolerance: Optional[float] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """Record of the listed strike closest to ``strike`` (the lower one on a tie), None if none is within ``tolerance``."""
+        chain = self._chains.get(self._key(underlying, expiry, option_type))
+        if chain is None:
+            return None
+        strikes, rows = chain
+        i = int(np.searchsorted(strikes, strike))
+        if i == len(strikes) or (i > 0 and strike - strikes[i - 1] <= strikes[i] - strike):
+            i -= 1
+        if tolerance is not None and abs(strikes[i] - strike) > tolerance:
+            return None
+        return self.record(int(rows[i]))
+
+    # --- Expiry calendar ---
+    def _days(self, underlying: Optional[str], options_only: bool) -> List[date]:
+        calendar = self._option_calendar if options_only else self._calendar
+        return calendar.get(underlying.upper() if underlying is not None else None, [])
+
+    def expiries(self, underlying: Optional[str] = None, options_only: bool = False) -> List[date]:
+        """Sorted derivative expiries for ``underlying`` (every underlying when None)."""
+        return list(self._days(underlying, options_only))
+
+    def next_expiry(self, underlying: Optional[str] = None, on: Optional[date] = None, options_only: bool = False) -> Optional[date]:
+        """First expiry on or after ``on`` (default today)."""
+        days = self._days(underlying, options_only)
+        i = bisect_left(days, on or date.today())
+        return days[i] if i < len(days) else None
+
+
+__all__ = ["InstrumentIndex"]
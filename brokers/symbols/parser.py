@@ -0,0 +1,208 @@
+"""Structured parsing of NSE/BSE/MCX trading symbols.
+
+``parse_symbol("NSE:NIFTY25D2324000CE")`` returns an immutable ``SymbolInfo``
+with exchange, underlying, expiry, strike, option type and instrument kind.
+Results are cached per input string, so the same symbol always returns the
+same object and classification on hot paths costs one lookup. A miss costs a
+few microseconds (one regex match and a tuple build).
+
+Formats understood (Fyers and Kite spell derivatives the same way):
+- weekly options  ``NIFTY25D2324000CE``  (YY, month 1-9/O/N/D, DD, strike)
+- monthly options ``NIFTY25SEP24000CE``
+- futures         ``NIFTY25SEPFUT``
+- equities        ``RELIANCE`` / ``NSE:RELIANCE-EQ`` (known ``SERIES_CODES`` suffixes)
+- indices         ``NSE:NIFTY50-INDEX`` / ``NSE:NIFTY 50``
+"""
+
+from __future__ import annotations
+
+from datetime import date
+from functools import lru_cache
+import re
+import sys
+from typing import Dict, NamedTuple, Optional, Tuple
+
+
+EQ = "EQ"
+INDEX = "INDEX"
+FUT = "FUT"
+CE = "CE"
+PE = "PE"
+
+_MONTHS = ("JAN", "FEB", "MAR", "APR", "MAY", "JUN", "JUL", "AUG", "SEP", "OCT", "NOV", "DEC")
+_WEEKLY_MONTH = {**{str(i): i for i in range(1, 10)}, "O": 10, "N": 11, "D": 12}
+_MON = "|".join(_MONTHS)
+
+_OPTION = re.compile(
+    rf"^(?P<und>[A-Z0-9&\-]+?)(?P<yy>\d\d)(?:(?P<mon>{_MON})|(?P<m>[1-9OND])(?P<dd>[0-3]\d))(?P<strike>\d+(?:\.\d+)?)(?P<opt>CE|PE)$"
+)
+_FUTURE = re.compile(rf"^(?P<und>[A-Z0-9&\-]+?)(?P<yy>\d\d)(?P<mon>{_MON})FUT$")
+# NSE/BSE equity series codes; other hyphenated suffixes (MCDOWELL-N) are part of the name
+SERIES_CODES = frozenset(
+    ("EQ", "BE", "BL", "BT", "BZ", "E1", "GB", "GS", "IL", "IQ", "IT", "IV", "MF", "RR", "SG", "SM", "ST", "SZ", "TB")
+    + tuple(f"{p}{i}" for p in "NPWYZ" for i in range(1, 10))
+)
+_SERIES = re.compile(rf"^(?P<base>.+)-(?P<series>{'|'.join(sorted(SERIES_CODES))})$")
+
+# Index spellings (Kite name, Fyers ticker) -> underlying used by derivatives
+INDEX_UNDERLYINGS = {
+    "NIFTY 50": "NIFTY",
+    "NIFTY50-INDEX": "NIFTY",
+    "NIFTY BANK": "BANKNIFTY",
+    "NIFTYBANK-INDEX": "BANKNIFTY",
+    "NIFTY FIN SERVICE": "FINNIFTY",
+    "FINNIFTY": "FINNIFTY",
+    "FINNIFTY-INDEX": "FINNIFTY",
+    "NIFTY MID SELECT": "MIDCPNIFTY",
+    "MIDCPNIFTY-INDEX": "MIDCPNIFTY",
+    "NIFTY NEXT 50": "NIFTYNXT50",
+    "NIFTYNXT50-INDEX": "NIFTYNXT50",
+    "INDIA VIX": "INDIAVIX",
+    "INDIAVIX-INDEX": "INDIAVIX",
+    "SENSEX": "SENSEX",
+    "SENSEX-INDEX": "SENSEX",
+    "BANKEX": "BANKEX",
+    "BANKEX-INDEX": "BANKEX",
+}
+
+
+def _index_names() -> Dict[str, Tuple[str, str]]:
+    names: Dict[str, Tuple[str, str]] = {}
+    for name, underlying in INDEX_UNDERLYINGS.items():
+        kite, fyers = names.get(underlying, ("", ""))
+        if name.endswith("-INDEX"):
+            fyers = fyers or name
+        else:
+            kite = kite or name
+        names[underlying] = (kite, fyers)
+    return names
+
+
+# Underlying -> (Kite name, Fyers ticker); the first spelling listed above wins
+INDEX_NAMES = _index_names()
+# Indices listed on BSE; the rest are NSE
+INDEX_EXCHANGES = {"SENSEX": "BSE", "BANKEX": "BSE"}
+# Cash exchange -> derivatives exchange
+_DERIVATIVE_EXCHANGE = {"NSE": "NFO", "NFO": "NFO", "BSE": "BFO", "BFO": "BFO", "MCX": "MCX", "CDS": "CDS"}
+_CASH_EXCHANGE = {"NFO": "NSE", "BFO": "BSE"}
+
+
+class SymbolInfo(NamedTuple):
+    """Parsed trading symbol. ``expiry`` is exact for weekly contracts; monthly ones only carry ``expiry_month``."""
+
+    symbol: str  # tradingsymbol without exchange prefix, as given (upper-cased)
+    exchange: str  # prefix as given, "" when absent
+    kind: str  # EQ | INDEX | FUT | CE | PE
+    underlying: str
+    expiry: Optional[date] = None
+    expiry_month: Optional[date] = None  # first day of the expiry month
+    strike: Optional[float] = None
+    series: Optional[str] = None  # equity series (EQ, BE, SM...)
+
+    @property
+    def option_type(self) -> Optional[str]:
+        return self.kind if self.kind in (CE, PE) else None
+
+    @property
+    def is_option(self) -> bool:
+        return self.kind in (CE, PE)
+
+    @property
+    def is_future(self) -> bool:
+        return self.kind == FUT
+
+    @property
+    def is_derivative(self) -> bool:
+        return self.kind in (FUT, CE, PE)
+
+    @property
+    def is_index(self) -> bool:
+        return self.kind == INDEX
+
+    @property
+    def weekly(self) -> bool:
+        return self.expiry is not None
+
+    @property
+    def segment(self) -> Optional[str]:
+        """Kite-style segment: ``NFO-OPT``, ``BFO-FUT``, ``MCX-FUT``, or the cash exchange."""
+        exch = self.exchange or "NSE"
+        if self.is_derivative:
+            deriv = _DERIVATIVE_EXCHANGE.get(exch)
+            return f"{deriv}-{'FUT' if self.kind == FUT else 'OPT'}" if deriv else None
+        return _CASH_EXCHANGE.get(exch, exch) if exch in ("NSE", "BSE", "NFO", "BFO") else None
+
+
+def _intern(s: str) -> str:
+    return sys.intern(s)
+
+
+@lru_cache(maxsize=65536)
+def parse_symbol(symbol: str) -> SymbolInfo:
+    """Parse ``[EXCH:]TRADINGSYMBOL``. Never raises: unknown shapes come back as equities."""
+    exchange, _, sym = symbol.rpartition(":")
+    exchange = _intern(exchange.strip().upper())
+    sym = sym.strip().upper()
+
+    if sym in INDEX_UNDERLYINGS:
+        return SymbolInfo(_intern(sym), exchange, INDEX, _intern(INDEX_UNDERLYINGS[sym]))
+    if sym.endswith("-INDEX"):
+        return SymbolInfo(_intern(sym), exchange, INDEX, _intern(sym[:-6]))
+
+    if sym.endswith(("CE", "PE")):
+        m = _OPTION.match(sym)
+        if m is None:
+            if sym[-3:-2].isdigit():  # unrecognised contract format, still an option
+                return SymbolInfo(_intern(sym), exchange, sym[-2:], _intern(sym[:-2].rstrip("0123456789.")))
+            return _equity(sym, exchange)  # e.g. RELIANCE
+        year = 2000 + int(m["yy"])
+        if m["mon"]:
+            month = _MONTHS.index(m["mon"]) + 1
+            expiry = None
+        else:
+            month = _WEEKLY_MONTH[m["m"]]
+            try:
+                expiry = date(year, month, int(m["dd"]))
+            except ValueError:
+                expiry = None
+        return SymbolInfo(
+            _intern(sym), exchange, m["opt"], _intern(m["und"]),
+            expiry=expiry, expiry_month=date(year, month, 1), strike=float(m["strike"]),
+        )
+
+    if sym.endswith("FUT"):
+        m = _FUTURE.match(sym)
+        if m is None:
+            return SymbolInfo(_intern(sym), exchange, FUT, _intern(sym[:-3]))
+        month = _MONTHS.index(m["mon"]) + 1
+        return SymbolInfo(_intern(sym), exchange, FUT, _intern(m["und"]), expiry_month=date(2000 + int(m["yy"]), month, 1))
+
+    return _equity(sym, exchange)
+
+
+def _equity(sym: str, exchange: str) -> SymbolInfo:
+    m = _SERIES.match(sym)
+    if m is not None:
+        return SymbolInfo(_intern(sym), exchange, EQ, _intern(m["base"]), series=m["series"])
+    return SymbolInfo(_intern(sym), exchange, EQ, _intern(sym))
+
+
+def instrument_kind(symbol: str) -> str:
+    """Shorthand for ``parse_symbol(symbol).kind``."""
+    return parse_symbol(symbol).kind
+
+
+__all__ = [
+    "CE",
+    "EQ",
+    "FUT",
+    "INDEX",
+    "INDEX_EXCHANGES",
+    "INDEX_NAMES",
+    "INDEX_UNDERLYINGS",
+    "PE",
+    "SERIES_CODES",
+    "SymbolInfo",
+    "instrument_kind",
+    "parse_symbol",
+]
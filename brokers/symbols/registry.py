@@ -1,35 +1,124 @@
 from __future__ import annotations
 
-from typing import Callable, Dict
+import threading
+from typing import Callable, Dict, Hashable, Optional
 
 from ..core.enums import Exchange
 
 
+DEFAULT_CACHE_SIZE = 65536
+
+
+class _Memo:
+    """Bounded translation table: lock-free reads, locked inserts, oldest-first eviction.
+
+    Hit/miss counters are bumped under the same lock so concurrent callers do not lose updates.
+    """
+
+    def __init__(self, max_entries: int) -> None:
+        self.max_entries = max(1, int(max_entries))
+        self._data: Dict[Hashable, str] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable) -> Optional[str]:
+        return self._data.get(key)
+
+    def count(self, hit: bool) -> None:
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def put(self, key: Hashable, value: str) -> None:
+        with self._lock:
+            if key not in self._data and len(self._data) >= self.max_entries:
+                self._data.pop(next(iter(self._data)), None)
+            self._data[key] = value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
 class SymbolRegistry:
     """Normalizes and translates symbols across brokers.
 
     Canonical format: "<EXCHANGE>:<TRADINGSYMBOL>" (e.g., "NSE:RELIANCE").
+
+    Translations are memoized in bounded tables, so a symbol seen before costs
+    one dict lookup: ``translate`` maps raw user input straight to the broker
+    form. Every resolver result is also recorded in a reverse map, which lets
+    ``from_broker_symbol`` recover the internal symbol for resolver-based brokers.
+    Registering a mapping or resolver drops the cached entries.
     """
 
-    def __init__(self) -> None:
+    def __init__(self, max_cache_entries: int = DEFAULT_CACHE_SIZE) -> None:
         self._to_broker: Dict[str, Dict[str, str]] = {}
         self._from_broker: Dict[str, Dict[str, str]] = {}
         self._resolvers: Dict[str, Callable[[str], str]] = {}
+        self._normalized = _Memo(max_cache_entries)  # raw -> internal
+        self._broker = _Memo(max_cache_entries)  # (broker, internal) -> broker symbol
+        self._raw = _Memo(max_cache_entries)  # (broker, raw) -> broker symbol
+        self._reverse = _Memo(max_cache_entries)  # (broker, broker symbol) -> internal
 
     def register_mapping(self, broker: str, internal_to_broker: Dict[str, str]) -> None:
         self._to_broker[broker] = internal_to_broker
         self._from_broker[broker] = {v: k for k, v in internal_to_broker.items()}
+        self.clear_cache()
+
+    def register_resolver(self, broker: str, resolver: Callable[[str], str]) -> None:
+        self._resolvers[broker] = resolver
+        self.clear_cache()
 
     def to_broker_symbol(self, broker: str, internal_symbol: str) -> str:
+        key = (broker, internal_symbol)
+        cached = self._broker.get(key)
+        self._broker.count(cached is not None)
+        if cached is not None:
+            return cached
         if broker in self._resolvers:
-            return self._resolvers[broker](internal_symbol)
-        return self._to_broker.get(broker, {}).get(internal_symbol, internal_symbol)
+            out = self._resolvers[broker](internal_symbol)
+            rkey = (broker, out)
+            if self._reverse.get(rkey) is None:
+                self._reverse.put(rkey, self.normalize(internal_symbol))
+        else:
+            out = self._to_broker.get(broker, {}).get(internal_symbol, internal_symbol)
+        self._broker.put(key, out)
+        return out
+
+    def translate(self, broker: str, symbol: str) -> str:
+        """Raw user symbol -> broker-native symbol (``normalize`` then ``to_broker_symbol``), memoized."""
+        key = (broker, symbol)
+        cached = self._raw.get(key)
+        if cached is not None:
+            self._raw.count(True)
+            return cached
+        out = self.to_broker_symbol(broker, self.normalized(symbol))
+        self._raw.put(key, out)
+        return out
 
     def from_broker_symbol(self, broker: str, broker_symbol: str) -> str:
-        return self._from_broker.get(broker, {}).get(broker_symbol, self.normalize(broker_symbol))
+        mapped = self._from_broker.get(broker, {}).get(broker_symbol)
+        if mapped is not None:
+            return mapped
+        internal = self._reverse.get((broker, broker_symbol))
+        if internal is not None:
+            return internal
+        return self.normalized(broker_symbol)
 
-    def register_resolver(self, broker: str, resolver: Callable[[str], str]) -> None:
-        self._resolvers[broker] = resolver
+    def normalized(self, symbol: str) -> str:
+        """Memoized ``normalize``."""
+        cached = self._normalized.get(symbol)
+        if cached is None:
+            cached = self.normalize(symbol)
+            self._normalized.put(symbol, cached)
+        return cached
 
     @staticmethod
     def normalize(symbol: str) -> str:
@@ -44,7 +133,17 @@ class SymbolRegistry:
             return f"{exchange}:{s}"
         return f"{Exchange.NSE.value}:{symbol.strip().upper()}"
 
+    def clear_cache(self) -> None:
+        for memo in (self._normalized, self._broker, self._raw, self._reverse):
+            memo.clear()
 
-symbol_registry = SymbolRegistry()
+    def cache_stats(self) -> Dict[str, int]:
+        return {
+            "hits": self._broker.hits + self._raw.hits,
+            "misses": self._broker.misses,
+            "entries": len(self._broker) + len(self._raw),
+            "reverse": len(self._reverse),
+        }
 
 
+symbol_registry = SymbolRegistry()
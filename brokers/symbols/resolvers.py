@@ -1,26 +1,26 @@
 from __future__ import annotations
 
+from .parser import EQ, INDEX_NAMES, INDEX_UNDERLYINGS, parse_symbol
 from .registry import symbol_registry
 from ..core.enums import Exchange
 
 
+# Every index spelling -> the broker's own (Kite name / Fyers ticker)
+_FYERS_INDEX = {name: INDEX_NAMES[und][1] for name, und in INDEX_UNDERLYINGS.items() if not name.endswith("-INDEX")}
+_ZERODHA_INDEX = {name: INDEX_NAMES[und][0] for name, und in INDEX_UNDERLYINGS.items() if name.endswith("-INDEX")}
+
+
 def _fyers_resolver(internal: str) -> str:
     if ":" not in internal:
         internal = f"{Exchange.NSE.value}:{internal}"
     exch, sym = internal.split(":", 1)
     sym_u = sym.upper()
-    index_map = {
-        "NIFTY 50": "NIFTY50-INDEX",
-        "NIFTY BANK": "NIFTYBANK-INDEX",
-        "FINNIFTY": "FINNIFTY-INDEX",
-    }
-    if sym_u in index_map:
-        return f"{exch}:{index_map[sym_u]}"
-    if sym_u.endswith("CE") or sym_u.endswith("PE") or "FUT" in sym_u or sym_u.endswith("-INDEX"):
+    if sym_u in _FYERS_INDEX:
+        return f"{exch}:{_FYERS_INDEX[sym_u]}"
+    info = parse_symbol(sym_u)
+    if info.kind != EQ or info.series is not None:
         return f"{exch}:{sym}"
-    if not sym_u.endswith("-EQ"):
-        return f"{exch}:{sym}-EQ"
-    return f"{exch}:{sym}"
+    return f"{exch}:{sym}-EQ"
 
 
 def _zerodha_resolver(internal: str) -> str:
@@ -28,13 +28,8 @@ def _zerodha_resolver(internal: str) -> str:
         internal = f"{Exchange.NSE.value}:{internal}"
     exch, sym = internal.split(":", 1)
     sym_u = sym.upper()
-    fyers_index_to_zerodha = {
-        "NIFTY50-INDEX": "NIFTY 50",
-        "NIFTYBANK-INDEX": "NIFTY BANK",
-        "FINNIFTY-INDEX": "FINNIFTY",
-    }
-    if sym_u in fyers_index_to_zerodha:
-        return f"{exch}:{fyers_index_to_zerodha[sym_u]}"
+    if sym_u in _ZERODHA_INDEX:
+        return f"{exch}:{_ZERODHA_INDEX[sym_u]}"
     if sym_u.endswith("-EQ"):
         sym = sym[:-3]
     return f"{exch}:{sym}"
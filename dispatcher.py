@@ -1,8 +1,17 @@
+import time
+
+import numpy as np
+
 from logger import logger
+from brokers.symbols.ids import IdTable, symbol_ids
 
 class DataDispatcher:
     """
     Routes incoming market data to a single main worker queue.
+
+    Optionally keeps a price board: last price, volume and receive time per
+    instrument in NumPy arrays indexed by symbol ID (see ``brokers.symbols.ids``),
+    updated on every dispatch before the tick is queued.
     """
 
     def __init__(self):
@@ -11,6 +20,8 @@ class DataDispatcher:
         It expects a single main queue to be registered.
         """
         self._main_queue = None  # The single queue for all dispatches
+        self.board = None  # IdTable of ltp/volume/stamp once enable_price_board() is called
+        self.symbol_ids = symbol_ids
         logger.debug(f"DataDispatcher initialized, awaiting main queue registration.")
 
     def register_main_queue(self, q):
@@ -25,6 +36,51 @@ class DataDispatcher:
         self._main_queue = q
         logger.info(f"Main queue registered for DataDispatcher.")
 
+    def enable_price_board(self, ids=None, capacity=4096):
+        """
+        Start recording the latest price per instrument in ID-indexed arrays.
+
+        Args:
+            ids (SymbolIds, optional): Interning service to use; the process-wide one by default.
+            capacity (int): Initial number of instrument slots (the board grows as needed).
+
+        Returns:
+            IdTable: The board, with ``ltp``, ``volume`` and ``stamp`` columns.
+        """
+        if ids is not None:
+            self.symbol_ids = ids
+        self.board = IdTable(capacity=max(capacity, len(self.symbol_ids)), ltp=np.float64, volume=np.int64, stamp=np.float64)
+        return self.board
+
+    def _record(self, data):
+        """Write a tick message into the price board (one vectorized store per column) and tag ticks with ``symbol_id``."""
+        ids = self.symbol_ids
+        sids, prices, volumes = [], [], []
+        for tick in data if isinstance(data, list) else (data,):
+            if not isinstance(tick, dict):
+                continue
+            price = tick.get("last_price", tick.get("ltp"))
+            if price is None:
+                continue
+            # Zerodha ticks carry instrument_token (aliased to the ID at master-contract load), Fyers ticks the symbol
+            key = tick.get("symbol")
+            sid = ids.id_of(key) if key is not None else ids.id_of(tick.get("instrument_token"))
+            if sid < 0:
+                if key is None:
+                    continue
+                sid = ids.intern(key)
+            tick["symbol_id"] = sid
+            sids.append(sid)
+            prices.append(price)
+            volumes.append(tick.get("volume_traded", tick.get("vol_traded_today", 0)) or 0)
+        if not sids:
+            return
+        board = self.board
+        board.ensure(max(sids))
+        board.ltp[sids] = prices
+        board.volume[sids] = volumes
+        board.stamp[sids] = time.monotonic()
+
     def dispatch(self, data):
         """
         Dispatch a data item to the main queue.
@@ -36,6 +92,12 @@ class DataDispatcher:
             logger.error("Attempted to dispatch data, but no main queue has been registered.")
             return
 
+        if self.board is not None:
+            try:
+                self._record(data)
+            except Exception as e:
+                logger.debug(f"Price board update failed: {e}")
+
         try:
             self._main_queue.put(data)
             logger.debug(f"Dispatched data to main queue.")
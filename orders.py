@@ -1,7 +1,7 @@
-import json
 import logging
 import os
 from datetime import datetime
+from brokers.codec import JSONDecodeError, dumps, loads
 from logger import logger
 
 
@@ -31,9 +31,9 @@ class OrderTracker:
 
         if os.path.exists(self.orders_file) and os.path.getsize(self.orders_file) > 0:
             try:
-                with open(self.orders_file, 'r') as f:
+                with open(self.orders_file, 'rb') as f:
                     # Load directly into the dictionary
-                    self._all_orders = json.load(f)
+                    self._all_orders = loads(f.read())
                 logger.info(f"Loaded {len(self._all_orders)} orders from '{self.orders_file}'.")
 
                 # Set current_order to the last loaded order if any exist
@@ -54,7 +54,7 @@ class OrderTracker:
                         logger.info(f"Current order set to: {self._current_order['order_id']}")
                     else:
                         logger.info("No valid current order found among loaded orders.")
-            except json.JSONDecodeError:
+            except JSONDecodeError:
                 logger.error(f"Error decoding JSON from '{self.orders_file}'. Starting with empty orders.")
                 self._all_orders = {}
                 self._current_order = None
@@ -75,8 +75,8 @@ class OrderTracker:
         try:
             # Ensure the directory exists before saving
             os.makedirs(os.path.dirname(self.orders_file), exist_ok=True)
-            with open(self.orders_file, 'w') as f:
-                json.dump(self._all_orders, f, indent=4) # indent for pretty printing
+            with open(self.orders_file, 'wb') as f:
+                f.write(dumps(self._all_orders, indent=True)) # indent for pretty printing
             logger.info(f"Saved {len(self._all_orders)} orders to '{self.orders_file}'.")
         except IOError as e:
             logger.error(f"Error saving orders to '{self.orders_file}': {e}")
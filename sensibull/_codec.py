@@ -0,0 +1,22 @@
+"""Loads ``brokers/codec.py`` by path so the tracker gets the shared JSON codec
+without importing the ``brokers`` package (gateway, pandas, ``.env`` loading).
+"""
+
+import importlib.util
+import os
+import sys
+
+_NAME = "brokers_codec"
+_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "brokers", "codec.py")
+
+_module = sys.modules.get(_NAME)
+if _module is None:
+    _spec = importlib.util.spec_from_file_location(_NAME, _PATH)
+    _module = importlib.util.module_from_spec(_spec)
+    sys.modules[_NAME] = _module
+    _spec.loader.exec_module(_module)
+
+dumps = _module.dumps
+loads = _module.loads
+JSONDecodeError = _module.JSONDecodeError
+BACKEND = _module.BACKEND
@@ -1,6 +1,7 @@
 from flask import Flask, render_template, request, jsonify
+import os
 import sqlite3
-import json
+from _codec import loads
 from datetime import datetime, timedelta
 from database import get_db, sync_profiles
 
@@ -98,7 +99,7 @@ def index():
 def calculate_snapshot_pnl(c, snapshot_id):
     snap = c.execute("SELECT * FROM snapshots WHERE id = ?", (snapshot_id,)).fetchone()
     if not snap: return 0, 0
-    raw = json.loads(snap['raw_data'])
+    raw = loads(snap['raw_data'])
     data = raw.get('data', [])
     
     # Calculate manually to be safe
@@ -165,7 +166,7 @@ def get_daily_pnl_metrics(c, profile_id, date):
     
     if use_realtime:
         # Parse raw_data manually since we don't have calculate_snapshot_pnl helper for raw JSON input
-        raw = json.loads(latest_realtime['raw_data'])
+        raw = loads(latest_realtime['raw_data'])
         last_updated = latest_realtime['timestamp'] # Get timestamp from latest_snapshots
         data = raw.get('data', [])
         total = 0
@@ -236,7 +237,7 @@ def api_diff(change_id):
         return jsonify({'error': 'Change not found'}), 404
         
     current_snapshot = c.execute("SELECT * FROM snapshots WHERE id = ?", (change['snapshot_id'],)).fetchone()
-    current_raw = json.loads(current_snapshot['raw_data']) if current_snapshot else {}
+    current_raw = loads(current_snapshot['raw_data']) if current_snapshot else {}
     current_trades = normalize_trades_for_diff(current_raw.get('data', []))
 
     # Find PREVIOUS snapshot for this profile
@@ -247,7 +248,7 @@ def api_diff(change_id):
         ORDER BY id DESC LIMIT 1
     """, (change['profile_id'], change['snapshot_id'])).fetchone()
     
-    prev_raw = json.loads(prev_snapshot['raw_data']) if prev_snapshot else {}
+    prev_raw = loads(prev_snapshot['raw_data']) if prev_snapshot else {}
     prev_trades = normalize_trades_for_diff(prev_raw.get('data', []))
     
     # Calculate Diff
@@ -290,7 +291,7 @@ def daily_log(slug, date):
         
         # Calculate Detailed Diff (Restore "Change" column detail)
         curr_snap = c.execute("SELECT raw_data FROM snapshots WHERE id = ?", (change['snapshot_id'],)).fetchone()
-        curr_raw = json.loads(curr_snap['raw_data']) if curr_snap else {}
+        curr_raw = loads(curr_snap['raw_data']) if curr_snap else {}
         curr_trades = normalize_trades_for_diff(curr_raw.get('data', []))
         
         # Find previous snapshot (relative to this change)
@@ -300,7 +301,7 @@ def daily_log(slug, date):
             ORDER BY id DESC LIMIT 1
         """, (profile['id'], change['snapshot_id'])).fetchone()
         
-        prev_raw = json.loads(prev_snap['raw_data']) if prev_snap else {}
+        prev_raw = loads(prev_snap['raw_data']) if prev_snap else {}
         prev_trades = normalize_trades_for_diff(prev_raw.get('data', []))
         
         diff_data = calculate_diff(prev_trades, curr_trades)
@@ -412,7 +413,6 @@ def calculate_diff(prev_map, curr_map):
     }
 
 import sys
-import os
 import threading
 import time
 
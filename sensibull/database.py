@@ -1,7 +1,7 @@
 import sqlite3
-import json
 from datetime import datetime
 import os
+from _codec import dumps
 
 DB_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'sensibull.db')
 
@@ -77,7 +77,7 @@ def upsert_latest_snapshot(conn, profile_id, data):
         ON CONFLICT(profile_id) DO UPDATE SET
             raw_data=excluded.raw_data,
             timestamp=CURRENT_TIMESTAMP
-    """, (profile_id, json.dumps(data)))
+    """, (profile_id, dumps(data)))
     conn.commit()
 
 def sync_profiles():
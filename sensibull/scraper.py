@@ -1,9 +1,9 @@
 import requests
 import sqlite3
-import json
 import time
 import os
 import traceback
+from _codec import dumps, loads
 from datetime import datetime, timedelta
 from database import get_db, init_db
 
@@ -37,7 +37,7 @@ def fetch_data(slug):
             "Accept": "application/json"
         }
         resp = requests.get(url, headers=headers, timeout=10)
-        data = resp.json()
+        data = loads(resp.content)
         if data.get('success'):
             return data.get('payload', {}).get('position_snapshot_data', {})
         return None
@@ -48,7 +48,7 @@ def fetch_data(slug):
 def save_snapshot(conn, profile_id, data):
     c = conn.cursor()
     c.execute("INSERT INTO snapshots (profile_id, raw_data, created_at_source) VALUES (?, ?, ?)", 
-              (profile_id, json.dumps(data), data.get('created_at')))
+              (profile_id, dumps(data), data.get('created_at')))
     return c.lastrowid
 
 def normalize_trades(trades):
@@ -182,7 +182,7 @@ def run_scraper():
             continue
             
         # Compare with last snapshot
-        last_data = json.loads(last_snapshot[0]) # Fetchone returns a tuple
+        last_data = loads(last_snapshot[0]) # Fetchone returns a tuple
         diff = get_normalized_trades(current_data) != get_normalized_trades(last_data)
         
         if diff:
@@ -21,8 +21,7 @@ class FVGStrategy:
             setattr(self, f'strat_var_{k}', v)
         self.broker = broker
         
-        self.broker.download_instruments()
-        # Fetch all F&O stock futures and GOLDM/SILVERM
+        # Fetch all F&O stock futures and GOLDM/SILVERM (only the futures segments are loaded)
         self.symbols = self.broker.get_nse_futures_symbols()
         self.positions = {}
 
@@ -30,7 +29,10 @@ class FVGStrategy:
 
     def _get_target_symbols(self):
         """Fetches all NSE F&O stock futures and MCX futures."""
-        all_instruments = self.broker.get_instruments()
+        all_instruments = self.broker.get_instruments(
+            segments=['NSE', 'NFO-FUT', 'MCX-FUT'],
+            columns=['symbol', 'exchange', 'instrument_type', 'expiry', 'underlying_symbol'],
+        )
 
         # 1. Create a whitelist of valid stock underlyings from the cash market segment (NSE Exchange Code: 10)
         stock_symbols_df = all_instruments[all_instruments['exchange'] == 10]
@@ -99,12 +101,13 @@ class FVGStrategy:
                 continue
 
             try:
-                df_raw = self.broker.get_history(symbol, "15", start_date, end_date)
-                if not df_raw:
+                # Columnar history builds the frame without per-candle dicts
+                cols = self.broker.get_history_array(symbol, "15", start_date, end_date)
+                if len(cols["ts"]) == 0:
                     logger.warning(f"No historical data for {symbol}")
                     continue
 
-                df = pd.DataFrame(df_raw)
+                df = pd.DataFrame(cols)
                 if df.empty:
                     continue
 
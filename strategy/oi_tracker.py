@@ -6,9 +6,8 @@ import time
 import yaml
 import random
 from logger import logger
-from brokers import BrokerGateway, OrderRequest, Exchange, OrderType, TransactionType, ProductType
+from brokers import BrokerGateway, OrderRequest, Exchange, OrderType, TransactionType, ProductType, InstrumentIndex
 from tabulate import tabulate
-import pandas as pd
 from datetime import datetime, timedelta
 from termcolor import colored
 
@@ -43,6 +42,9 @@ class OITrackerStrategy:
         except Exception:
             logger.debug("Could not log instruments metadata")
 
+        # Expiry calendar and sorted strike arrays, so each strike lookup is a bisect instead of a frame scan
+        self.instrument_index = InstrumentIndex(self.instruments)
+
         # Trading parameters - use getattr for safe fallback
         self.trading_config = getattr(self, 'strat_var_trading', {})
         
@@ -194,7 +196,8 @@ class OITrackerStrategy:
         """
         Get the option symbol for a given strike and option type.
         """
-        df = self.instruments
+        index = self.instrument_index
+        underlying = str(underlying)
 
         # Ensure strike is numeric
         try:
@@ -204,72 +207,18 @@ class OITrackerStrategy:
             return None
 
         # Find the next expiry date for this underlying (prefer underlying-specific expiries)
-        today = datetime.now().date()
-        all_expiries = pd.to_datetime(df.get('expiry', []), errors='coerce').dropna().dt.date.unique()
-        all_expiries = sorted([e for e in all_expiries if e >= today])
-
-        # Normalize underlying for comparison
-        underlying_norm = str(underlying).upper()
-
-        # Try to find expiries where the underlying matches (preferred)
-        underlying_mask = df['underlying_symbol'].astype(str).str.upper() == underlying_norm
-        underlying_expiries = pd.to_datetime(df[underlying_mask].get('expiry', []), errors='coerce').dropna().dt.date.unique()
-        underlying_expiries = sorted([e for e in underlying_expiries if e >= today])
-
-        if underlying_expiries:
-            next_expiry = underlying_expiries[0]
-        elif all_expiries:
-            next_expiry = all_expiries[0]
-        else:
+        next_expiry = index.next_expiry(underlying) or index.next_expiry()
+        if next_expiry is None:
             logger.warning(f"No valid expiries found for {underlying}")
             return None
 
-        # Normalize underlying for comparison
-        underlying_norm = str(underlying).upper()
-
-        # Try exact match first (tolerant columns)
-        underlying_col = 'underlying_symbol' if 'underlying_symbol' in df.columns else (
-            'underlying' if 'underlying' in df.columns else None
+        # Exact or nearest strike for this underlying; otherwise the nearest strike of any underlying at that expiry
+        instrument = (
+            index.nearest(underlying, next_expiry, option_type, strike_val)
+            or index.nearest(None, next_expiry, option_type, strike_val)
         )
-
-        mask = (pd.to_datetime(df['expiry']).dt.date == next_expiry) & (df['instrument_type'] == option_type)
-        if underlying_col:
-            mask = mask & (df[underlying_col].astype(str).str.upper() == underlying_norm)
-
-        # Compare strike allowing numeric types
-        try:
-            strikes_series = pd.to_numeric(df['strike'], errors='coerce')
-        except Exception:
-            strikes_series = df['strike']
-
-        candidates = df[mask].copy()
-        if not candidates.empty:
-            # Try exact strike
-            exact = candidates[pd.to_numeric(candidates['strike'], errors='coerce') == strike_val]
-            if not exact.empty:
-                return exact.iloc[0]['symbol']
-
-        # If exact match not found, broaden search to same expiry+type and pick nearest strike
-        relaxed = df[(pd.to_datetime(df['expiry']).dt.date == next_expiry) & (df['instrument_type'] == option_type)].copy()
-        if relaxed.empty:
-            logger.debug(f"No instruments for expiry {next_expiry} and type {option_type}")
-            return None
-
-        # Compute numeric strike differences and pick nearest
-        try:
-            relaxed['__strike_num'] = pd.to_numeric(relaxed['strike'], errors='coerce')
-            relaxed = relaxed.dropna(subset=['__strike_num'])
-            relaxed['__diff'] = (relaxed['__strike_num'] - strike_val).abs()
-            relaxed = relaxed.sort_values('__diff')
-            if not relaxed.empty:
-                # Prefer matching underlying if available
-                if underlying_col:
-                    same_underlying = relaxed[relaxed[underlying_col].astype(str).str.upper() == underlying_norm]
-                    if not same_underlying.empty:
-                        return same_underlying.iloc[0]['symbol']
-                return relaxed.iloc[0]['symbol']
-        except Exception as e:
-            logger.debug(f"Error while searching nearest strike: {e}")
+        if instrument is not None:
+            return instrument['symbol']
 
         logger.debug(f"Could not find symbol for strike {strike}, option type {option_type}, underlying {underlying} and expiry {next_expiry}")
         return None
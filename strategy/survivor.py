@@ -4,7 +4,7 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 import yaml
 from logger import logger
-from brokers import BrokerGateway, OrderRequest, Exchange, OrderType, TransactionType, ProductType
+from brokers import BrokerGateway, OrderRequest, Exchange, OrderType, TransactionType, ProductType, InstrumentIndex
 
 class SurvivorStrategy:
     """
@@ -85,14 +85,16 @@ class SurvivorStrategy:
         self.broker = broker
         self.symbol_initials = self.strat_var_symbol_initials
         self.order_tracker = order_tracker  # Store OrderTracker
-        self.broker.download_instruments()
-        self.instruments = self.broker.get_instruments()
+        # Only NFO options are needed; the broker reads just that segment of its instrument store
+        self.instruments = self.broker.get_instruments(segments=["NFO-OPT"])
         self.instruments = self.instruments[self.instruments['symbol'].str.contains(self.symbol_initials)]
 
         if self.instruments.shape[0] == 0:
             logger.error(f"No instruments found for {self.symbol_initials}")
             logger.error(f"Instument {self.symbol_initials} not found. Please check the symbol initials")
             return
+        # Sorted strike arrays per option type, so strike selection on each trigger is a bisect
+        self.instrument_index = InstrumentIndex(self.instruments)
         
         self.strike_difference = None      
         self._initialize_state()
@@ -430,31 +432,21 @@ class SurvivorStrategy:
         # Calculate target strike price
         target_strike = ltp + symbol_gap
         
-        # Filter instruments for matching criteria
-        df = self.instruments[
-            (self.instruments['symbol'].str.contains(self.strat_var_symbol_initials)) &
-            (self.instruments['instrument_type'] == option_type) &
-            (self.instruments['segment'] == "NFO-OPT")
-        ]
-        
-        if df.empty:
+        # self.instruments holds only this series' NFO options, so every chain of this type qualifies
+        if len(self.instrument_index.strikes(None, None, option_type)) == 0:
             return None
             
-        # Find closest strike within acceptable tolerance
-        df['target_strike_diff'] = (df['strike'] - target_strike).abs()
-        
-        # Filter to strikes within half strike difference (tolerance for rounding)
+        # Closest strike within half a strike difference (tolerance for rounding)
         tolerance = self._get_strike_difference(self.strat_var_symbol_initials) / 2
-        df = df[df['target_strike_diff'] <= tolerance]
+        best = self.instrument_index.nearest(None, None, option_type, target_strike, tolerance=tolerance)
         
-        if df.empty:
+        if best is None:
             logger.error(f"No instrument found for {self.strat_var_symbol_initials} {option_type} "
                         f"within {tolerance} of {target_strike}")
             return None
             
-        # Return the closest match
-        best = df.sort_values('target_strike_diff').iloc[0]
-        return best.to_dict()
+        best['target_strike_diff'] = abs(best['strike'] - target_strike)
+        return best
 
     def _find_price_eligible_symbol(self, option_type):
         """
@@ -6,7 +6,7 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 import yaml
 from logger import logger
 # from brokers.zerodha import ZerodhaBroker
-from brokers import BrokerGateway, OrderRequest, Exchange, OrderType, TransactionType, ProductType
+from brokers import BrokerGateway, OrderRequest, Exchange, OrderType, TransactionType, ProductType, InstrumentIndex, parse_symbol
 import datetime
 import time
 import yaml
@@ -69,6 +69,7 @@ class WaveStrategy:
         logger.info("Downloading instruments...")
         self.broker.download_instruments() 
         self.all_instruments = self.broker.get_instruments() 
+        self.instrument_index = InstrumentIndex(self.all_instruments)  # symbol -> record without scanning the frame
         
         self.initial_positions['position'] = self._get_position_for_symbol()
         
@@ -108,9 +109,8 @@ class WaveStrategy:
         """Get symbol type from symbol name"""
         exchange = self.symbol_name.split(':')[0]
         if exchange == "NFO":
-            if symbol_name.endswith("CE"): return "CE"
-            if symbol_name.endswith("PE"): return "PE"
-            if symbol_name.endswith("FUT"): return "FUT"
+            kind = parse_symbol(symbol_name).kind
+            if kind in ("CE", "PE", "FUT"): return kind
         if exchange == "NSE":
             return "STOCK"
         raise ValueError(f"Invalid symbol name or exchange: {symbol_name} {exchange}")
@@ -182,11 +182,12 @@ class WaveStrategy:
         else:
             raise ValueError(f"Invalid index name: {index_name}")
 
+        underlying = parse_symbol(index_name).underlying  # "NIFTY BANK" derivatives trade as BANKNIFTY
         for pos in net_positions:
-            if not pos.symbol.startswith(index_name):
+            if parse_symbol(pos.symbol).underlying != underlying:
                 continue
 
-            instrument = self.all_instruments[self.all_instruments["symbol"] == pos.symbol].to_dict(orient="records")[0]
+            instrument = self.instrument_index[pos.symbol]
             quantity = pos.quantity_total
 
             # --- Futures Delta Calculation ---
@@ -316,9 +317,10 @@ class WaveStrategy:
         """Get trading restrictions for the given symbol."""
         all_restrictions = self._get_dynamic_restrictions()
         
-        if symbol.startswith("NIFTY BANK") or symbol.startswith("BANKNIFTY"):
+        underlying = parse_symbol(symbol).underlying
+        if underlying == "BANKNIFTY":
             return all_restrictions['bank_nifty'], False
-        elif symbol.startswith("NIFTY"):
+        elif underlying.startswith("NIFTY"):
             return all_restrictions['nifty'], False
         else:
             # For non-NIFTY/NIFTY BANK symbols, allow all trades
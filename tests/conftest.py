@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import os
+import sys
+from typing import Any, Dict, List
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from brokers.core.enums import Exchange  # noqa: E402
+from brokers.core.interface import BrokerDriver  # noqa: E402
+from brokers.core.schemas import BrokerCapabilities, Funds, OrderRequest, OrderResponse, Position, Quote  # noqa: E402
+
+
+class FakeDriver(BrokerDriver):
+    """In-memory driver recording every call, for gateway tests."""
+
+    def __init__(self, **capabilities: Any) -> None:
+        super().__init__()
+        self.capabilities = BrokerCapabilities(**capabilities)
+        self.calls: List[tuple] = []
+        self.positions: List[Position] = []
+
+    def get_funds(self) -> Funds:
+        self.calls.append(("get_funds",))
+        return Funds(equity=0.0, available_cash=0.0, used_margin=0.0, net=0.0)
+
+    def get_positions(self) -> List[Position]:
+        self.calls.append(("get_positions",))
+        return list(self.positions)
+
+    def place_order(self, request: OrderRequest) -> OrderResponse:
+        self.calls.append(("place_order", request))
+        return OrderResponse(status="ok", order_id="1")
+
+    def cancel_order(self, order_id: str) -> OrderResponse:
+        self.calls.append(("cancel_order", order_id))
+        return OrderResponse(status="ok", order_id=order_id)
+
+    def modify_order(self, order_id: str, updates: Dict[str, Any]) -> OrderResponse:
+        self.calls.append(("modify_order", order_id))
+        return OrderResponse(status="ok", order_id=order_id)
+
+    def get_orderbook(self) -> List[Dict[str, Any]]:
+        self.calls.append(("get_orderbook",))
+        return []
+
+    def get_tradebook(self) -> List[Dict[str, Any]]:
+        self.calls.append(("get_tradebook",))
+        return []
+
+    def get_quote(self, symbol: str) -> Quote:
+        self.calls.append(("get_quote", symbol))
+        exch, sym = symbol.split(":", 1)
+        return Quote(symbol=sym, exchange=Exchange[exch], last_price=100.0)
+
+    def get_quotes(self, symbols: List[str]) -> Dict[str, Quote]:
+        self.calls.append(("get_quotes", list(symbols)))
+        return {s: Quote(symbol=s.split(":", 1)[1], exchange=Exchange[s.split(":", 1)[0]], last_price=100.0) for s in symbols}
+
+    def get_history(self, symbol: str, interval: str, start: str, end: str, oi: bool = False) -> List[Dict[str, Any]]:
+        self.calls.append(("get_history", symbol, start, end))
+        return []
+
+
+@pytest.fixture
+def fake_driver() -> FakeDriver:
+    return FakeDriver()
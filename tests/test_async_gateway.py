@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+import asyncio
+import time
+
+import pytest
+
+from brokers.core.async_gateway import AsyncBrokerGateway
+from brokers.core.enums import Exchange
+from brokers.core.gateway import BrokerGateway
+from brokers.core.schemas import Quote
+from brokers.integrations.fyers.driver import FyersDriver
+from brokers.metrics import MetricsInterceptor, MetricsRegistry
+
+from conftest import FakeDriver
+
+
+@pytest.fixture
+def fyers(monkeypatch: pytest.MonkeyPatch) -> FyersDriver:
+    for name in ("BROKER_API_KEY", "FYERS_API_KEY", "FYERS_ACCESS_TOKEN", "BROKER_ACCESS_TOKEN"):
+        monkeypatch.delenv(name, raising=False)
+    monkeypatch.setenv("BROKER_INSTRUMENT_STORE", "false")
+    return FyersDriver()
+
+
+def slow_quote(symbol: str) -> Quote:
+    time.sleep(0.2)
+    return Quote(symbol=symbol.split(":", 1)[1], exchange=Exchange.NSE, last_price=1.0)
+
+
+def test_native_async_needs_an_async_client(fyers: FyersDriver) -> None:
+    assert fyers.get_capabilities().supports_native_async is False
+    agw = AsyncBrokerGateway(BrokerGateway(fyers, "fyers"))
+    try:
+        assert agw._native("get_quote") is None
+    finally:
+        agw.close()
+
+
+def test_capabilities_do_not_build_the_async_client(fyers: FyersDriver) -> None:
+    fyers._client_id, fyers._access_token = "APP-100", "token"
+    fyers.get_capabilities()
+    assert fyers._fyers_model_async is None
+    assert fyers._fyers_model_async_key is None
+
+
+def test_native_calls_run_through_interceptors() -> None:
+    class AsyncDriver(FakeDriver):
+        async def get_quote_async(self, symbol: str) -> Quote:
+            return Quote(symbol=symbol.split(":", 1)[1], exchange=Exchange.NSE, last_price=1.0)
+
+    registry = MetricsRegistry()
+    gw = BrokerGateway(AsyncDriver(supports_native_async=True), "fake", interceptors=[MetricsInterceptor(registry)])
+    agw = AsyncBrokerGateway(gw)
+    try:
+        asyncio.run(agw.get_quote("NSE:SBIN"))
+    finally:
+        agw.close()
+    assert registry.snapshot()["fake.driver.get_quote"]["calls"] == 1
+
+
+def test_fallback_coroutines_do_not_block_the_loop(fyers: FyersDriver, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(fyers, "get_quote", slow_quote)
+
+    async def run() -> float:
+        t0 = time.monotonic()
+        await asyncio.gather(*(fyers.get_quote_async(f"NSE:S{i}") for i in range(4)))
+        return time.monotonic() - t0
+
+    assert asyncio.run(run()) < 0.6
@@ -0,0 +1,193 @@
+from __future__ import annotations
+
+from datetime import date, datetime, time as dtime, timedelta
+import os
+
+import numpy as np
+import pytest
+
+from brokers.cache import candles as candle_cache
+from brokers.cache.candles import CandleCache, IncompleteFetch, interval_seconds
+from brokers.core.candles import CANDLE_COLUMNS, CandleColumns, empty_columns, failed_columns
+from brokers.core.gateway import BrokerGateway
+
+from conftest import FakeDriver
+
+
+def bars(start: str, end: str) -> CandleColumns:
+    """One daily bar per calendar day in [start, end]."""
+    d0 = datetime.strptime(start, "%Y-%m-%d").date()
+    d1 = datetime.strptime(end, "%Y-%m-%d").date()
+    days = [d0 + timedelta(days=i) for i in range((d1 - d0).days + 1)]
+    ts = np.array([int(datetime.combine(d, dtime(9, 15)).timestamp()) for d in days], dtype=np.int64)
+    cols = {k: np.arange(len(ts), dtype=np.float64) for k in CANDLE_COLUMNS if k != "ts"}
+    return {"ts": ts, **cols}
+
+
+class Recorder:
+    def __init__(self, fn=bars) -> None:
+        self.fn = fn
+        self.calls = []
+
+    def __call__(self, start: str, end: str) -> CandleColumns:
+        self.calls.append((start, end))
+        return self.fn(start, end)
+
+
+@pytest.fixture
+def cache(tmp_path) -> CandleCache:
+    return CandleCache(str(tmp_path))
+
+
+def get(cache: CandleCache, start: str, end: str, fetch) -> CandleColumns:
+    return cache.get("fake", "NSE:SBIN", "1d", start, end, False, fetch)
+
+
+def test_cold_fetch_is_stored_and_reused(cache: CandleCache) -> None:
+    fetch = Recorder()
+    assert len(get(cache, "2024-01-01", "2024-01-10", fetch)["ts"]) == 10
+    assert len(get(cache, "2024-01-03", "2024-01-05", fetch)["ts"]) == 3
+    assert fetch.calls == [("2024-01-01", "2024-01-10")]
+
+
+def test_head_and_tail_are_fetched_and_merged(cache: CandleCache) -> None:
+    fetch = Recorder()
+    get(cache, "2024-01-10", "2024-01-20", fetch)
+    cols = get(cache, "2024-01-05", "2024-01-25", fetch)
+    assert fetch.calls[1:] == [("2024-01-05", "2024-01-09"), ("2024-01-21", "2024-01-25")]
+    assert len(cols["ts"]) == 21
+    assert np.all(np.diff(cols["ts"]) > 0)
+    get(cache, "2024-01-05", "2024-01-25", fetch)
+    assert len(fetch.calls) == 3
+
+
+def test_failed_fetch_is_not_cached(cache: CandleCache) -> None:
+    failing = Recorder(lambda s, e: failed_columns())
+    assert len(get(cache, "2024-01-01", "2024-01-10", failing)["ts"]) == 0
+    working = Recorder()
+    assert len(get(cache, "2024-01-01", "2024-01-10", working)["ts"]) == 10
+    assert working.calls == [("2024-01-01", "2024-01-10")]
+
+
+def test_empty_range_is_covered(cache: CandleCache) -> None:
+    # e.g. a window before listing: no bars, but nothing to fetch again either
+    fetch = Recorder(lambda s, e: empty_columns())
+    get(cache, "2024-01-01", "2024-01-10", fetch)
+    assert len(get(cache, "2024-01-01", "2024-01-10", fetch)["ts"]) == 0
+    assert fetch.calls == [("2024-01-01", "2024-01-10")]
+
+
+def test_incomplete_tail_is_served_but_refetched(cache: CandleCache) -> None:
+    get(cache, "2024-01-01", "2024-01-10", Recorder())
+
+    def partial(start: str, end: str) -> CandleColumns:
+        raise IncompleteFetch(bars(start, "2024-01-12"))
+
+    assert len(get(cache, "2024-01-01", "2024-01-15", partial)["ts"]) == 12
+    retry = Recorder()
+    assert len(get(cache, "2024-01-01", "2024-01-15", retry)["ts"]) == 15
+    assert retry.calls == [("2024-01-11", "2024-01-15")]
+
+
+def test_current_session_is_refetched(cache: CandleCache) -> None:
+    today = date.today()
+    start = (today - timedelta(days=3)).isoformat()
+    fetch = Recorder()
+    get(cache, start, today.isoformat(), fetch)
+    get(cache, start, today.isoformat(), fetch)
+    assert fetch.calls[-1] == (today.isoformat(), today.isoformat())
+
+
+def test_store_failure_does_not_break_get(cache: CandleCache, monkeypatch: pytest.MonkeyPatch) -> None:
+    def boom(*args, **kwargs):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(np, "savez", boom)
+    assert len(get(cache, "2024-01-01", "2024-01-05", Recorder())["ts"]) == 5
+    assert not any(name.endswith(".tmp") for _, _, files in os.walk(cache.root) for name in files)
+
+
+def test_writes_walk_the_cache_only_when_over_the_limit(tmp_path, monkeypatch: pytest.MonkeyPatch) -> None:
+    cache = CandleCache(str(tmp_path))
+    walks = []
+    real_walk = os.walk
+    monkeypatch.setattr(candle_cache.os, "walk", lambda root: walks.append(root) or real_walk(root))
+    for symbol in ("NSE:SBIN", "NSE:INFY", "NSE:TCS"):
+        cache.get("fake", symbol, "1d", "2024-01-01", "2024-01-10", False, Recorder())
+    assert len(walks) == 1
+
+    # Shrink the budget to about two files: the next write evicts the oldest
+    size = os.path.getsize(cache._path("fake", "NSE:SBIN", "1d", False))
+    cache.max_bytes = 2 * size + size // 2
+    os.utime(cache._path("fake", "NSE:SBIN", "1d", False), (0, 0))
+    cache.get("fake", "NSE:ITC", "1d", "2024-01-01", "2024-01-10", False, Recorder())
+    assert len(walks) == 2
+    assert not os.path.exists(cache._path("fake", "NSE:SBIN", "1d", False))
+    assert cache._bytes <= cache.max_bytes
+
+
+def test_gateway_does_not_cache_failed_chunks(cache: CandleCache) -> None:
+    class FlakyDriver(FakeDriver):
+        fail = True
+
+        def get_history_array(self, symbol, interval, start, end, oi=False):
+            self.calls.append(("get_history_array", start, end))
+            return failed_columns() if self.fail else bars(start, end)
+
+    driver = FlakyDriver()
+    gw = BrokerGateway(driver, "fake", candle_cache=cache)
+    assert len(gw.get_history_array("NSE:SBIN", "1d", "2024-01-01", "2024-01-10")["ts"]) == 0
+    driver.fail = False
+    assert len(gw.get_history_array("NSE:SBIN", "1d", "2024-01-01", "2024-01-10")["ts"]) == 10
+
+
+def minute_bars(day: date, until: datetime) -> CandleColumns:
+    """1m bars from 09:15 on ``day`` whose start is before ``until``."""
+    t0 = int(datetime.combine(day, dtime(9, 15)).timestamp())
+    ts = np.arange(t0, int(until.timestamp()), 60, dtype=np.int64)
+    cols = {k: np.full(len(ts), float(len(ts))) for k in CANDLE_COLUMNS if k != "ts"}
+    return {"ts": ts, **cols}
+
+
+def test_interval_seconds() -> None:
+    assert interval_seconds("1m") == 60
+    assert interval_seconds("15") == 900
+    assert interval_seconds("5S") == 5
+    assert interval_seconds("minute") == 60
+    assert interval_seconds("3minute") == 180
+    assert interval_seconds("1d") is None
+    assert interval_seconds("D") is None
+
+
+def test_intraday_tail_waits_for_the_next_bar_close(cache: CandleCache, monkeypatch: pytest.MonkeyPatch) -> None:
+    today = date.today()
+    clock = {"now": datetime.combine(today, dtime(10, 0, 30))}
+    monkeypatch.setattr(candle_cache, "_now", lambda: clock["now"].timestamp())
+    fetch = Recorder(lambda s, e: minute_bars(today, clock["now"]))
+
+    def intraday() -> CandleColumns:
+        return cache.get("fake", "NSE:SBIN", "1m", today.isoformat(), today.isoformat(), True, fetch)
+
+    assert len(intraday()["ts"]) == 46  # 09:15 .. 10:00, the last one still open
+    clock["now"] = datetime.combine(today, dtime(10, 0, 50))
+    assert len(intraday()["ts"]) == 46
+    assert len(fetch.calls) == 1  # no bar has closed since the last fetch
+    clock["now"] = datetime.combine(today, dtime(10, 1, 5))
+    cols = intraday()
+    assert len(fetch.calls) == 2
+    assert len(cols["ts"]) == 47
+    assert cols["close"][-1] == 47.0  # the open bar was replaced by the fresh fetch
+
+
+def test_invalidate_session_trims_only_the_open_bar(cache: CandleCache, monkeypatch: pytest.MonkeyPatch) -> None:
+    today = date.today()
+    now = datetime.combine(today, dtime(10, 0, 30))
+    monkeypatch.setattr(candle_cache, "_now", lambda: now.timestamp())
+    fetch = Recorder(lambda s, e: minute_bars(today, now))
+    cache.get("fake", "NSE:SBIN", "1m", today.isoformat(), today.isoformat(), False, fetch)
+    assert cache.invalidate_session() == 1
+    cols, _, covered_until, _ = cache._load(cache._path("fake", "NSE:SBIN", "1m", False))
+    assert len(cols["ts"]) == 45
+    assert covered_until == int(datetime.combine(today, dtime(10, 0)).timestamp())
+    cache.get("fake", "NSE:SBIN", "1m", today.isoformat(), today.isoformat(), False, fetch)
+    assert len(fetch.calls) == 2
@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+from datetime import date
+
+import pandas as pd
+import pytest
+
+from brokers.cache.instruments import InstrumentStore
+from brokers.integrations.fyers import driver as fyers_driver
+from brokers.integrations.fyers.master import derive_columns, master_day
+
+
+def test_segments_match_the_zerodha_names() -> None:
+    df = pd.DataFrame(
+        {
+            "symbol": [
+                "NSE:SBIN-EQ",
+                "NSE:NIFTY24JANFUT",
+                "NSE:NIFTY24JAN21000CE",
+                "BSE:SENSEX24JAN70000PE",
+                "MCX:CRUDEOIL24JANFUT",
+                "MCX:CRUDEOIL24JAN6000CE",
+            ],
+            "option_type": ["XX", "XX", "CE", "PE", "XX", "CE"],
+            "expiry": [None, 1706178600, 1706178600, 1706178600, 1706178600, 1706178600],
+        }
+    )
+    out = derive_columns(df, today=date(2024, 1, 2))
+    assert out["segment"].tolist() == ["NSE", "NFO-FUT", "NFO-OPT", "BFO-OPT", "MCX-FUT", None]
+    assert out["instrument_type"].tolist() == ["EQ", "FUT", "CE", "PE", "FUT", "CE"]
+
+
+@pytest.mark.parametrize("stale", [True, False])
+def test_stale_master_is_not_stored_as_today(tmp_path, monkeypatch: pytest.MonkeyPatch, stale: bool) -> None:
+    for name in ("BROKER_API_KEY", "FYERS_API_KEY", "FYERS_ACCESS_TOKEN", "BROKER_ACCESS_TOKEN"):
+        monkeypatch.delenv(name, raising=False)
+    monkeypatch.setenv("BROKER_INSTRUMENT_STORE", "false")
+    df = pd.DataFrame({"symbol": ["NSE:SBIN-EQ"], "segment": ["NSE"], "exchange": ["NSE"]})
+    monkeypatch.setattr(fyers_driver, "load_master_contract", lambda urls, refresh=False: (df.copy(), stale))
+    driver = fyers_driver.FyersDriver()
+    driver._instrument_store = InstrumentStore("fyers", str(tmp_path))
+
+    driver.download_instruments()
+    assert driver.master_contract_df["symbol"].tolist() == ["NSE:SBIN-EQ"]
+    assert (driver._instrument_store.load(day=master_day()) is None) is stale
@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import os
+from typing import Dict, List
+
+import pytest
+
+from brokers.codec import loads
+from brokers.net import http
+
+
+class FakeResponse:
+    def __init__(self, status_code: int, content: bytes = b"", headers: Dict[str, str] | None = None) -> None:
+        self.status_code = status_code
+        self.content = content
+        self.headers = headers or {}
+
+    def raise_for_status(self) -> None:
+        if self.status_code >= 400:
+            raise RuntimeError(f"HTTP {self.status_code}")
+
+
+class FakeSession:
+    def __init__(self, responses: List[FakeResponse]) -> None:
+        self.responses = responses
+        self.requests: List[Dict[str, str]] = []
+
+    def get(self, url: str, headers=None, timeout=None) -> FakeResponse:
+        self.requests.append(dict(headers or {}))
+        return self.responses.pop(0)
+
+
+@pytest.fixture
+def session(monkeypatch):
+    def install(*responses: FakeResponse) -> FakeSession:
+        s = FakeSession(list(responses))
+        monkeypatch.setattr(http, "get_session_manager", lambda: s)
+        return s
+
+    return install
+
+
+def test_download_writes_file_and_meta_without_tmp_leftovers(tmp_path, session):
+    path = str(tmp_path / "master.csv")
+    session(FakeResponse(200, b"a,b\n1,2\n", {"ETag": '"v1"'}))
+
+    assert http.download_cached("https://x/master.csv", path) == (path, True, False)
+    with open(path, "rb") as f:
+        assert f.read() == b"a,b\n1,2\n"
+    with open(f"{path}.meta", "rb") as f:
+        assert loads(f.read())["etag"] == '"v1"'
+    assert sorted(os.listdir(tmp_path)) == ["master.csv", "master.csv.meta"]
+
+
+def test_not_modified_revalidates_and_keeps_file(tmp_path, session):
+    path = str(tmp_path / "master.csv")
+    session(FakeResponse(200, b"old", {"ETag": '"v1"'}))
+    http.download_cached("https://x/master.csv", path)
+
+    s = session(FakeResponse(304))
+    assert http.download_cached("https://x/master.csv", path) == (path, False, False)
+    assert s.requests[0]["If-None-Match"] == '"v1"'
+    with open(path, "rb") as f:
+        assert f.read() == b"old"
+    assert sorted(os.listdir(tmp_path)) == ["master.csv", "master.csv.meta"]
+
+
+def test_failed_write_leaves_previous_copy(tmp_path, monkeypatch, session):
+    path = str(tmp_path / "master.csv")
+    session(FakeResponse(200, b"old", {"ETag": '"v1"'}))
+    http.download_cached("https://x/master.csv", path)
+
+    def boom(src, dst):
+        raise OSError("disk full")
+
+    session(FakeResponse(200, b"new", {"ETag": '"v2"'}))
+    monkeypatch.setattr(http.os, "replace", boom)
+    with pytest.raises(OSError):
+        http.download_cached("https://x/master.csv", path)
+    with open(path, "rb") as f:
+        assert f.read() == b"old"
+    assert sorted(os.listdir(tmp_path)) == ["master.csv", "master.csv.meta"]
+
+
+def test_failed_request_serves_the_cached_copy_as_stale(tmp_path, session, caplog):
+    path = str(tmp_path / "master.csv")
+    session(FakeResponse(200, b"old", {"ETag": '"v1"'}))
+    http.download_cached("https://x/master.csv", path)
+    with open(f"{path}.meta", "rb") as f:
+        fetched = loads(f.read())["fetched"]
+
+    session(FakeResponse(503))
+    with caplog.at_level("WARNING"):
+        assert http.download_cached("https://x/master.csv", path) == (path, False, True)
+    assert "using the cached copy" in caplog.text
+    with open(f"{path}.meta", "rb") as f:
+        assert loads(f.read())["fetched"] == fetched  # not marked fresh, so the next call retries
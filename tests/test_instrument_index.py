@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+from datetime import date
+
+import pandas as pd
+import pytest
+
+from brokers.symbols.index import InstrumentIndex
+
+NEAR = date(2099, 1, 29)
+FAR = date(2099, 2, 26)
+FUT_ONLY = date(2099, 1, 15)
+
+
+def kite_master() -> pd.DataFrame:
+    """Kite-shaped frame: bare tradingsymbols, exchange and underlying name in their own columns."""
+    rows = []
+
+    def add(symbol, name, kind, expiry, strike, token):
+        rows.append({
+            "symbol": symbol,
+            "exchange": "NFO",
+            "name": name,
+            "instrument_type": kind,
+            "expiry": expiry,
+            "strike": strike,
+            "token": token,
+        })
+
+    for strike in (23000.0, 23100.0, 23200.0):
+        add(f"NIFTY99JAN{int(strike)}CE", "NIFTY", "CE", NEAR, strike, int(strike))
+        add(f"NIFTY99FEB{int(strike)}CE", "NIFTY", "CE", FAR, strike, int(strike) + 1)
+    add("BANKNIFTY99JAN50000CE", "BANKNIFTY", "CE", NEAR, 50000.0, 50000)
+    # A futures-only expiry: on the calendar, not on the options calendar
+    add("NIFTY99JANFUT", "NIFTY", "FUT", FUT_ONLY, 0.0, 1)
+    return pd.DataFrame(rows)
+
+
+@pytest.fixture
+def index() -> InstrumentIndex:
+    return InstrumentIndex(kite_master())
+
+
+def test_nearest_tie_picks_the_lower_strike(index: InstrumentIndex) -> None:
+    assert index.nearest("NIFTY", NEAR, "CE", 23050.0)["strike"] == 23000.0
+    assert index.nearest("NIFTY", NEAR, "CE", 23051.0)["strike"] == 23100.0
+    assert index.nearest("nifty", "2099-01-29", "CE", 99999.0)["strike"] == 23200.0
+
+
+def test_nearest_outside_tolerance_is_none(index: InstrumentIndex) -> None:
+    assert index.nearest("NIFTY", NEAR, "CE", 23130.0, tolerance=20.0) is None
+    assert index.nearest("NIFTY", NEAR, "CE", 23130.0, tolerance=30.0)["strike"] == 23100.0
+    assert index.nearest("NIFTY", NEAR, "PE", 23100.0) is None
+
+
+def test_wildcard_chain_spans_underlyings_and_expiries(index: InstrumentIndex) -> None:
+    strikes = index.strikes(None, None, "CE").tolist()
+    assert strikes == sorted(strikes)
+    assert len(strikes) == 7
+    assert index.nearest(None, None, "CE", 49000.0)["symbol"] == "BANKNIFTY99JAN50000CE"
+    assert index.strikes(None, FAR, "CE").tolist() == [23000.0, 23100.0, 23200.0]
+
+
+def test_kite_symbols_accept_exchange_prefix(index: InstrumentIndex) -> None:
+    assert index["NFO:NIFTY99JAN23000CE"] == index["NIFTY99JAN23000CE"]
+    assert "NFO:NIFTY99JAN23000CE" in index
+    assert index.get("NSE:NIFTY99JAN23000CE") is None
+
+
+def test_first_listing_wins_for_duplicate_symbols() -> None:
+    df = kite_master()
+    dup = df.iloc[[0]].assign(token=-1)
+    index = InstrumentIndex(pd.concat([df, dup], ignore_index=True))
+    assert index["NIFTY99JAN23000CE"]["token"] == 23000
+    assert index["NFO:NIFTY99JAN23000CE"]["token"] == 23000
+
+
+def test_next_expiry_options_only_skips_futures_expiries(index: InstrumentIndex) -> None:
+    on = date(2099, 1, 1)
+    assert index.next_expiry("NIFTY", on=on) == FUT_ONLY
+    assert index.next_expiry("NIFTY", on=on, options_only=True) == NEAR
+    assert index.expiries("NIFTY", options_only=True) == [NEAR, FAR]
+    assert index.next_expiry("BANKNIFTY", on=date(2099, 2, 1), options_only=True) is None
@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+from datetime import date
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from brokers.cache.instruments import InstrumentStore, select_instruments
+
+DAY = date(2024, 6, 3)
+
+
+def master() -> pd.DataFrame:
+    return pd.DataFrame({
+        "symbol": ["NSE:SBIN-EQ", "NSE:NIFTY24JUN23000CE", "NSE:NIFTY24JUN23000PE", "NSE:INFY-EQ", "MCX:GOLD24JUNFUT"],
+        "segment": ["NSE-CM", "NFO-OPT", "NFO-OPT", "NSE-CM", "MCX-FUT"],
+        "exchange": ["NSE", "NSE", "NSE", "NSE", "MCX"],
+        "instrument_type": ["EQ", "CE", "PE", "EQ", "FUT"],
+        "underlying_symbol": ["SBIN", "NIFTY", "NIFTY", "INFY", None],
+        "expiry": [None, date(2024, 6, 27), date(2024, 6, 27), None, date(2024, 6, 28)],
+        "strike": [np.nan, 23000.0, 23000.0, np.nan, np.nan],
+        "lot_size": [1, 25, 25, 1, 100],
+    })
+
+
+@pytest.fixture
+def store(tmp_path) -> InstrumentStore:
+    return InstrumentStore("fake", str(tmp_path))
+
+
+def by_symbol(df: pd.DataFrame) -> pd.DataFrame:
+    return df.sort_values("symbol").reset_index(drop=True)
+
+
+def test_round_trip(store: InstrumentStore) -> None:
+    df = master()
+    store.save(df, day=DAY)
+    out = store.load(day=DAY, categorical=False)
+    expected = by_symbol(df)
+    got = by_symbol(out)
+    assert list(got.columns) == list(df.columns)
+    assert got["symbol"].tolist() == expected["symbol"].tolist()
+    assert not isinstance(got["segment"].dtype, pd.CategoricalDtype)
+    got.loc[0, "segment"] = "NEW-SEGMENT"  # raises TypeError on a categorical
+    def dates(series: pd.Series) -> list:
+        return [None if pd.isna(x) else x for x in series]
+
+    assert dates(got["expiry"]) == dates(expected["expiry"])
+    assert pd.isna(got["underlying_symbol"]).tolist() == pd.isna(expected["underlying_symbol"]).tolist()
+    np.testing.assert_array_equal(got["lot_size"].to_numpy(), expected["lot_size"].to_numpy())
+
+
+def test_pruned_loads(store: InstrumentStore) -> None:
+    df = master()
+    store.save(df, day=DAY)
+    opts = store.load(segments=["NFO-OPT"], columns=["symbol", "instrument_type"], day=DAY)
+    assert list(opts.columns) == ["symbol", "instrument_type"]
+    assert isinstance(opts["instrument_type"].dtype, pd.CategoricalDtype)
+    assert sorted(opts["symbol"]) == ["NSE:NIFTY24JUN23000CE", "NSE:NIFTY24JUN23000PE"]
+    ce = store.load(segments=["NFO-OPT", "MCX-FUT"], where={"instrument_type": ["CE", "FUT"]}, columns=["symbol"], day=DAY)
+    assert sorted(ce["symbol"]) == ["MCX:GOLD24JUNFUT", "NSE:NIFTY24JUN23000CE"]
+    assert store.load(segments=["BSE-CM"], day=DAY).empty
+    expected = select_instruments(df, ["NFO-OPT"], ["symbol", "instrument_type"])
+    assert sorted(expected["symbol"]) == sorted(opts["symbol"])
+
+
+def test_other_day_misses(store: InstrumentStore) -> None:
+    store.save(master(), day=DAY)
+    assert store.load(day=date(2024, 6, 4)) is None
+    assert store.day() == DAY
+
+
+def generations(store: InstrumentStore) -> list:
+    return sorted(e for e in os.listdir(store.directory) if os.path.isdir(os.path.join(store.directory, e)))
+
+
+def test_old_generations_are_pruned_keeping_the_previous_one(store: InstrumentStore) -> None:
+    for _ in range(4):
+        store.save(master(), day=DAY)
+    gens = generations(store)
+    assert len(gens) == 2
+    assert gens[-1] == store.meta()["generation"]
+
+
+def test_previous_generation_stays_readable(store: InstrumentStore) -> None:
+    store.save(master(), day=DAY)
+    stale_meta = store.meta()
+    store.save(master(), day=DAY)
+    # A reader that read meta.json before the switch still finds its files
+    base = os.path.join(store.directory, stale_meta["generation"])
+    assert os.path.exists(os.path.join(base, stale_meta["columns"]["symbol"]["file"] + ".npy"))
+
+
+def test_older_writer_does_not_replace_newer_master(store: InstrumentStore, monkeypatch: pytest.MonkeyPatch) -> None:
+    from brokers.cache import instruments
+
+    store.save(master(), day=DAY)
+    newer = store.meta()["generation"]
+    monkeypatch.setattr(instruments.time, "time_ns", lambda: 1)
+    store.save(master().head(1), day=DAY)
+    assert store.meta()["generation"] == newer
+    assert len(store.load(day=DAY)) == 5
+
+
+def test_save_and_reload_returns_the_stored_frame(store: InstrumentStore) -> None:
+    out = store.save_and_reload(master(), day=DAY)
+    assert by_symbol(out)["symbol"].tolist() == by_symbol(master())["symbol"].tolist()
+    assert not isinstance(out["segment"].dtype, pd.CategoricalDtype)
+
+
+def test_save_and_reload_logs_a_broken_store(store: InstrumentStore, monkeypatch: pytest.MonkeyPatch, caplog) -> None:
+    def boom(*args, **kwargs):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(np, "save", boom)
+    df = master()
+    with caplog.at_level("WARNING"):
+        assert store.save_and_reload(df, day=DAY) is df
+    assert "Failed to write instrument store" in caplog.text
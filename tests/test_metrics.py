@@ -0,0 +1,34 @@
+from __future__ import annotations
+
+import pytest
+
+from brokers.core.gateway import BrokerGateway
+from brokers.core.schemas import OrderResponse
+from brokers.metrics import MetricsInterceptor, MetricsRegistry
+
+from conftest import FakeDriver
+
+
+class ErrorDriver(FakeDriver):
+    def cancel_order(self, order_id: str) -> OrderResponse:
+        return OrderResponse(status="error", order_id=order_id, message="rejected")
+
+    def get_funds(self):
+        raise RuntimeError("down")
+
+
+def test_error_responses_and_empty_results_are_counted() -> None:
+    registry = MetricsRegistry()
+    gw = BrokerGateway(ErrorDriver(), "fake", interceptors=[MetricsInterceptor(registry)])
+    gw.cancel_order("7")
+    gw.get_orderbook()
+    with pytest.raises(RuntimeError):
+        gw.get_funds()
+    gw.get_quotes(["NSE:SBIN", "NSE:INFY"])
+    snap = registry.snapshot()
+    assert snap["fake.driver.cancel_order"]["errors"] == 1
+    assert snap["fake.driver.get_funds"]["errors"] == 1
+    assert snap["fake.driver.get_orderbook"]["errors"] == 0
+    assert snap["fake.driver.get_orderbook"]["empty"] == 1
+    assert snap["fake.gateway.get_quotes"]["request_items"]["max"] == 2
+    assert snap["fake.gateway.get_quotes"]["response_items"]["max"] == 2
@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+from datetime import date
+
+import pandas as pd
+import pytest
+
+from brokers.core.errors import ValidationError
+from brokers.core.gateway import BrokerGateway
+from brokers.core.option_chain import build_option_chain, spot_symbol
+from brokers.symbols.index import InstrumentIndex
+from brokers.symbols.registry import symbol_registry
+
+from conftest import FakeDriver
+
+EXPIRY = date(2099, 1, 29)
+
+
+def master() -> pd.DataFrame:
+    rows = []
+    for strike in range(22000, 24001, 100):
+        for opt in ("CE", "PE"):
+            rows.append({
+                "symbol": f"NIFTY99JAN{strike}{opt}",
+                "exchange": "NFO",
+                "name": "NIFTY",
+                "instrument_type": opt,
+                "expiry": EXPIRY,
+                "strike": float(strike),
+                "lot_size": 25,
+                "token": strike * 10 + (opt == "PE"),
+            })
+    return pd.DataFrame(rows)
+
+
+def index() -> InstrumentIndex:
+    return InstrumentIndex(master())
+
+
+def test_chain_is_centred_on_spot() -> None:
+    legs = build_option_chain(index(), "NIFTY", spot=23040.0, strike_count=2)
+    strikes = sorted({leg["strike"] for leg in legs})
+    assert strikes == [22800.0, 22900.0, 23000.0, 23100.0, 23200.0]
+    assert {leg["strike"] for leg in legs if leg["atm"]} == {23000.0}
+    assert legs[0]["symbol"] == "NFO:NIFTY99JAN22800CE"
+
+
+@pytest.mark.parametrize("spot", [None, 0.0, -1.0, float("nan")])
+def test_unusable_spot_is_rejected(spot) -> None:
+    with pytest.raises(ValidationError):
+        build_option_chain(index(), "NIFTY", spot=spot)
+
+
+@pytest.mark.parametrize(
+    "underlying, spot, fyers",
+    [
+        ("NIFTY", "NSE:NIFTY 50", "NSE:NIFTY50-INDEX"),
+        ("MIDCPNIFTY", "NSE:NIFTY MID SELECT", "NSE:MIDCPNIFTY-INDEX"),
+        ("NIFTYNXT50", "NSE:NIFTY NEXT 50", "NSE:NIFTYNXT50-INDEX"),
+        ("SENSEX", "BSE:SENSEX", "BSE:SENSEX-INDEX"),
+    ],
+)
+def test_index_spot_symbols(underlying: str, spot: str, fyers: str) -> None:
+    assert spot_symbol(underlying) == spot
+    assert symbol_registry.translate("fyers", spot) == fyers
+    assert symbol_registry.translate("zerodha", fyers) == spot
+
+
+def test_equity_spot_symbol() -> None:
+    assert spot_symbol("SBIN") == "NSE:SBIN"
+    assert spot_symbol("NSE:SBIN-EQ") == "NSE:SBIN-EQ"
+
+
+def test_gateway_index_follows_the_loaded_master() -> None:
+    class MasterDriver(FakeDriver):
+        df = master()
+
+        def get_instruments(self, *args, **kwargs):
+            return self.df
+
+    driver = MasterDriver()
+    gw = BrokerGateway(driver, "fake")
+    first = gw.instrument_index()
+    assert gw.instrument_index() is first
+    driver.df = master()  # a reload hands out a new frame, even with identical contents
+    assert gw.instrument_index() is not first
@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+from datetime import date
+
+import pytest
+
+from brokers.symbols.parser import CE, EQ, FUT, INDEX, INDEX_NAMES, PE, instrument_kind, parse_symbol
+from brokers.symbols.registry import symbol_registry
+
+
+def test_weekly_option():
+    info = parse_symbol("NSE:NIFTY25D2324000CE")
+    assert info.exchange == "NSE"
+    assert info.kind == CE and info.is_option and info.option_type == CE
+    assert info.underlying == "NIFTY"
+    assert info.expiry == date(2025, 12, 23)
+    assert info.expiry_month == date(2025, 12, 1)
+    assert info.strike == 24000.0
+    assert info.weekly
+    assert info.segment == "NFO-OPT"
+
+
+def test_weekly_option_numeric_month():
+    info = parse_symbol("NFO:BANKNIFTY2510951500PE")
+    assert info.kind == PE
+    assert info.underlying == "BANKNIFTY"
+    assert info.expiry == date(2025, 1, 9)
+    assert info.strike == 51500.0
+
+
+def test_monthly_option():
+    info = parse_symbol("BSE:SENSEX25SEP81000.5CE")
+    assert info.kind == CE
+    assert info.underlying == "SENSEX"
+    assert info.expiry is None and not info.weekly
+    assert info.expiry_month == date(2025, 9, 1)
+    assert info.strike == 81000.5
+    assert info.segment == "BFO-OPT"
+
+
+def test_future():
+    info = parse_symbol("MCX:CRUDEOIL25OCTFUT")
+    assert info.kind == FUT and info.is_future and info.is_derivative
+    assert info.underlying == "CRUDEOIL"
+    assert info.expiry_month == date(2025, 10, 1)
+    assert info.option_type is None
+    assert info.segment == "MCX-FUT"
+
+
+@pytest.mark.parametrize(
+    "symbol, base, series",
+    [
+        ("NSE:RELIANCE-EQ", "RELIANCE", "EQ"),
+        ("NSE:M&M-BE", "M&M", "BE"),
+        ("RELIANCE", "RELIANCE", None),
+        ("NSE:MCDOWELL-N", "MCDOWELL-N", None),
+        ("NSE:BAJAJ-AUTO", "BAJAJ-AUTO", None),
+    ],
+)
+def test_equity(symbol, base, series):
+    info = parse_symbol(symbol)
+    assert info.kind == EQ
+    assert info.underlying == base
+    assert info.series == series
+    assert info.segment == "NSE"
+
+
+def test_equity_ending_in_option_letters_is_not_an_option():
+    assert parse_symbol("NSE:RELIANCE").kind == EQ
+    assert parse_symbol("NSE:ABCDPE").kind == EQ
+
+
+@pytest.mark.parametrize(
+    "symbol, underlying",
+    [
+        ("NSE:NIFTY50-INDEX", "NIFTY"),
+        ("NSE:NIFTY 50", "NIFTY"),
+        ("NSE:NIFTY BANK", "BANKNIFTY"),
+        ("NSE:MIDCPNIFTY-INDEX", "MIDCPNIFTY"),
+        ("BSE:SENSEX", "SENSEX"),
+        ("NSE:SOMETHING-INDEX", "SOMETHING"),
+    ],
+)
+def test_index(symbol, underlying):
+    info = parse_symbol(symbol)
+    assert info.kind == INDEX and info.is_index
+    assert info.underlying == underlying
+    assert not info.is_derivative
+
+
+def test_index_names_pair_kite_and_fyers_spellings():
+    assert INDEX_NAMES["NIFTY"] == ("NIFTY 50", "NIFTY50-INDEX")
+    assert INDEX_NAMES["FINNIFTY"] == ("NIFTY FIN SERVICE", "FINNIFTY-INDEX")
+    assert INDEX_NAMES["NIFTYNXT50"] == ("NIFTY NEXT 50", "NIFTYNXT50-INDEX")
+
+
+def test_unknown_contract_shape_is_still_an_option():
+    info = parse_symbol("NFO:XYZ123PE")
+    assert info.kind == PE
+    assert info.underlying == "XYZ"
+
+
+def test_results_are_cached_and_case_insensitive():
+    assert parse_symbol("nse:nifty25d2324000ce") == parse_symbol("NSE:NIFTY25D2324000CE")
+    assert parse_symbol("NSE:NIFTY25SEPFUT") is parse_symbol("NSE:NIFTY25SEPFUT")
+    assert instrument_kind("NSE:NIFTY25SEPFUT") == FUT
+
+
+def test_hyphenated_names_get_the_fyers_eq_suffix():
+    assert symbol_registry.translate("fyers", "NSE:MCDOWELL-N") == "NSE:MCDOWELL-N-EQ"
+    assert symbol_registry.translate("fyers", "NSE:M&M-BE") == "NSE:M&M-BE"
@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+from bisect import bisect_left
+import time
+
+import pytest
+
+from brokers.core import gateway as gateway_module
+from brokers.core.gateway import BrokerGateway
+from brokers.net import ratelimiter
+from brokers.net.ratelimiter import AccountRateLimiter, Priority, rate_limited_fyers
+
+from conftest import FakeDriver
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> FakeClock:
+    clock = FakeClock()
+    monkeypatch.setattr(ratelimiter, "time", clock)
+    return clock
+
+
+def saturate(limiter: AccountRateLimiter, clock: FakeClock, calls: int) -> list:
+    """Admission times of a caller that acquires again as soon as it is allowed."""
+    times = []
+    for _ in range(calls):
+        with limiter._cond:
+            ticket = limiter._enqueue(Priority.NORMAL)
+            while True:
+                wait = limiter._try_take(ticket)
+                if wait == 0.0:
+                    break
+                clock.now += wait
+        times.append(clock.now)
+    return times
+
+
+def max_in_window(times: list, period: float) -> int:
+    return max(bisect_left(times, t + period) - i for i, t in enumerate(times))
+
+
+def test_no_window_admits_more_than_its_limit(clock: FakeClock) -> None:
+    limiter = AccountRateLimiter({"second": 9, "minute": 195})
+    times = saturate(limiter, clock, 600)
+    assert max_in_window(times, 1.0) <= 9
+    assert max_in_window(times, 60.0) <= 195
+    assert sum(t < times[0] + 60.0 for t in times) == 195
+
+
+def test_first_burst_is_not_doubled(clock: FakeClock) -> None:
+    limiter = AccountRateLimiter({"minute": 10})
+    times = saturate(limiter, clock, 11)
+    assert times[9] == times[0]
+    assert times[10] == pytest.approx(times[0] + 60.0)
+
+
+def test_headroom_counts_calls_in_window(clock: FakeClock) -> None:
+    limiter = AccountRateLimiter({"second": 5, "minute": 100})
+    saturate(limiter, clock, 3)
+    head = limiter.headroom()
+    assert head["second"] == {"remaining": 2, "limit": 5}
+    assert head["minute"]["remaining"] == 97
+    clock.now += 1.5
+    assert limiter.headroom()["second"]["remaining"] == 5
+    assert limiter.remaining() == 5
+
+
+def test_order_lane_served_before_bulk(clock: FakeClock) -> None:
+    limiter = AccountRateLimiter({"second": 1})
+    saturate(limiter, clock, 1)
+    with limiter._cond:
+        bulk = limiter._enqueue(Priority.BULK)
+        order = limiter._enqueue(Priority.ORDER)
+        clock.now += 1.0
+        assert limiter._try_take(bulk) is None
+        assert limiter._try_take(order) == 0.0
+        assert limiter._try_take(bulk) > 0
+
+
+def test_acquire_blocks_in_real_time() -> None:
+    limiter = AccountRateLimiter({"second": 3})
+    t0 = time.monotonic()
+    for _ in range(6):
+        limiter.acquire()
+    assert time.monotonic() - t0 >= 0.95
+
+
+def test_get_quotes_takes_one_token_per_broker_request() -> None:
+    driver = FakeDriver(max_quotes_per_request=2)
+    limiter = AccountRateLimiter({"minute": 100})
+    gw = BrokerGateway(driver, "fake", rate_limiter=limiter)
+    symbols = [f"NSE:S{i}" for i in range(5)]
+    quotes = gw.get_quotes(symbols)
+    assert set(quotes) == set(symbols)
+    assert sorted(len(c[1]) for c in driver.calls if c[0] == "get_quotes") == [1, 2, 2]
+    assert limiter.headroom()["minute"]["remaining"] == 97
+
+
+def test_rate_limited_fyers_draws_from_the_account_budget(monkeypatch: pytest.MonkeyPatch) -> None:
+    taken = []
+
+    class Limiter:
+        def acquire(self, priority: Priority = Priority.NORMAL) -> None:
+            taken.append(priority)
+
+    monkeypatch.setattr(ratelimiter, "account_limiter", lambda broker, account=None: Limiter())
+
+    @rate_limited_fyers()
+    def call(x: int) -> int:
+        return x + 1
+
+    assert call(1) == 2
+    assert taken == [Priority.NORMAL]
+
+
+def test_zerodha_quote_chunks_wait_on_the_quote_bucket(monkeypatch: pytest.MonkeyPatch) -> None:
+    assert ratelimiter.quote_bucket("zerodha").rate == 1
+    assert ratelimiter.quote_bucket("fyers") is None
+    taken = []
+
+    class Bucket:
+        def acquire(self, tokens: float = 1.0) -> None:
+            taken.append(tokens)
+
+    monkeypatch.setattr(gateway_module, "quote_bucket", lambda broker: Bucket() if broker == "zerodha" else None)
+    gw = BrokerGateway(FakeDriver(max_quotes_per_request=2), "zerodha")
+    gw.get_quotes([f"NSE:S{i}" for i in range(5)])
+    gw.get_quote("NSE:SBIN")
+    assert len(taken) == 4
@@ -0,0 +1,20 @@
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+
+from brokers.symbols.registry import SymbolRegistry
+
+
+def test_cache_stats_count_every_call_across_threads() -> None:
+    registry = SymbolRegistry()
+    registry.register_resolver("fake", lambda s: s.lower())
+
+    def work(i: int) -> None:
+        for _ in range(500):
+            registry.to_broker_symbol("fake", f"NSE:S{i % 4}")
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(work, range(8)))
+    stats = registry.cache_stats()
+    assert stats["hits"] + stats["misses"] == 8 * 500
+    assert stats["entries"] == 4
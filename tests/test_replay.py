@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+import asyncio
+import time
+
+import pytest
+
+from brokers.net.replay import ReplayClient, _Player
+
+
+def player(latency: float) -> _Player:
+    records = [{"k": "call", "m": "quotes", "q": "[]", "r": {"s": "ok"}, "t": 0.0}]
+    return _Player(records, "call", latency, strict=False)
+
+
+def test_async_replay_latency_does_not_block_the_loop() -> None:
+    client = ReplayClient(player(0.2), is_async=True)
+
+    async def run() -> float:
+        t0 = time.monotonic()
+        results = await asyncio.gather(*(client.quotes({"symbols": "NSE:SBIN-EQ"}) for _ in range(5)))
+        assert all(r == {"s": "ok"} for r in results)
+        return time.monotonic() - t0
+
+    assert asyncio.run(run()) < 0.6
+
+
+def test_sync_replay_applies_latency() -> None:
+    client = ReplayClient(player(0.05))
+    t0 = time.monotonic()
+    assert client.quotes({}) == {"s": "ok"}
+    assert time.monotonic() - t0 >= 0.05
+
+
+def test_replay_skips_driver_login(tmp_path, monkeypatch: pytest.MonkeyPatch) -> None:
+    from brokers.integrations.fyers import driver as fyers_driver
+
+    monkeypatch.setenv("BROKER_TRANSPORT", "replay")
+    monkeypatch.setenv("BROKER_CASSETTE", str(tmp_path / "session.jsonl.gz"))
+    monkeypatch.setenv("BROKER_API_KEY", "APP-100")
+    monkeypatch.setenv("BROKER_INSTRUMENT_STORE", "false")
+
+    def no_login(*args, **kwargs):
+        raise AssertionError("driver authenticated during replay")
+
+    monkeypatch.setattr(fyers_driver, "resolve_token", no_login)
+    fyers_driver.FyersDriver()
@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from typing import Any, Dict, List
+
+from brokers.core.async_gateway import AsyncBrokerGateway
+from brokers.core.gateway import BrokerGateway
+from brokers.core.schemas import OrderResponse, Position
+from brokers.net.batching import SingleFlight
+
+from conftest import FakeDriver
+
+
+def test_concurrent_calls_share_one_execution() -> None:
+    flight = SingleFlight()
+    release = threading.Event()
+    runs = []
+
+    def slow() -> object:
+        runs.append(1)
+        release.wait(2)
+        return object()
+
+    results: List[Any] = []
+    threads = [threading.Thread(target=lambda: results.append(flight.do("k", slow))) for _ in range(5)]
+    for t in threads:
+        t.start()
+    deadline = time.monotonic() + 2
+    while flight.stats()["calls"] < 5 and time.monotonic() < deadline:
+        time.sleep(0.001)
+    release.set()
+    for t in threads:
+        t.join()
+    assert len(runs) == 1
+    assert all(r is results[0] for r in results)
+
+
+def test_ttl_reuses_result_until_invalidated() -> None:
+    flight = SingleFlight(ttl=60)
+    counter = iter(range(100))
+    assert flight.do("k", lambda: next(counter)) == 0
+    assert flight.do("k", lambda: next(counter)) == 0
+    flight.invalidate()
+    assert flight.do("k", lambda: next(counter)) == 1
+
+
+def test_result_in_flight_during_invalidate_is_not_cached() -> None:
+    flight = SingleFlight(ttl=60)
+    started, release = threading.Event(), threading.Event()
+
+    def stale() -> str:
+        started.set()
+        release.wait(2)
+        return "stale"
+
+    out: List[str] = []
+    t = threading.Thread(target=lambda: out.append(flight.do("k", stale)))
+    t.start()
+    started.wait(2)
+    flight.invalidate()
+    # Callers after invalidate() do not join the detached call
+    assert flight.do("k", lambda: "fresh") == "fresh"
+    release.set()
+    t.join()
+    assert out == ["stale"]
+    assert flight.do("k", lambda: "refetched") == "fresh"
+
+
+def test_do_async_shares_cache_with_threads() -> None:
+    flight = SingleFlight(ttl=60)
+
+    async def fetch() -> str:
+        return "async"
+
+    assert asyncio.run(flight.do_async("k", fetch)) == "async"
+    assert flight.do("k", lambda: "sync") == "async"
+
+
+class NativeAsyncDriver(FakeDriver):
+    def __init__(self) -> None:
+        super().__init__(supports_native_async=True)
+
+    async def get_positions_async(self) -> List[Position]:
+        return self.get_positions()
+
+    async def place_order_async(self, request: Any) -> OrderResponse:
+        return self.place_order(request)
+
+    async def cancel_order_async(self, order_id: str) -> OrderResponse:
+        return self.cancel_order(order_id)
+
+    async def modify_order_async(self, order_id: str, updates: Dict[str, Any]) -> OrderResponse:
+        return self.modify_order(order_id, updates)
+
+
+def test_async_orders_invalidate_account_cache() -> None:
+    driver = NativeAsyncDriver()
+    gw = BrokerGateway(driver, "fake", account_cache_ttl=60)
+    agw = AsyncBrokerGateway(gw)
+
+    def position_fetches() -> int:
+        return sum(c[0] == "get_positions" for c in driver.calls)
+
+    async def scenario() -> None:
+        await agw.get_positions()
+        await agw.get_positions()
+        assert position_fetches() == 1
+        await agw.cancel_order("1")
+        await agw.get_positions()
+        assert position_fetches() == 2
+        await agw.modify_order("1", {"qty": 2})
+        gw.get_positions()
+        assert position_fetches() == 3
+
+    try:
+        asyncio.run(scenario())
+    finally:
+        agw.close()
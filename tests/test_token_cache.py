@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+import json
+import threading
+import time
+
+from brokers.auth.tokens import IST, TokenCache, resolve_token
+
+
+class FakeBroker:
+    """Login hands out numbered tokens; only tokens it issued validate."""
+
+    def __init__(self, delay: float = 0.0) -> None:
+        self.delay = delay
+        self.issued = []
+        self.validated = []
+        self._lock = threading.Lock()
+
+    def login(self) -> str:
+        time.sleep(self.delay)
+        with self._lock:
+            token = f"tok-{len(self.issued) + 1}"
+            self.issued.append(token)
+        return token
+
+    def validate(self, token: str) -> bool:
+        self.validated.append(token)
+        return token in self.issued
+
+
+def test_one_login_is_shared_by_concurrent_callers(tmp_path) -> None:
+    broker = FakeBroker(delay=0.05)
+    start = threading.Barrier(4)
+
+    def worker(_: int) -> str:
+        # A cache object per caller, as separate processes would have
+        cache = TokenCache("fake", str(tmp_path))
+        start.wait()
+        return cache.resolve("acct", validate=broker.validate, login=broker.login)
+
+    with ThreadPoolExecutor(4) as pool:
+        tokens = list(pool.map(worker, range(4)))
+    assert broker.issued == ["tok-1"]
+    assert tokens == ["tok-1"] * 4
+
+
+def test_expired_entry_is_skipped(tmp_path) -> None:
+    cache = TokenCache("fake", str(tmp_path))
+    broker = FakeBroker()
+    cache.put("acct", "old", expires_at=datetime.now(IST) - timedelta(minutes=1))
+    assert cache.get("acct") is None
+
+    assert cache.resolve("acct", validate=broker.validate, login=broker.login) == "tok-1"
+    assert "old" not in broker.validated
+    assert cache.get("acct") == "tok-1"
+
+
+def test_seed_is_stored_only_when_it_validates(tmp_path) -> None:
+    cache = TokenCache("fake", str(tmp_path))
+    broker = FakeBroker()
+
+    assert resolve_token(cache, "acct", validate=broker.validate, seed="bogus") is None
+    assert not (tmp_path / "fake-acct.json").exists()
+
+    broker.issued.append("seeded")
+    assert resolve_token(cache, "acct", validate=broker.validate, seed="seeded") == "seeded"
+    with open(cache.path("acct"), encoding="utf-8") as f:
+        assert json.load(f)["access_token"] == "seeded"
+
+
+def test_resolve_token_without_cache_falls_back_to_login() -> None:
+    broker = FakeBroker()
+    assert resolve_token(None, "acct", validate=broker.validate, seed="bogus", login=broker.login) == "tok-1"
+    assert resolve_token(None, "acct", validate=broker.validate, seed="tok-1", login=broker.login) == "tok-1"
+    assert broker.issued == ["tok-1"]
@@ -0,0 +1,155 @@
+from __future__ import annotations
+
+from typing import Any, List
+
+import pandas as pd
+import pytest
+
+from brokers.cache.instruments import InstrumentStore, trading_day
+from brokers.integrations.zerodha import driver as zerodha_driver
+from brokers.integrations.zerodha.driver import ZerodhaDriver
+
+
+MASTER = pd.DataFrame(
+    {
+        "exchange": ["NSE", "NSE", "NFO"],
+        "symbol": ["RELIANCE", "INFY", "NIFTY25D2324000CE"],
+        "token": [738561, 408065, 12345],
+        "segment": ["NSE", "NSE", "NFO-OPT"],
+    }
+)
+
+
+class FakeTicker:
+    MODE_FULL = "full"
+
+    def __init__(self) -> None:
+        self.subscribed: List[int] = []
+        self.unsubscribed: List[int] = []
+        self.modes: List[Any] = []
+
+    def subscribe(self, tokens: List[int]) -> None:
+        self.subscribed.extend(tokens)
+
+    def unsubscribe(self, tokens: List[int]) -> None:
+        self.unsubscribed.extend(tokens)
+
+    def set_mode(self, mode: str, tokens: List[int]) -> None:
+        self.modes.append((mode, list(tokens)))
+
+
+@pytest.fixture
+def zerodha(monkeypatch: pytest.MonkeyPatch) -> ZerodhaDriver:
+    for name in ("BROKER_API_KEY", "KITE_API_KEY", "ZERODHA_API_KEY"):
+        monkeypatch.delenv(name, raising=False)
+    monkeypatch.setenv("BROKER_INSTRUMENT_STORE", "false")
+    driver = ZerodhaDriver()
+    driver._kite = object()
+    driver._kite_ws = FakeTicker()
+    driver.master_contract_df = MASTER.copy()
+    return driver
+
+
+def test_token_map_is_built_once_per_master(zerodha: ZerodhaDriver, monkeypatch: pytest.MonkeyPatch) -> None:
+    calls = []
+    get_instruments = zerodha.get_instruments
+
+    def counting(*args: Any, **kwargs: Any):
+        calls.append(kwargs)
+        return get_instruments(*args, **kwargs)
+
+    monkeypatch.setattr(zerodha, "get_instruments", counting)
+    tokens, symbols = zerodha._token_maps()
+    assert tokens["NSE:RELIANCE"] == 738561
+    assert symbols[12345] == "NFO:NIFTY25D2324000CE"
+    zerodha._token_maps()
+    assert len(calls) == 1
+    assert calls[0]["columns"] == ["exchange", "symbol", "token"]
+
+    # A reloaded master rebuilds the map
+    zerodha.master_contract_df = MASTER.iloc[:1].copy()
+    tokens, _ = zerodha._token_maps()
+    assert len(calls) == 2
+    assert list(tokens) == ["NSE:RELIANCE"]
+    # ... even when its contents are identical
+    zerodha.master_contract_df = zerodha.master_contract_df.copy()
+    zerodha._token_maps()
+    assert len(calls) == 3
+
+
+def test_empty_master_is_not_cached(zerodha: ZerodhaDriver) -> None:
+    zerodha.master_contract_df = MASTER.iloc[:0].copy()
+    assert zerodha._token_maps() == ({}, {})
+    zerodha.master_contract_df = MASTER.copy()
+    assert zerodha._token_maps()[0]["NSE:INFY"] == 408065
+
+
+def test_subscribe_and_unsubscribe_resolve_tokens(zerodha: ZerodhaDriver) -> None:
+    ws = zerodha._kite_ws
+    zerodha.symbols_to_subscribe(["NSE:RELIANCE", "NSE:UNKNOWN", 408065])
+    assert ws.subscribed == [738561, 408065]
+    assert ws.modes == [("full", [738561, 408065])]
+    assert zerodha._ws_token_symbols == {738561: "NSE:RELIANCE", 408065: "NSE:INFY"}
+
+    zerodha.unsubscribe(["NSE:RELIANCE"])
+    assert ws.unsubscribed == [738561]
+    assert zerodha._ws_token_symbols == {408065: "NSE:INFY"}
+
+
+def test_ticks_map_back_to_symbols(zerodha: ZerodhaDriver) -> None:
+    zerodha._token_maps()
+    ticks = [
+        {"instrument_token": 738561, "last_price": 2500.5, "depth": {"buy": [{"price": 2500.0}], "sell": [{"price": 2501.0}]}},
+        {"instrument_token": 999, "last_price": 1.0},  # not in the master
+        {"instrument_token": 408065},  # no price
+    ]
+    out = zerodha.quotes_from_ticks(ticks)
+    assert [sym for sym, _ in out] == ["NSE:RELIANCE"]
+    quote = out[0][1]
+    assert quote.symbol == "RELIANCE"
+    assert quote.last_price == 2500.5
+    assert (quote.bid, quote.ask) == (2500.0, 2501.0)
+
+
+def test_quote_chunks_are_sequential_paced_and_failures_logged(
+    zerodha: ZerodhaDriver, monkeypatch: pytest.MonkeyPatch, caplog: pytest.LogCaptureFixture
+) -> None:
+    events: List[Any] = []
+
+    class FakeKite:
+        def quote(self, chunk: List[str]):
+            events.append(("quote", list(chunk)))
+            if "NSE:C" in chunk:
+                raise RuntimeError("429 Too Many Requests")
+            return {s: {"last_price": 1.0} for s in chunk}
+
+    class Bucket:
+        def acquire(self, tokens: float = 1.0) -> None:
+            events.append("wait")
+
+    monkeypatch.setattr(zerodha_driver, "QUOTES_MAX_INSTRUMENTS", 2)
+    monkeypatch.setattr(zerodha_driver, "quote_bucket", lambda broker: Bucket())
+    zerodha._kite = FakeKite()
+    with caplog.at_level("WARNING"):
+        quotes = zerodha.get_quotes(["NSE:A", "NSE:B", "NSE:C", "NSE:D", "NSE:E"])
+    assert events == [
+        ("quote", ["NSE:A", "NSE:B"]),
+        "wait",
+        ("quote", ["NSE:C", "NSE:D"]),
+        "wait",
+        ("quote", ["NSE:E"]),
+    ]
+    assert sorted(quotes) == ["NSE:A", "NSE:B", "NSE:E"]
+    assert "Kite quote request for 2 instruments failed" in caplog.text
+
+
+def test_pruned_store_reads_match_the_loaded_master(zerodha: ZerodhaDriver, tmp_path) -> None:
+    store = InstrumentStore("zerodha", str(tmp_path))
+    store.save(MASTER, day=trading_day(rollover=zerodha_driver.INSTRUMENTS_ROLLOVER))
+    zerodha._instrument_store = store
+    zerodha.master_contract_df = None
+    pruned = zerodha.get_instruments(segments=["NSE"], columns=["symbol", "segment"])
+    zerodha.master_contract_df = MASTER.copy()
+    loaded = zerodha.get_instruments(segments=["NSE"], columns=["symbol", "segment"])
+    assert pruned["segment"].dtype == loaded["segment"].dtype
+    assert pruned.groupby("segment").size().to_dict() == {"NSE": 2}